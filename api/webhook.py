@@ -10,15 +10,22 @@ import sys
 import os
 from http.server import BaseHTTPRequestHandler
 import re
+from typing import TYPE_CHECKING
 
 # Ensure project root is on the path so `src` is importable
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from telegram import Update
-from telegram.ext import Application
-
 from src.config import Config
-from src.handlers import register_all_handlers
+from src.services.update_dedup import update_dedup
+from src.services.update_filter import update_filter
+from src.services.update_stream import update_stream, valid_update
+
+if TYPE_CHECKING:
+    from telegram.ext import Application
+
+# telegram.ext and the handler modules are imported on the first update that
+# is processed inline: redeliveries, filtered updates and stream mode
+# never pay for them on a cold start.
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -44,11 +51,17 @@ async def _get_app() -> Application:
     """Lazily build and initialize the Application singleton."""
     global _app
     if _app is None:
+        from telegram.ext import Application
+
+        from src.handlers import register_all_handlers
+        from src.services.update_lanes import ChatLaneProcessor
+
         Config.validate()
         _app = (
             Application.builder()
             .token(Config.BOT_TOKEN)
-            .concurrent_updates(True)  # Process updates concurrently
+            # Same chat in order, different chats in parallel
+            .concurrent_updates(ChatLaneProcessor(Config.UPDATE_LANES, Config.UPDATE_LANE_DEPTH))
             .build()
         )
         register_all_handlers(_app)
@@ -73,13 +86,34 @@ class handler(BaseHTTPRequestHandler):
             body = self.rfile.read(content_length)
             data = json.loads(body)
 
-            loop = _get_or_create_loop()
-            loop.run_until_complete(self._process_update(data))
-
-            self.send_response(200)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"OK")
+            update_id = data.get("update_id") if isinstance(data, dict) else None
+            if isinstance(update_id, int) and not update_dedup.first_delivery(update_id):
+                # A redelivery of an update already taken: acknowledge, don't run it again
+                self._ok()
+                return
+
+            if not update_filter.actionable(data):
+                # Nothing would act on it: skip parsing and handler dispatch
+                self._ok()
+                return
+
+            if Config.UPDATE_INGEST == "stream":
+                # Queue for src.worker and answer at once; slow handlers never hold the ack
+                if valid_update(data):
+                    try:
+                        update_stream.publish(body.decode("utf-8"))
+                    except Exception as e:
+                        # Not queued: a non-200 makes Telegram deliver it again
+                        logger.error("Failed to queue update: %s", e)
+                        update_dedup.release(update_id)
+                        self.send_response(503)
+                        self.end_headers()
+                        return
+            else:
+                loop = _get_or_create_loop()
+                loop.run_until_complete(self._process_update(data))
+
+            self._ok()
         except Exception as e:
             logger.error("Error processing update: %s", e, exc_info=True)
             self.send_response(200)  # Always 200 to prevent Telegram retries
@@ -87,6 +121,12 @@ class handler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(b"Error handled")
 
+    def _ok(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        self.wfile.write(b"OK")
+
     def do_GET(self):
         """Health check endpoint."""
         self.send_response(200)
@@ -99,6 +139,12 @@ class handler(BaseHTTPRequestHandler):
     @staticmethod
     async def _process_update(data: dict) -> None:
         """Deserialize the update and feed it through the bot handlers."""
+        from telegram import Update
+
+        from src.handlers.games import game_scheduler
+
         app = await _get_app()
         update = Update.de_json(data, app.bot)
-        await app.process_update(update)
+        await app.update_processor.process_update(update, app.process_update(update))
+        # No JobQueue runs between invocations — close overdue game rounds here
+        await game_scheduler.maybe_sweep(app.bot)
@@ -0,0 +1,74 @@
+"""
+Cold-start benchmark for the game content loader.
+
+Compares, in fresh interpreters without cached bytecode (as on a Vercel
+cold start):
+  * literals  — src/constants/messages.py with every content bank pasted
+                back in as Python literals (how it shipped before)
+  * lazy      — importing src.constants.messages as it is now
+  * lazy+load — the same import plus the first get_bank() call
+
+Run from the project root:
+    python -m benchmarks.bench_content_loader [runs]
+"""
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CONTENT = ROOT / "data" / "game_content.json"
+
+
+def _time_import(code: str, cwd: Path, runs: int) -> float:
+    """Median wall time (ms) of running code in a fresh interpreter."""
+    timer = (
+        "import time; _t = time.perf_counter()\n"
+        f"{code}\n"
+        "print((time.perf_counter() - _t) * 1000)"
+    )
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-B", "-c", timer],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    banks = json.loads(CONTENT.read_text(encoding="utf-8"))
+    banks.pop("version", None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = (ROOT / "src" / "constants" / "messages.py").read_text(encoding="utf-8")
+        source += "\n" + "\n".join(f"{name.upper()} = {items!r}" for name, items in banks.items())
+        Path(tmp, "messages_literals.py").write_text(source, encoding="utf-8")
+        literals = _time_import(
+            f"import sys; sys.path[:0] = [{tmp!r}, {str(ROOT)!r}]\nimport messages_literals",
+            ROOT, runs,
+        )
+
+    lazy = _time_import("import src.constants.messages", ROOT, runs)
+    loaded = _time_import(
+        "import src.constants.messages\n"
+        "from src.constants.content import get_bank; get_bank('riddles')",
+        ROOT, runs,
+    )
+
+    print(f"content banks: {len(banks)}, runs: {runs} (median ms)")
+    print(f"  literals   {literals:8.2f}")
+    print(f"  lazy       {lazy:8.2f}  ({literals - lazy:+.2f} saved at import)")
+    print(f"  lazy+load  {loaded:8.2f}  (first game round pays the JSON load)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Event-loop latency benchmark for the photo editor.
+
+Runs 10 concurrent "write text on photo" edits of a 12 MP JPEG while a
+probe coroutine stands in for other chats' updates: every 10 ms it wakes
+up and records how late it was. Reports the probe's p50 / p99 lateness
+and the wall time for the whole batch:
+  * inline — the editor as it shipped: full-size decode, draw and PNG
+             encode inside the handler, on the event loop
+  * pool   — ImagePool workers with downscaled decode and JPEG output
+
+Run from the project root:
+    python -m benchmarks.bench_photo_editor [edits]
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import statistics
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+from src.services.image_pool import ImagePool
+from src.utils.image_ops import get_font, render_text
+
+PROBE_INTERVAL = 0.010
+TEXT = "benchmark text"
+
+
+def _sample_photo() -> bytes:
+    img = Image.new("RGB", (4000, 3000))
+    draw = ImageDraw.Draw(img)
+    for i in range(0, 4000, 40):
+        draw.line([(i, 0), (4000 - i, 3000)], fill=(i % 255, 80, 160), width=7)
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+def _legacy_render(data: bytes, text: str) -> bytes:
+    """The pre-pool handler body: full decode, draw, PNG encode."""
+    img = Image.open(io.BytesIO(data)).copy()
+    draw = ImageDraw.Draw(img)
+    font = get_font()
+    width, height = img.size
+    bbox = draw.textbbox((0, 0), text, font=font)
+    x = (width - (bbox[2] - bbox[0])) // 2
+    y = height - (bbox[3] - bbox[1]) - 20
+    draw.rectangle([x - 10, y - 10, x + bbox[2] + 10, y + bbox[3] + 10], fill=(255, 255, 255))
+    draw.text((x, y), text, fill=(0, 0, 0), font=font)
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+async def _probe(lateness: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        lateness.append((time.perf_counter() - expected) * 1000)
+
+
+async def _run(mode: str, data: bytes, edits: int, pool: ImagePool) -> tuple[float, float, float]:
+    lateness: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lateness, stop))
+
+    async def inline_edit(i: int) -> None:
+        await asyncio.sleep(0)  # handlers interleave at their awaits
+        _legacy_render(data, TEXT)
+
+    async def pooled_edit(i: int) -> None:
+        await pool.run(i, render_text, data, TEXT)  # one chat per edit
+
+    edit = inline_edit if mode == "inline" else pooled_edit
+    start = time.perf_counter()
+    await asyncio.gather(*(edit(i) for i in range(edits)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await probe
+    lateness.sort()
+    p99 = lateness[min(len(lateness) - 1, int(len(lateness) * 0.99))]
+    return statistics.median(lateness), p99, wall
+
+
+async def main_async(edits: int) -> None:
+    data = _sample_photo()
+    pool = ImagePool()
+    await pool.run(-1, render_text, data, TEXT)  # start workers outside the measurement
+    print(f"{edits} concurrent edits of a {len(data) // 1024} KB 4000x3000 JPEG, {pool.workers} worker(s)")
+    print(f"{'mode':<8}{'probe p50 ms':>14}{'probe p99 ms':>14}{'batch s':>10}")
+    for mode in ("inline", "pool"):
+        p50, p99, wall = await _run(mode, data, edits, pool)
+        print(f"{mode:<8}{p50:>14.1f}{p99:>14.1f}{wall:>10.2f}")
+    pool.shutdown()
+
+
+def main() -> None:
+    edits = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    asyncio.run(main_async(edits))
+
+
+if __name__ == "__main__":
+    main()
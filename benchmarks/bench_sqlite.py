@@ -0,0 +1,110 @@
+"""
+Throughput benchmark for the economy's SQLite access.
+
+Compares, on a scratch database with the economy schema:
+  * per-call   — sqlite3.connect / execute / commit / close for every
+                 statement, rollback journal (how the economy modules did it)
+  * pooled     — SqliteService: one tuned WAL connection, cached statements
+  * batched    — SqliteService.executemany for the bulk inventory move
+                 behind seize_assets
+
+Run from the project root:
+    python -m benchmarks.bench_sqlite [ops]
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from src.services.sqlite_service import SqliteService
+
+SCHEMA = (
+    "CREATE TABLE users (user_id INTEGER PRIMARY KEY, bank_balance INTEGER DEFAULT 100)",
+    "CREATE TABLE inventory (user_id INTEGER, item_name TEXT, item_rarity TEXT, "
+    "PRIMARY KEY (user_id, item_name))",
+)
+USERS = 1000
+
+
+def _setup(path: str) -> None:
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.executemany("INSERT INTO users (user_id) VALUES (?)", [(i,) for i in range(USERS)])
+    conn.commit()
+    conn.close()
+
+
+def _ops_per_sec(ops: int, func: Callable[[int], None]) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        func(i)
+    return ops / (time.perf_counter() - start)
+
+
+def _per_call(path: str, sql: str, params: tuple, fetch: bool = False) -> None:
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    c.execute(sql, params)
+    if fetch:
+        c.fetchone()
+    conn.commit()
+    conn.close()
+
+
+def bench(ops: int) -> list[tuple[str, float, float]]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        pooled_path = os.path.join(tmp, "pooled.db")
+        _setup(legacy_path)
+        _setup(pooled_path)
+        db = SqliteService(pooled_path)
+
+        update = "UPDATE users SET bank_balance = bank_balance + 1 WHERE user_id=?"
+        select = "SELECT bank_balance FROM users WHERE user_id=?"
+        insert = "INSERT OR IGNORE INTO inventory (user_id, item_name, item_rarity) VALUES (?, ?, 'common')"
+
+        results.append((
+            "balance update",
+            _ops_per_sec(ops, lambda i: _per_call(legacy_path, update, (i % USERS,))),
+            _ops_per_sec(ops, lambda i: db.execute(update, (i % USERS,))),
+        ))
+        results.append((
+            "balance read",
+            _ops_per_sec(ops, lambda i: _per_call(legacy_path, select, (i % USERS,), fetch=True)),
+            _ops_per_sec(ops, lambda i: db.fetchone(select, (i % USERS,))),
+        ))
+        results.append((
+            "inventory insert",
+            _ops_per_sec(ops, lambda i: _per_call(legacy_path, insert, (i % USERS, f"item{i}"))),
+            _ops_per_sec(ops, lambda i: db.execute(insert, (i % USERS, f"item{i}"))),
+        ))
+
+        # Bulk: move `ops` inventory rows, one statement per row vs one batch
+        rows = [(0, f"seized{i}") for i in range(ops)]
+        start = time.perf_counter()
+        for row in rows:
+            _per_call(legacy_path, insert, row)
+        legacy = ops / (time.perf_counter() - start)
+        start = time.perf_counter()
+        db.executemany(insert, [(0, f"batched{i}") for i in range(ops)])
+        batched = ops / (time.perf_counter() - start)
+        results.append(("bulk inventory move", legacy, batched))
+        db.close()
+    return results
+
+
+def main() -> None:
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'operation':<22}{'per-call ops/s':>16}{'pooled ops/s':>16}{'speedup':>10}")
+    for name, before, after in bench(ops):
+        print(f"{name:<22}{before:>16,.0f}{after:>16,.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
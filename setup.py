@@ -8,7 +8,7 @@ setup(
     packages=find_packages(),
     python_requires=">=3.10",
     install_requires=[
-        "python-telegram-bot>=20.7",
+        "python-telegram-bot[job-queue]>=20.7",
         "redis>=5.0.0",
         "python-dotenv>=1.0.0",
         "aiohttp>=3.9.0",
@@ -1,69 +1,260 @@
-from random import shuffle
+"""
+Blackjack engine — game state lives in Redis so any worker can serve the
+next move (polling process or any Vercel instance).
+
+State is one hash per chat (``bot:blackjack:{chat_id}``) with a TTL:
+    deck    packed card indices, one ASCII char per card (top = last char)
+    player  packed card indices of the player's hand
+    dealer  packed card indices of the dealer's hand
+    user_id owner of the game
+    bet     points wagered (already debited by the caller)
+    op_id   the bet's ledger op id; settling credits ``{op_id}:payout``
+
+Every move is a WATCH/MULTI read-modify-write on that single key, so two
+concurrent button presses can never both draw from the same deck or both
+settle the same game.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+
+import redis
+
+from src.services.redis_service import RedisService
+
+_PREFIX = "bot:blackjack:"
+GAME_TTL = 300  # seconds of inactivity before an abandoned game is dropped
+
+# Card index i (0..51): rank = i // 4, suit = i % 4
+_RANKS = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+_SUITS = ("♠", "♥", "♦", "♣")
+_RANK_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11)
+_ACE_RANK = 12
+_PACK_BASE = 48  # chr(48) == "0" — keeps every packed card printable ASCII
+
+# Outcomes
+OUTCOME_BUST = "bust"
+OUTCOME_WIN = "win"
+OUTCOME_LOSE = "lose"
+OUTCOME_PUSH = "push"
+OUTCOME_BLACKJACK = "blackjack"
+
+
+# ── Encoding helpers ──
+
+def pack_cards(cards: list[int]) -> str:
+    """Pack card indices into a compact string (one char per card)."""
+    return "".join(chr(_PACK_BASE + c) for c in cards)
+
+
+def unpack_cards(packed: str | None) -> list[int]:
+    """Inverse of pack_cards()."""
+    return [ord(ch) - _PACK_BASE for ch in (packed or "")]
+
+
+def card_label(card: int) -> str:
+    """Human-readable label for a card index, e.g. ``A♠``."""
+    return f"{_RANKS[card // 4]}{_SUITS[card % 4]}"
+
+
+def hand_value(cards: list[int]) -> int:
+    """Best blackjack value of a hand (aces count 11 or 1)."""
+    value = 0
+    aces = 0
+    for card in cards:
+        rank = card // 4
+        value += _RANK_VALUES[rank]
+        if rank == _ACE_RANK:
+            aces += 1
+    while value > 21 and aces:
+        value -= 10
+        aces -= 1
+    return value
+
+
+def new_deck() -> list[int]:
+    """Return a freshly shuffled 52-card deck."""
+    deck = list(range(52))
+    random.shuffle(deck)
+    return deck
+
+
+# ── State ──
+
+@dataclass
+class BlackjackHand:
+    """Snapshot of a game after a move."""
+    user_id: int
+    bet: int = 0
+    player: list[int] = field(default_factory=list)
+    dealer: list[int] = field(default_factory=list)
+    outcome: str | None = None  # None while the game is still running
+    op_id: str = ""             # the bet's ledger op id, for an idempotent payout
+
+    @property
+    def finished(self) -> bool:
+        return self.outcome is not None
+
+    @property
+    def player_value(self) -> int:
+        return hand_value(self.player)
+
+    @property
+    def dealer_value(self) -> int:
+        return hand_value(self.dealer)
+
+    def payout(self) -> int:
+        """Points to credit back to the player (the bet was debited up front)."""
+        if self.outcome == OUTCOME_BLACKJACK:
+            return self.bet + self.bet * 3 // 2
+        if self.outcome == OUTCOME_WIN:
+            return self.bet * 2
+        if self.outcome == OUTCOME_PUSH:
+            return self.bet
+        return 0
+
+
+def _decide(player: list[int], dealer: list[int]) -> str:
+    player_value = hand_value(player)
+    dealer_value = hand_value(dealer)
+    if player_value > 21:
+        return OUTCOME_BUST
+    if dealer_value > 21 or player_value > dealer_value:
+        return OUTCOME_WIN
+    if player_value < dealer_value:
+        return OUTCOME_LOSE
+    return OUTCOME_PUSH
+
+
+def _play_dealer(deck: list[int], dealer: list[int]) -> None:
+    while hand_value(dealer) < 17 and deck:
+        dealer.append(deck.pop())
+
 
 class BlackjackGame:
-    def __init__(self):
-        self.games = {}
-
-    def start_game(self, chat_id, user_id):
-        deck = self._create_deck()
-        shuffle(deck)
-        self.games[chat_id] = {
-            "deck": deck,
-            "dealer_hand": [deck.pop(), deck.pop()],
-            "player_hand": [deck.pop(), deck.pop()],
-            "user_id": user_id,
-        }
-
-    def hit(self, chat_id, user_id):
-        game = self.games.get(chat_id)
-        if not game or game["user_id"] != user_id:
-            return "No active game found."
-        game["player_hand"].append(game["deck"].pop())
-        return self._hand_status(game)
-
-    def stand(self, chat_id, user_id):
-        game = self.games.get(chat_id)
-        if not game or game["user_id"] != user_id:
-            return "No active game found."
-        while self._hand_value(game["dealer_hand"]) < 17:
-            game["dealer_hand"].append(game["deck"].pop())
-        return self._determine_winner(game)
-
-    def _create_deck(self):
-        cards = [2, 3, 4, 5, 6, 7, 8, 9, 10, "J", "Q", "K", "A"]
-        suits = ["♠", "♥", "♦", "♣"]
-        return [f"{card}{suit}" for card in cards for suit in suits]
-
-    def _hand_value(self, hand):
-        value = 0
-        aces = 0
-        for card in hand:
-            if card[:-1] in ["J", "Q", "K"]:
-                value += 10
-            elif card[:-1] == "A":
-                aces += 1
-                value += 11
+    """Redis-backed blackjack table, one game per chat."""
+
+    def __init__(self, ttl: int = GAME_TTL) -> None:
+        self.redis = RedisService()
+        self.ttl = ttl
+
+    # ── Key builders ──
+
+    def _game_key(self, chat_id: int) -> str:
+        return f"{_PREFIX}{chat_id}"
+
+    # ── Public API ──
+
+    def has_game(self, chat_id: int) -> bool:
+        return self.redis.exists(self._game_key(chat_id))
+
+    def get_game(self, chat_id: int) -> BlackjackHand | None:
+        """Return the running game in a chat, if any (read-only)."""
+        data = self.redis.hgetall(self._game_key(chat_id))
+        if not data:
+            return None
+        return BlackjackHand(
+            user_id=int(data["user_id"]),
+            bet=int(data.get("bet", 0)),
+            player=unpack_cards(data.get("player")),
+            dealer=unpack_cards(data.get("dealer")),
+            op_id=data.get("op_id", ""),
+        )
+
+    def start_game(self, chat_id: int, user_id: int, bet: int = 0, op_id: str = "") -> BlackjackHand | None:
+        """Deal a new game. Returns None if the chat already has one running.
+
+        A natural blackjack is settled immediately. op_id (the bet's ledger
+        op id) is kept with the game and returned with every hand.
+        """
+        key = self._game_key(chat_id)
+
+        def _deal(pipe: redis.client.Pipeline) -> BlackjackHand | None:
+            if pipe.exists(key):
+                return None
+            deck = new_deck()
+            dealer = [deck.pop(), deck.pop()]
+            player = [deck.pop(), deck.pop()]
+            hand = BlackjackHand(user_id=user_id, bet=bet, player=player, dealer=dealer, op_id=op_id)
+            pipe.multi()
+            if hand.player_value == 21:
+                hand.outcome = OUTCOME_PUSH if hand.dealer_value == 21 else OUTCOME_BLACKJACK
+                return hand
+            pipe.hset(key, mapping={
+                "deck": pack_cards(deck),
+                "player": pack_cards(player),
+                "dealer": pack_cards(dealer),
+                "user_id": str(user_id),
+                "bet": str(bet),
+                "op_id": op_id,
+            })
+            pipe.expire(key, self.ttl)
+            return hand
+
+        return self._atomic(key, _deal)
+
+    def hit(self, chat_id: int, user_id: int) -> BlackjackHand | None:
+        """Draw one card for the player. Returns None if they have no game here."""
+        key = self._game_key(chat_id)
+
+        def _hit(pipe: redis.client.Pipeline) -> BlackjackHand | None:
+            hand, deck = self._load(pipe, key, user_id)
+            if hand is None:
+                return None
+            hand.player.append(deck.pop())
+            pipe.multi()
+            if hand.player_value > 21:
+                hand.outcome = OUTCOME_BUST
+                pipe.delete(key)
+            elif hand.player_value == 21:
+                _play_dealer(deck, hand.dealer)
+                hand.outcome = _decide(hand.player, hand.dealer)
+                pipe.delete(key)
             else:
-                value += int(card[:-1])
-        while value > 21 and aces:
-            value -= 10
-            aces -= 1
-        return value
-
-    def _hand_status(self, game):
-        player_value = self._hand_value(game["player_hand"])
-        if player_value > 21:
-            return f"Bust! Your hand: {game['player_hand']}"
-        return f"Your hand: {game['player_hand']}, Dealer's card: {game['dealer_hand'][0]}"
-
-    def _determine_winner(self, game):
-        player_value = self._hand_value(game["player_hand"])
-        dealer_value = self._hand_value(game["dealer_hand"])
-        if player_value > 21:
-            return f"Bust! You lose. Dealer's hand: {game['dealer_hand']}"
-        elif dealer_value > 21 or player_value > dealer_value:
-            return f"You win! Dealer's hand: {game['dealer_hand']}"
-        elif player_value < dealer_value:
-            return f"You lose. Dealer's hand: {game['dealer_hand']}"
-        else:
-            return f"It's a tie! Dealer's hand: {game['dealer_hand']}"
\ No newline at end of file
+                pipe.hset(key, mapping={
+                    "deck": pack_cards(deck),
+                    "player": pack_cards(hand.player),
+                })
+                pipe.expire(key, self.ttl)
+            return hand
+
+        return self._atomic(key, _hit)
+
+    def stand(self, chat_id: int, user_id: int) -> BlackjackHand | None:
+        """Play out the dealer and settle. Returns None if they have no game here."""
+        key = self._game_key(chat_id)
+
+        def _stand(pipe: redis.client.Pipeline) -> BlackjackHand | None:
+            hand, deck = self._load(pipe, key, user_id)
+            if hand is None:
+                return None
+            _play_dealer(deck, hand.dealer)
+            hand.outcome = _decide(hand.player, hand.dealer)
+            pipe.multi()
+            pipe.delete(key)
+            return hand
+
+        return self._atomic(key, _stand)
+
+    # ── Internals ──
+
+    def _atomic(self, key: str, func) -> BlackjackHand | None:
+        """Run func inside WATCH/MULTI on key, retrying on concurrent writes."""
+        return self.redis.client.transaction(func, key, value_from_callable=True)
+
+    @staticmethod
+    def _load(
+        pipe: redis.client.Pipeline, key: str, user_id: int,
+    ) -> tuple[BlackjackHand | None, list[int]]:
+        data = pipe.hgetall(key)
+        if not data or int(data.get("user_id", 0)) != user_id:
+            return None, []
+        hand = BlackjackHand(
+            user_id=user_id,
+            bet=int(data.get("bet", 0)),
+            player=unpack_cards(data.get("player")),
+            dealer=unpack_cards(data.get("dealer")),
+            op_id=data.get("op_id", ""),
+        )
+        return hand, unpack_cards(data.get("deck"))
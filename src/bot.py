@@ -9,6 +9,8 @@ from telegram.ext import Application
 
 from src.config import Config
 from src.handlers import register_all_handlers
+from src.services.http_client import http_client
+from src.services.update_lanes import ChatLaneProcessor
 
 # ── Logging ──
 logging.basicConfig(
@@ -20,22 +22,38 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
-    """Build the bot application, register handlers, and run."""
-    # Validate config
+async def _post_shutdown(app: Application) -> None:
+    """Release shared resources once the application has stopped."""
+    await http_client.aclose()
+    # The photo editor is loaded on first use; no module, no pool to stop
+    photo_editor = sys.modules.get("src.handlers.photo_editor")
+    if photo_editor is not None:
+        photo_editor.image_pool.shutdown()
+
+
+def build_application() -> Application:
+    """Validate config, build the Application and register every handler module."""
     try:
         Config.validate()
     except ValueError as e:
         logger.critical(f"Configuration error: {e}")
         sys.exit(1)
 
-    logger.info("Starting bot: %s", Config.BOT_NAME)
+    app = (
+        Application.builder()
+        .token(Config.BOT_TOKEN)
+        .concurrent_updates(ChatLaneProcessor(Config.UPDATE_LANES, Config.UPDATE_LANE_DEPTH))
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
+    register_all_handlers(app)
+    return app
 
-    # Build application
-    app = Application.builder().token(Config.BOT_TOKEN).build()
 
-    # Register all handler modules
-    register_all_handlers(app)
+def main() -> None:
+    """Build the bot application, register handlers, and run."""
+    logger.info("Starting bot: %s", Config.BOT_NAME)
+    app = build_application()
 
     logger.info("All handlers registered. Starting polling...")
 
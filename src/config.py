@@ -27,12 +27,31 @@ class Config:
     REDIS_DB: int = int(os.getenv("REDIS_DB", "") or "0")
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
 
+    # ── Economy storage: "redis" or "sqlite" (see src/economy/store.py) ──
+    ECONOMY_BACKEND: str = os.getenv("ECONOMY_BACKEND", "redis").lower()
+    ECONOMY_DB_PATH: str = os.getenv("ECONOMY_DB_PATH", "/tmp/economy.db")
+
     # ── Channel (force subscribe) ──
     CHANNEL_USERNAME: str = os.getenv("CHANNEL_USERNAME", "")
     CHANNEL_ID: int = int(os.getenv("CHANNEL_ID", "") or "0")
 
+    # ── Photo editor (0 = one worker per CPU, up to 4) ──
+    PHOTO_WORKERS: int = int(os.getenv("PHOTO_WORKERS", "") or "0")
+
     # ── YouTube ──
     YT_COOKIES_PATH: str = os.getenv("YT_COOKIES_PATH", "")
+    YT_MAX_JOBS: int = int(os.getenv("YT_MAX_JOBS", "") or "2")         # concurrent yt-dlp runs
+    YT_RATE_LIMIT: str = os.getenv("YT_RATE_LIMIT", "5M")                # per-download bandwidth cap
+
+    # ── Update processing: per-chat ordered lanes, run in parallel (see services/update_lanes.py) ──
+    UPDATE_LANES: int = int(os.getenv("UPDATE_LANES", "") or "16")
+    UPDATE_LANE_DEPTH: int = int(os.getenv("UPDATE_LANE_DEPTH", "") or "64")
+
+    # ── Webhook: "inline" runs handlers in the request, "stream" queues updates for src.worker ──
+    UPDATE_INGEST: str = os.getenv("UPDATE_INGEST", "inline").lower()
+
+    # ── Bulk jobs (sweeps, global bans): Telegram API requests per second ──
+    API_RATE_LIMIT: float = float(os.getenv("API_RATE_LIMIT", "") or "25")
 
     @classmethod
     def validate(cls) -> None:
@@ -0,0 +1,86 @@
+"""
+Game / fun content banks — word lists, riddles, proverbs, emoji pools.
+
+The content lives in data/game_content.json instead of Python literals so it
+is not parsed on every cold start. The file is read once, on the first call
+to get_bank(), and each bank is frozen into a tuple (pairs become 2-tuples).
+
+ShuffleBag hands out items per group without repeats until the bank is
+exhausted — each draw is a list pop, no scanning of previous answers.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import random
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CONTENT_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "game_content.json"
+CONTENT_VERSION = 1
+
+_banks: dict[str, tuple] | None = None
+
+
+def _freeze(items: list) -> tuple:
+    return tuple(tuple(item) if isinstance(item, list) else item for item in items)
+
+
+def _load() -> dict[str, tuple]:
+    global _banks
+    if _banks is None:
+        with open(CONTENT_PATH, encoding="utf-8") as f:
+            raw = json.load(f)
+        version = raw.pop("version", None)
+        if version != CONTENT_VERSION:
+            logger.warning(
+                "Game content version %s does not match expected %s", version, CONTENT_VERSION,
+            )
+        _banks = {name: _freeze(items) for name, items in raw.items()}
+    return _banks
+
+
+def get_bank(name: str) -> tuple:
+    """Return a content bank by name (loaded lazily on first use)."""
+    return _load()[name]
+
+
+def random_item(name: str) -> Any:
+    """Pick a uniformly random item from a bank."""
+    return random.choice(get_bank(name))
+
+
+class ShuffleBag:
+    """Per-group shuffle bag over a content bank.
+
+    Each group gets its own shuffled order of indices; draw() pops the next
+    one and reshuffles when the bag runs dry, never repeating the item that
+    was drawn last. Only the most recent ``max_groups`` groups are tracked.
+    """
+
+    def __init__(self, bank: str, max_groups: int = 1024) -> None:
+        self.bank = bank
+        self.max_groups = max_groups
+        self._bags: OrderedDict[int, list[int]] = OrderedDict()
+        self._last: dict[int, int] = {}
+
+    def draw(self, group_id: int) -> Any:
+        items = get_bank(self.bank)
+        bag = self._bags.get(group_id)
+        if not bag:
+            bag = list(range(len(items)))
+            random.shuffle(bag)
+            # The bag is popped from the end; don't start with last round's item
+            if len(bag) > 1 and bag[-1] == self._last.get(group_id):
+                bag[0], bag[-1] = bag[-1], bag[0]
+            self._bags[group_id] = bag
+        self._bags.move_to_end(group_id)
+        if len(self._bags) > self.max_groups:
+            evicted, _ = self._bags.popitem(last=False)
+            self._last.pop(evicted, None)
+        index = bag.pop()
+        self._last[group_id] = index
+        return items[index]
@@ -1,11 +1,14 @@
 """
 Arabic and English message templates used throughout the bot.
-Ported from the Lua bot's message system — full data arrays for games,
-fun commands, greetings, riddles, proverbs, etc.
+Ported from the Lua bot's message system — greetings, chat responses, etc.
+Game / fun content (riddles, proverbs, jokes, ...) lives in data/game_content.json
+and is loaded lazily via src.constants.content.
 """
 from __future__ import annotations
 import random
 
+from src.constants.content import random_item
+
 # ── Channel / Support URLs ──
 SUPPORT_CHANNEL = "@BO_MR"
 SUPPORT_CHANNEL_URL = "https://t.me/BO_MR"
@@ -214,220 +217,9 @@ GREETING_RESPONSES = {
     "كيف حالك": ["الحمد لله بخير 🤍", "تمام الحمد لله 👌"],
 }
 
-# ── Fun / Insults (from Lua) ──
-INSULTS = [
-    "يا غبي 😂",
-    "يا حمار 🫏",
-    "يا تيس 🐐",
-    "يا بقره 🐄",
-    "روح العب بعيد 🏃",
-    "يا بطه 🦆",
-    "وجهك زي القمر... القمر الي على الارض 🌚",
-    "يا فاشل 😂",
-    "يا خروف 🐑",
-    "يا ثور 🐂",
-    "شكلك نايم وقاعد بنفس الوقت 😴",
-    "يا واد يا زعيم 👊",
-]
-
-# ── Riddles / حزوره (from games.lua) ──
-RIDDLES = [
-    {"question": "شي موجود في السماء اذا اضفت اليه حرف اصبح في الارض؟", "answer": "نجم - منجم"},
-    {"question": "ما هو الشيء الذي يمشي ويقف وليس له ارجل؟", "answer": "الساعه"},
-    {"question": "شيء له اسنان ولا يعض؟", "answer": "المشط"},
-    {"question": "ما هو الشيء الذي كلما زاد نقص؟", "answer": "العمر"},
-    {"question": "ما هو الشيء الذي يسمع بلا اذن ويتكلم بلا لسان؟", "answer": "الهاتف"},
-    {"question": "شيء يوجد في القرن مره وفي الدقيقه مرتين ولا يوجد في الساعه؟", "answer": "حرف القاف"},
-    {"question": "اخت خالك وليست خالتك من هي؟", "answer": "امك"},
-    {"question": "ما هو الشيء الذي يكتب ولا يقرأ؟", "answer": "القلم"},
-    {"question": "ما هو الذي يرى كل شي وليس له عيون؟", "answer": "المرآه"},
-    {"question": "ما الشيء الذي له رقبه وليس له رأس؟", "answer": "القاروره"},
-    {"question": "ما هو الشيء الذي اذا دخل الماء لا يبتل؟", "answer": "الضوء"},
-    {"question": "شيء تحمله ويحملك؟", "answer": "الحذاء"},
-    {"question": "ما هو البيت الذي ليس فيه ابواب ولا نوافذ؟", "answer": "بيت الشعر"},
-    {"question": "يسمعك ولا تسمعه ويراك ولا تراه؟", "answer": "الجاسوس"},
-    {"question": "ما هو الشيء الذي لا يمشي الا بالضرب؟", "answer": "المسمار"},
-    {"question": "ما الشيء الذي ليس له بدايه ولا نهايه؟", "answer": "الدائره"},
-    {"question": "ما هو الحيوان الذي يحك اذنه بأنفه؟", "answer": "الفيل"},
-    {"question": "ما الذي له يد ولا يمسك؟", "answer": "الميزان"},
-    {"question": "ما هو الشي الذي تذبحه وتبكي عليه؟", "answer": "البصل"},
-    {"question": "ما هو الشيء الذي يقرصك ولا تراه؟", "answer": "الجوع"},
-    # Additional riddles from games.lua
-    {"question": "شيئ اذا لمسته صرخ ما هوه؟", "answer": "الجرس"},
-    {"question": "اخوان لا يستطيعان تمضيه اكثر من دقيقه معا فما هما؟", "answer": "عقرب الساعه"},
-    {"question": "ما هو الحيوان الذي لم يصعد الى سفينة نوح عليه السلام؟", "answer": "السمك"},
-    {"question": "شيئ يسقط على رأسك من الاعلى ولا يجرحك فما هو؟", "answer": "المطر"},
-    {"question": "ما العدد الذي اذا ضربته بنفسه واضفت عليه 5 يصبح ثلاثين؟", "answer": "5"},
-    {"question": "ما الشيئ الذي له اوراق وليس له جذور؟", "answer": "الكتاب"},
-    {"question": "عائله مؤلفه من 6 بنات واخ لكل منهن. فكم عدد افراد العائله؟", "answer": "7"},
-    {"question": "ما هو الشيئ الموجود وسط مكة؟", "answer": "الكعبه"},
-    {"question": "وحده حلوه ومغروره تلبس مية تنوره. من هيه؟", "answer": "لهانه"},
-    {"question": "ابن امك وابن ابيك وليس باختك ولا باخيك فمن يكون؟", "answer": "انا"},
-    {"question": "ما هو الشيئ الذي كلما خطا خطوه فقد شيئا من ذيله؟", "answer": "الابره"},
-    {"question": "ما هو الشيئ الذي يقول الصدق ولكنه اذا جاع كذب؟", "answer": "الساعه"},
-    {"question": "كم مره ينطبق عقربا الساعه على بعضهما في اليوم الواحد؟", "answer": "22"},
-    {"question": "ما هي الكلمه الوحيده التي تلفظ غلط دائما؟", "answer": "غلط"},
-    {"question": "ما هو السؤال الذي تختلف اجابته دائما؟", "answer": "كم الساعه"},
-    {"question": "جسم اسود وقلب ابيض وراس اخظر فما هو؟", "answer": "البيتنجان"},
-    {"question": "ماهو الشيئ الذي اسمه على لونه؟", "answer": "البيض"},
-    {"question": "ارى كل شيئ من دون عيون من اكون؟", "answer": "المرايه"},
-    {"question": "ما هو الشيئ الذي يخترق الزجاج ولا يكسره؟", "answer": "الضوء"},
-    {"question": "ما هو الشيئ الذي يسير امامك ولا تراه؟", "answer": "الهواء"},
-    {"question": "ما هو الشيئ الذي يلاحقك اينما تذهب؟", "answer": "الضل"},
-    {"question": "ما هو الشيئ اذا أخذنا منه ازداد وكبر؟", "answer": "الحفره"},
-    {"question": "ما هو الشيئ الذي يرفع اثقال ولا يقدر يرفع مسمار؟", "answer": "البحر"},
-    {"question": "انا ابن الماء فان تركوني في الماء مت فمن انا؟", "answer": "الثلج"},
-    {"question": "كلي ثقوب ومع ذالك احفض الماء فمن اكون؟", "answer": "الاسفنج"},
-    {"question": "اسير بلا رجلين ولا ادخل الا بالاذنين فمن انا؟", "answer": "الصوت"},
-    {"question": "حامل ومحمول نصف ناشف ونصف مبلول فمن اكون؟", "answer": "بلم"},
-]
-
-# ── Emoji Meanings / معاني (from games.lua) ──
-EMOJI_MEANINGS = [
-    {"emoji": "🤦", "answer": "خيبه"},
-    {"emoji": "🤷", "answer": "ما ادري"},
-    {"emoji": "🙈", "answer": "خجل"},
-    {"emoji": "🙊", "answer": "صمت"},
-    {"emoji": "🙉", "answer": "ما اسمع"},
-    {"emoji": "🤝", "answer": "اتفاق"},
-    {"emoji": "💔", "answer": "قلب مكسور"},
-    {"emoji": "🔥", "answer": "نار"},
-    {"emoji": "💀", "answer": "جمجمه"},
-    {"emoji": "🤮", "answer": "استفراغ"},
-    {"emoji": "🫡", "answer": "تحيه"},
-    {"emoji": "🥱", "answer": "ملل"},
-    {"emoji": "😱", "answer": "رعب"},
-    {"emoji": "🫠", "answer": "ذوبان"},
-    {"emoji": "🤡", "answer": "مهرج"},
-    {"emoji": "👻", "answer": "شبح"},
-    {"emoji": "🦋", "answer": "فراشه"},
-    {"emoji": "🌹", "answer": "ورده"},
-    {"emoji": "⚡", "answer": "برق"},
-    {"emoji": "🌊", "answer": "موج"},
-    # Additional emoji meanings from games.lua
-    {"emoji": "🐒", "answer": "قرد"},
-    {"emoji": "🐔", "answer": "دجاجه"},
-    {"emoji": "🐧", "answer": "بطريق"},
-    {"emoji": "🐸", "answer": "ضفدع"},
-    {"emoji": "🦉", "answer": "بومه"},
-    {"emoji": "🐝", "answer": "نحله"},
-    {"emoji": "🐓", "answer": "ديك"},
-    {"emoji": "🐫", "answer": "جمل"},
-    {"emoji": "🐄", "answer": "بقره"},
-    {"emoji": "🐊", "answer": "تمساح"},
-    {"emoji": "🦈", "answer": "قرش"},
-    {"emoji": "🐅", "answer": "نمر"},
-    {"emoji": "🐙", "answer": "اخطبوط"},
-    {"emoji": "🐟", "answer": "سمكه"},
-    {"emoji": "🦇", "answer": "خفاش"},
-    {"emoji": "🦁", "answer": "اسد"},
-    {"emoji": "🐭", "answer": "فأر"},
-    {"emoji": "🐺", "answer": "ذئب"},
-    {"emoji": "🦂", "answer": "عقرب"},
-    {"emoji": "🦒", "answer": "زرافه"},
-    {"emoji": "🦔", "answer": "قنفذ"},
-    {"emoji": "🍎", "answer": "تفاحه"},
-    {"emoji": "🍆", "answer": "باذنجان"},
-]
-
-# ── Proverbs / امثله (from games.lua) ──
-PROVERBS = [
-    {"proverb": "اللي ما يعرف _____ يشويه", "answer": "الصقر"},
-    {"proverb": "العين بصيره و_____ قصيره", "answer": "اليد"},
-    {"proverb": "اللي يبي العسل يصبر على _____ النحل", "answer": "قرص"},
-    {"proverb": "درهم وقايه خير من _____ علاج", "answer": "قنطار"},
-    {"proverb": "الصبر مفتاح _____", "answer": "الفرج"},
-    {"proverb": "من جد _____", "answer": "وجد"},
-    {"proverb": "العلم في الصغر كالنقش على _____", "answer": "الحجر"},
-    {"proverb": "اذا كان الكلام من _____ فالسكوت من ذهب", "answer": "فضه"},
-    {"proverb": "لا تؤجل عمل _____ الى الغد", "answer": "اليوم"},
-    {"proverb": "رب اخ لك لم _____ امك", "answer": "تلده"},
-    {"proverb": "الطيور على _____ تقع", "answer": "اشكالها"},
-    {"proverb": "عصفور في _____ خير من عشره على الشجره", "answer": "اليد"},
-    {"proverb": "المكتوب باين من _____", "answer": "عنوانه"},
-    {"proverb": "لسانك _____ ان صنته صانك", "answer": "حصانك"},
-    {"proverb": "من طلب _____ سهر الليالي", "answer": "العلا"},
-]
-
 # ── Math Questions / رياضيات ──
 MATH_OPERATIONS = ["+", "-", "×"]
 
-# ── English Translation / انكليزي ──
-ENGLISH_WORDS = [
-    {"word": "سماء", "answer": "sky"},
-    {"word": "ارض", "answer": "earth"},
-    {"word": "ماء", "answer": "water"},
-    {"word": "نار", "answer": "fire"},
-    {"word": "شمس", "answer": "sun"},
-    {"word": "قمر", "answer": "moon"},
-    {"word": "نجم", "answer": "star"},
-    {"word": "بحر", "answer": "sea"},
-    {"word": "جبل", "answer": "mountain"},
-    {"word": "شجره", "answer": "tree"},
-    {"word": "كتاب", "answer": "book"},
-    {"word": "باب", "answer": "door"},
-    {"word": "بيت", "answer": "house"},
-    {"word": "قلم", "answer": "pen"},
-    {"word": "قلب", "answer": "heart"},
-    {"word": "عين", "answer": "eye"},
-    {"word": "يد", "answer": "hand"},
-    {"word": "حب", "answer": "love"},
-    {"word": "سلام", "answer": "peace"},
-    {"word": "حياه", "answer": "life"},
-    {"word": "موت", "answer": "death"},
-    {"word": "صديق", "answer": "friend"},
-    {"word": "سيف", "answer": "sword"},
-    {"word": "اسد", "answer": "lion"},
-    {"word": "نمر", "answer": "tiger"},
-]
-
-# ── Wisdom / حكمه ──
-WISDOMS = [
-    "الصمت زينة الجاهل لو علم لكان أفضل 🌟",
-    "من صبر ظفر 💪",
-    "العقل زينة الانسان 🧠",
-    "لا تيأس فإن مع العسر يسرا 🌈",
-    "اذا اردت شيئاً بشدة فأطلق سراحه فإن عاد اليك فهو لك 🕊",
-    "كن جميلاً ترى الوجود جميلاً 🌸",
-    "ليس الشديد بالصرعه ولكن الشديد الذي يملك نفسه عند الغضب 🔥",
-    "الناس نيام فاذا ماتوا انتبهوا 👁",
-    "لا تحزن ان الله معنا ☀️",
-    "اذا هبت رياحك فاغتنمها 🌬",
-    "كل اناء ينضح بما فيه 🫗",
-    "خير الكلام ما قل ودل 📝",
-    "لا تبكي على اللبن المسكوب 🥛",
-    "اسعَ فإن السعي سبب النجاح 🏃",
-    "الحياة مدرسه وأعظم دروسها التجارب 📚",
-]
-
-# ── Jokes / نكته ──
-JOKES = [
-    "واحد حول يقول لابوه: بابا شوف القمر شكد حلو! قاله: هاي الشمس يبني 😂",
-    "واحد اشترى تلفون جديد، قالوله: فيه كاميرا! قال: لا هذا مو حقي 😂",
-    "واحد بخيل لبس نظاره شمسيه بالليل عشان ما يصرف على الكهرباء 😂",
-    "واحد سألوه وين تشتغل؟ قال: بالبيت.. قالوله: شنو شغلك؟ قال: اشغل التلفزيون 😂",
-    "واحد نام بالشارع وحط مخده وغطا! سألوه ليش؟ قال: بيتنا حار 😂",
-    "واحد دخل المستشفى قالوله: شبيك؟ قال: ما شبيي بس حبيت ازوركم 😂",
-    "واحد كسلان يصلي! قالوله: ليش ما تصلي؟ قال: الله غني عن العالمين 😂",
-    "واحد حب وحده بس خاف يكلمها! كل يوم يروح يطق باب بيتها ويركض 😂",
-    "واحد سمع ان السمك مفيد للذاكره! راح صاد سمچ ونساه بالسياره 😂",
-    "مره واحد اتصل على الشرطه قالهم: تعالوا بسرعه في واحد يسرق بيتي! قالوله اهدا، قال: ما اگدر هو ياكل من ثلاجتي 😂",
-]
-
-# ── Poetry Lines / شعر ──
-POETRY = [
-    "يا ليل طول ما تبي طول\nوانا على فرقاه سهران 🌙",
-    "اذا الشعب يوماً اراد الحياة\nفلا بد ان يستجيب القدر 🦁",
-    "قف دون رأيك في الحياة مجاهداً\nان الحياة عقيدة وجهاد ⚔️",
-    "ما كل ما يتمنى المرء يدركه\nتجري الرياح بما لا تشتهي السفن 🚢",
-    "وما نيل المطالب بالتمني\nولكن تؤخذ الدنيا غلابا 💪",
-    "لا تحسبن المجد تمراً أنت آكله\nلن تبلغ المجد حتى تلعق الصبرا 🌟",
-    "اذا غامرت في شرف مروم\nفلا تقنع بما دون النجوم ⭐",
-    "سلام على الدنيا اذا لم يكن بها\nصديق صدوق صادق الوعد منصفا 🤝",
-    "تعلم فليس المرء يولد عالماً\nوليس أخو علم كمن هو جاهل 📖",
-    "وإذا كانت النفوس كباراً\nتعبت في مرادها الأجسام 🏔",
-]
-
 # ── Country Names → Flags / دول اعلام ──
 COUNTRY_FLAGS = {
     "العراق": "🇮🇶", "مصر": "🇪🇬", "السعوديه": "🇸🇦", "الامارات": "🇦🇪",
@@ -473,35 +265,39 @@ HATE_PHRASES = [
 
 
 def get_random_insult() -> str:
-    return random.choice(INSULTS)
+    return random_item("insults")
 
 
 def get_random_riddle() -> dict:
-    return random.choice(RIDDLES)
+    question, answer = random_item("riddles")
+    return {"question": question, "answer": answer}
 
 
 def get_random_emoji_meaning() -> dict:
-    return random.choice(EMOJI_MEANINGS)
+    emoji, answer = random_item("emoji_meanings")
+    return {"emoji": emoji, "answer": answer}
 
 
 def get_random_proverb() -> dict:
-    return random.choice(PROVERBS)
+    proverb, answer = random_item("proverbs")
+    return {"proverb": proverb, "answer": answer}
 
 
 def get_random_english_word() -> dict:
-    return random.choice(ENGLISH_WORDS)
+    word, answer = random_item("english_words")
+    return {"word": word, "answer": answer}
 
 
 def get_random_wisdom() -> str:
-    return random.choice(WISDOMS)
+    return random_item("wisdoms")
 
 
 def get_random_joke() -> str:
-    return random.choice(JOKES)
+    return random_item("jokes")
 
 
 def get_random_poetry() -> str:
-    return random.choice(POETRY)
+    return random_item("poetry")
 
 
 def generate_math_question() -> tuple[str, int]:
@@ -1,4 +1,4 @@
-from src.economy.models import set_cheater, set_banned, seize_assets
+from src.economy.models import db, set_cheater, set_banned, seize_assets
 from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler
 
@@ -8,8 +8,8 @@ async def ban_seize(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Usage: /ban_seize <user_id>")
         return
     user_id = int(context.args[0])
-    set_banned(user_id, True)
-    seize_assets(user_id)
+    await db.run(set_banned, user_id, True)
+    await db.run(seize_assets, user_id)
     await update.message.reply_text(f"تم حظر المستخدم {user_id} ومصادرة جميع أملاكه.")
 
 # /pardon <user_id>
@@ -18,8 +18,8 @@ async def pardon(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Usage: /pardon <user_id>")
         return
     user_id = int(context.args[0])
-    set_banned(user_id, False)
-    set_cheater(user_id, False)
+    await db.run(set_banned, user_id, False)
+    await db.run(set_cheater, user_id, False)
     await update.message.reply_text(f"تم العفو عن المستخدم {user_id}.")
 
 # Register admin commands
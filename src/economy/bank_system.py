@@ -1,65 +1,101 @@
-import os  # Ensure the 'os' module is imported for environment variable access
-import redis
-import datetime
+"""
+Bank system — point balances, daily gifts and transfers.
+
+The balances live in the economy store (src/economy/store.py): Redis by
+default, or the embedded SQLite database with ECONOMY_BACKEND=sqlite. Every
+balance change is a single atomic operation in the store, so the balance
+check and the writes can't interleave and a crash can't leave a half-applied
+transfer. Each operation:
+  * carries an operation ID; replaying the same ID returns the first
+    result instead of moving points again (Telegram redeliveries, retries)
+  * appends an entry to the store's ledger, which is never rewritten —
+    balances can be audited or rebuilt from it.
+"""
 import random
-from datetime import timedelta
+import time
+import uuid
+from datetime import datetime
+
+from src.economy import transaction_history
+from src.economy.store import STATUS_CATEGORY, STATUS_COOLDOWN, STATUS_INSUFFICIENT, STATUS_OK, get_store
+
+DAILY_COOLDOWN = 24 * 3600
+
 
-# Initialize Redis connection
-redis_client = redis.StrictRedis(
-    host=os.getenv("REDIS_HOST", "127.0.0.1"),
-    port=int(os.getenv("REDIS_PORT", 6379)),
-    db=int(os.getenv("REDIS_DB", 0)),
-    password=os.getenv("REDIS_PASSWORD", None),
-    decode_responses=True
-)
+def _new_op_id(op_id):
+    return op_id or uuid.uuid4().hex
 
-# Replace SQLite functions with Redis equivalents
+
+# ── Accounts ──
 
 def init_db():
-    # No initialization needed for Redis
-    pass
+    # The store creates its schema on first use
+    get_store()
 
 def has_bank_account(user_id):
-    return redis_client.hexists(f"user:{user_id}", "has_account")
+    account = get_store().get_account(user_id)
+    return bool(account and account.has_account)
 
 def open_bank_account(user_id, category="default"):
-    if not has_bank_account(user_id):
-        redis_client.hset(f"user:{user_id}", mapping={
-            "bank_balance": 100,
-            "has_account": True,
-            "is_cheater": False,
-            "is_banned": False,
-            "last_daily": None,
-            "category": category
-        })
+    if get_store().open_account(user_id, category):
         return f"✅ تم فتح حساب بنكي بنجاح في الفئة '{category}'! رصيدك الابتدائي هو 100 نقطة."
     return "❌ لديك حساب بنكي بالفعل."
 
 def get_balance(user_id):
-    return int(redis_client.hget(f"user:{user_id}", "bank_balance") or 0)
+    return get_store().get_balance(user_id)
 
-def update_balance(user_id, amount):
-    redis_client.hincrby(f"user:{user_id}", "bank_balance", amount)
 
-def claim_daily(user_id):
-    last_daily = redis_client.hget(f"user:{user_id}", "last_daily")
-    if last_daily:
-        last_daily = datetime.strptime(last_daily, "%Y-%m-%d %H:%M:%S")
-        if datetime.now() - last_daily < timedelta(days=1):
-            return "❌ لقد حصلت على هديتك اليومية بالفعل. حاول مرة أخرى غدًا."
+# ── Balance changes ──
+
+def award(user_id, amount, reason="award", op_id=None, allow_negative=False):
+    """Atomically add (or, if negative, take) points.
+
+    Returns (ok, balance). A debit that would overdraw the account returns
+    (False, current_balance) and changes nothing.
+    """
+    status, balance = get_store().apply(user_id, int(amount), reason, _new_op_id(op_id), allow_negative)
+    if status == STATUS_OK:
+        transaction_history.log_transaction(user_id, reason, int(amount))
+    return status != STATUS_INSUFFICIENT, balance
 
+def debit(user_id, amount, reason="debit", op_id=None):
+    """Take amount points if the balance covers it. Returns True on success."""
+    ok, _ = award(user_id, -abs(int(amount)), reason, op_id)
+    return ok
+
+def update_balance(user_id, amount):
+    award(user_id, amount, "adjust", allow_negative=True)
+
+def claim_daily(user_id, op_id=None):
     gift = random.randint(50, 200)
-    redis_client.hset(f"user:{user_id}", "bank_balance", get_balance(user_id) + gift)
-    redis_client.hset(f"user:{user_id}", "last_daily", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    return f"💰 لقد حصلت على {gift} نقطة كهديتك اليومية!"
+    label = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    status, value = get_store().claim_daily(
+        user_id, gift, int(time.time()), DAILY_COOLDOWN, label, _new_op_id(op_id),
+    )
+    if status == STATUS_COOLDOWN:
+        return "❌ لقد حصلت على هديتك اليومية بالفعل. حاول مرة أخرى غدًا."
+    if status == STATUS_OK:
+        transaction_history.log_transaction(user_id, "daily", gift)
+    return f"💰 لقد حصلت على {int(value)} نقطة كهديتك اليومية!"
 
-def transfer_points(from_user, to_user, amount, category="default"):
-    if redis_client.hget(f"user:{from_user}", "category") != category or redis_client.hget(f"user:{to_user}", "category") != category:
-        return "❌ لا يمكنك تحويل النقاط بين حسابات في فئات مختلفة."
+def transfer_points(from_user, to_user, amount, category="default", op_id=None):
+    if amount <= 0:
+        return "❌ يجب أن يكون المبلغ أكبر من صفر."
+    if from_user == to_user:
+        return "❌ لا يمكنك التحويل إلى نفسك."
 
-    if get_balance(from_user) < amount:
+    status, _ = get_store().transfer(from_user, to_user, int(amount), category, _new_op_id(op_id))
+    if status == STATUS_CATEGORY:
+        return "❌ لا يمكنك تحويل النقاط بين حسابات في فئات مختلفة."
+    if status == STATUS_INSUFFICIENT:
         return "❌ رصيدك لا يكفي لإتمام عملية التحويل."
+    if status == STATUS_OK:
+        transaction_history.log_transfer(from_user, to_user, amount, category)
+    return f"✅ تم تحويل {amount} نقطة بنجاح من حسابك إلى حساب المستخدم الآخر في الفئة '{category}'."
+
+
+# ── Ledger ──
 
-    update_balance(from_user, -amount)
-    update_balance(to_user, amount)
-    return f"✅ تم تحويل {amount} نقطة بنجاح من حسابك إلى حساب المستخدم الآخر في الفئة '{category}'."
\ No newline at end of file
+def get_ledger(count=50):
+    """Newest-first ledger entries as dicts."""
+    return get_store().get_ledger(count)
@@ -1,4 +1,5 @@
 from src.economy.models import update_balance, get_user
+from src.economy.store import get_store
 from src.economy.decorators import needs_bank_account
 from src.economy.localization import get_string
 
@@ -8,5 +9,5 @@ from src.economy.localization import get_string
 async def award_points(update, context, points: int):
     user_id = update.effective_user.id
     lang = "ar"  # TODO: fetch from DB per group/user
-    update_balance(user_id, points)
+    await get_store().call(update_balance, user_id, points)
     await update.message.reply_text(get_string(lang, "game_win", name=update.effective_user.first_name, points=points))
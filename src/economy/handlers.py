@@ -1,7 +1,10 @@
 
 from telegram import Update
 from telegram.ext import ContextTypes, MessageHandler, filters
-from src.economy.models import init_db, create_account, get_user, update_balance
+from src.economy.bank_system import claim_daily
+from src.economy.leaderboard import track_member
+from src.economy.models import init_db, create_account, get_user
+from src.economy.store import get_store
 from src.economy.localization import get_string
 from src.economy.decorators import needs_bank_account
 from src.utils.decorators import group_only
@@ -23,12 +26,13 @@ async def open_bank(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not await _check_games_enabled(update, context):
         return
     user_id = update.effective_user.id
+    track_member(update.effective_chat.id, user_id)
     lang = "ar"  # TODO: fetch from DB per group/user
-    user = get_user(user_id)
+    user = await get_store().call(get_user, user_id)
     if user and user.get("has_account"):
         await update.message.reply_text("لديك حساب بنكي بالفعل! / You already have a bank account!")
         return
-    create_account(user_id)
+    await get_store().call(create_account, user_id)
     await update.message.reply_text(get_string(lang, "bank_balance", amount=100))
 
 @group_only
@@ -37,8 +41,9 @@ async def balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not await _check_games_enabled(update, context):
         return
     user_id = update.effective_user.id
+    track_member(update.effective_chat.id, user_id)
     lang = "ar"  # TODO: fetch from DB per group/user
-    user = get_user(user_id)
+    user = await get_store().call(get_user, user_id)
     await update.message.reply_text(get_string(lang, "bank_balance", amount=user["bank_balance"]))
 
 @group_only
@@ -46,12 +51,11 @@ async def balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def daily(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not await _check_games_enabled(update, context):
         return
-    import random
     user_id = update.effective_user.id
-    lang = "ar"  # TODO: fetch from DB per group/user
-    gift = random.randint(50, 200)
-    update_balance(user_id, gift)
-    await update.message.reply_text(get_string(lang, "bank_daily", amount=gift))
+    track_member(update.effective_chat.id, user_id)
+    op_id = f"daily:{update.effective_chat.id}:{update.message.message_id}"
+    # Same store and cooldown as the auto-response "راتب" command
+    await update.message.reply_text(await get_store().call(claim_daily, user_id, op_id=op_id))
 
 def register_economy_handlers(app):
     G = filters.ChatType.GROUPS
@@ -1,28 +1,17 @@
+from src.config import Config
 from src.economy.models import get_user
 from src.economy.items import get_item_rarity, ITEMS_DATABASE
-import sqlite3
+from src.services.sqlite_service import SqliteService
 
-DB_PATH = '/tmp/economy.db'
+DB_PATH = Config.ECONOMY_DB_PATH
+db = SqliteService(DB_PATH)
 
 def add_item(user_id: int, item_name: str):
     rarity = get_item_rarity(item_name)
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('INSERT OR IGNORE INTO inventory (user_id, item_name, item_rarity) VALUES (?, ?, ?)', (user_id, item_name, rarity))
-    conn.commit()
-    conn.close()
+    db.execute('INSERT OR IGNORE INTO inventory (user_id, item_name, item_rarity) VALUES (?, ?, ?)', (user_id, item_name, rarity))
 
 def remove_item(user_id: int, item_name: str):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('DELETE FROM inventory WHERE user_id=? AND item_name=?', (user_id, item_name))
-    conn.commit()
-    conn.close()
+    db.execute('DELETE FROM inventory WHERE user_id=? AND item_name=?', (user_id, item_name))
 
 def get_inventory(user_id: int):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('SELECT item_name, item_rarity FROM inventory WHERE user_id=?', (user_id,))
-    items = c.fetchall()
-    conn.close()
-    return items
+    return [tuple(row) for row in db.fetchall('SELECT item_name, item_rarity FROM inventory WHERE user_id=?', (user_id,))]
@@ -0,0 +1,76 @@
+"""
+Wealth leaderboard — richest users globally and per group, and "my rank".
+
+The ranking itself is kept by the economy store in the same atomic write as
+each balance change (the ``bank:rich`` sorted set for Redis, an index on
+``bank_balance`` for SQLite). This module adds group scoping: users who use
+the bank in a group are recorded in the set ``bank:members:{chat_id}``, and
+a group board is the global ranking restricted to that set.
+
+Rebuild the ranking from existing accounts (e.g. after an upgrade):
+    python -m src.economy.leaderboard rebuild
+"""
+from __future__ import annotations
+
+import logging
+import sys
+
+from src.economy.store import get_store
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger(__name__)
+
+redis_svc = RedisService()
+
+
+def _members_key(chat_id: int) -> str:
+    return f"bank:members:{chat_id}"
+
+
+def track_member(chat_id: int, user_id: int) -> None:
+    """Record that user_id uses the bank in chat_id (for group boards)."""
+    redis_svc.sadd(_members_key(chat_id), user_id)
+
+
+def _group_members(chat_id: int) -> list[int]:
+    return [int(uid) for uid in redis_svc.smembers(_members_key(chat_id))]
+
+
+def richest(count: int = 10, chat_id: int | None = None) -> list[tuple[int, int]]:
+    """Top (user_id, balance) pairs, globally or among a group's bank users."""
+    members = _group_members(chat_id) if chat_id is not None else None
+    return get_store().richest(count, members)
+
+
+def get_rank(user_id: int, chat_id: int | None = None) -> int | None:
+    """1-based rank of user_id, globally or within a group; None if unranked."""
+    members = _group_members(chat_id) if chat_id is not None else None
+    return get_store().rank(user_id, members)
+
+
+def display_names(user_ids: list[int]) -> dict[int, str]:
+    """First names from the bot's user records, in one pipelined round trip."""
+    pipe = redis_svc.client.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.hget(f"bot:user:{user_id}", "first_name")
+    return {uid: name or str(uid) for uid, name in zip(user_ids, pipe.execute())}
+
+
+def rebuild() -> int:
+    """Rebuild the store's ranking from its accounts. Returns how many are ranked."""
+    return get_store().rebuild_leaderboard()
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse  # CLI only; keeps it (and gettext) off the handler import path
+
+    parser = argparse.ArgumentParser(description="Wealth leaderboard maintenance")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.info("Ranked %d accounts", rebuild())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
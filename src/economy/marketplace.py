@@ -1,84 +1,182 @@
-import sqlite3
+"""
+Marketplace — fixed-price listings and auctions.
+
+Listings are read a page at a time with keyset pagination over
+(price, id): a page is one index range scan whatever the table size, and
+the cursor a button carries is just the boundary row's (price, id).
+
+Buying, bidding and closing an auction each run inside one SQLite write
+transaction that holds the listing row, so two buyers can't both take the
+same item. Money moves through the economy store with per-listing operation
+IDs. With the SQLite backend on the same database file, those store writes
+join the marketplace transaction and the whole trade is one commit. With
+Redis, a retried trade re-applies the same operation IDs, so balances move
+exactly once.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from src.config import Config
 from src.economy.items import get_item_rarity
+from src.economy.store import STATUS_INSUFFICIENT, get_store
+from src.services.sqlite_service import SqliteService
+
+DB_PATH = Config.ECONOMY_DB_PATH
+db = SqliteService(DB_PATH)
+
+PAGE_SIZE = 10
+
+_LISTING_COLUMNS = "id, seller_id, item_name, item_rarity, price, is_auction, top_bidder, top_bid"
+
+
+@dataclass
+class MarketPage:
+    items: list[tuple]      # rows in _LISTING_COLUMNS order, cheapest first
+    has_prev: bool
+    has_next: bool
 
-DB_PATH = '/tmp/economy.db'
+    @property
+    def first_cursor(self) -> tuple[int, int] | None:
+        return (self.items[0][4], self.items[0][0]) if self.items else None
+
+    @property
+    def last_cursor(self) -> tuple[int, int] | None:
+        return (self.items[-1][4], self.items[-1][0]) if self.items else None
+
+
+def create_indexes(conn) -> None:
+    """Indexes backing listing pages, rarity filters and per-seller lookups."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_market_price ON marketplace (price, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_market_rarity ON marketplace (item_rarity, price, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_market_seller ON marketplace (seller_id)")
+
+
+# ── Listing ──
 
 # List an item for sale or auction
 def list_item_for_sale(seller_id: int, item_name: str, price: int, is_auction: bool = False):
     rarity = get_item_rarity(item_name)
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''INSERT INTO marketplace (seller_id, item_name, item_rarity, price, is_auction, top_bidder, top_bid)
-                 VALUES (?, ?, ?, ?, ?, NULL, NULL)''', (seller_id, item_name, rarity, price, int(is_auction)))
-    conn.commit()
-    conn.close()
-
-# Get all items for sale/auction
-def get_market_items():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('SELECT id, seller_id, item_name, item_rarity, price, is_auction, top_bidder, top_bid FROM marketplace')
-    items = c.fetchall()
-    conn.close()
-    return items
-
-# Place a bid on an auction item
-def place_bid(item_id: int, bidder_id: int, bid: int):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('UPDATE marketplace SET top_bidder=?, top_bid=? WHERE id=?', (bidder_id, bid, item_id))
-    conn.commit()
-    conn.close()
+    db.execute('''INSERT INTO marketplace (seller_id, item_name, item_rarity, price, is_auction, top_bidder, top_bid)
+                  VALUES (?, ?, ?, ?, ?, NULL, NULL)''', (seller_id, item_name, rarity, price, int(is_auction)))
 
-# Buy an item (direct sale)
-def buy_item(item_id: int, buyer_id: int):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('SELECT seller_id, item_name FROM marketplace WHERE id=?', (item_id,))
-    row = c.fetchone()
-    if not row:
-        conn.close()
-        return None
-    seller_id, item_name = row
-    # Remove from marketplace
-    c.execute('DELETE FROM marketplace WHERE id=?', (item_id,))
-    conn.commit()
-    conn.close()
-    return seller_id, item_name
+# Updated the `add_item` function to include `item_rarity` as a parameter
+def add_item(seller_id: int, item_name: str, item_rarity: str, price: int, is_auction: bool = False):
+    if price <= 0:
+        return "❌ يجب أن يكون السعر أكبر من صفر."
+    cursor = db.execute(
+        '''INSERT INTO marketplace (seller_id, item_name, item_rarity, price, is_auction, top_bidder, top_bid)
+           VALUES (?, ?, ?, ?, ?, NULL, NULL)''',
+        (seller_id, item_name, item_rarity, price, int(is_auction))
+    )
+    if is_auction:
+        return f"✅ تم فتح مزاد [{cursor.lastrowid}] على '{item_name}' بسعر ابتدائي {price} نقطة."
+    return f"✅ تم إضافة السلعة '{item_name}' إلى السوق بسعر {price} نقطة."
 
 # Add a function to modify an existing item in the marketplace
 def modify_item(item_id, new_price):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT id FROM marketplace WHERE id = ?", (item_id,))
-    item = c.fetchone()
-    if not item:
-        conn.close()
+    if not db.execute("UPDATE marketplace SET price = ? WHERE id = ?", (new_price, item_id)).rowcount:
         return "❌ السلعة غير موجودة في السوق."
-
-    c.execute("UPDATE marketplace SET price = ? WHERE id = ?", (new_price, item_id))
-    conn.commit()
-    conn.close()
     return f"✅ تم تعديل سعر السلعة بنجاح إلى {new_price} نقطة."
 
-# Updated the `add_item` function to include `item_rarity` as a parameter
-def add_item(seller_id: int, item_name: str, item_rarity: str, price: int):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        '''INSERT INTO marketplace (seller_id, item_name, item_rarity, price, is_auction, top_bidder, top_bid)
-           VALUES (?, ?, ?, ?, 0, NULL, NULL)''',
-        (seller_id, item_name, item_rarity, price)
-    )
-    conn.commit()
-    conn.close()
-    return f"✅ تم إضافة السلعة '{item_name}' إلى السوق بسعر {price} نقطة."
+def list_items(after: tuple[int, int] | None = None, before: tuple[int, int] | None = None,
+               rarity: str | None = None, limit: int = PAGE_SIZE) -> MarketPage:
+    """One page of listings, cheapest first.
+
+    ``after`` / ``before`` are the (price, id) cursors of the previous page's
+    last / the next page's first row; with neither, the first page.
+    """
+    where, params = [], []
+    if rarity:
+        where.append("item_rarity = ?")
+        params.append(rarity)
+    if before is not None:
+        where.append("(price, id) < (?, ?)")
+        params.extend(before)
+        order = "price DESC, id DESC"
+    else:
+        if after is not None:
+            where.append("(price, id) > (?, ?)")
+            params.extend(after)
+        order = "price, id"
+    sql = f"SELECT {_LISTING_COLUMNS} FROM marketplace"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order} LIMIT ?"
+    rows = [tuple(row) for row in db.fetchall(sql, (*params, limit + 1))]
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if before is not None:
+        return MarketPage(items=rows[::-1], has_prev=more, has_next=True)
+    return MarketPage(items=rows, has_prev=after is not None, has_next=more)
+
+
+# ── Trading ──
+
+def buy_item(item_id: int, buyer_id: int):
+    """Buy a fixed-price listing: buyer pays seller, item goes to the buyer's inventory."""
+    store = get_store()
+    with db.transaction() as conn:
+        row = conn.execute(f"SELECT {_LISTING_COLUMNS} FROM marketplace WHERE id=?", (item_id,)).fetchone()
+        if not row:
+            return "❌ السلعة غير موجودة في السوق."
+        if row["is_auction"]:
+            return "❌ هذه السلعة في مزاد، استخدم المزايدة لشرائها."
+        if row["seller_id"] == buyer_id:
+            return "❌ لا يمكنك شراء سلعتك."
+
+        price = row["price"]
+        status, _ = store.apply(buyer_id, -price, "market_buy", f"market:{item_id}:buy:{buyer_id}")
+        if status == STATUS_INSUFFICIENT:
+            return "❌ رصيدك لا يكفي لشراء هذه السلعة."
+        store.apply(row["seller_id"], price, "market_sale", f"market:{item_id}:sale")
+        conn.execute(
+            "INSERT OR IGNORE INTO inventory (user_id, item_name, item_rarity) VALUES (?, ?, ?)",
+            (buyer_id, row["item_name"], row["item_rarity"]),
+        )
+        conn.execute("DELETE FROM marketplace WHERE id=?", (item_id,))
+    return f"✅ تم شراء '{row['item_name']}' بسعر {price} نقطة."
+
+def place_bid(item_id: int, bidder_id: int, bid: int):
+    """Bid on an auction. The bid is held from the bidder; the outbid bidder is refunded."""
+    store = get_store()
+    with db.transaction() as conn:
+        row = conn.execute(f"SELECT {_LISTING_COLUMNS} FROM marketplace WHERE id=?", (item_id,)).fetchone()
+        if not row or not row["is_auction"]:
+            return "❌ لا يوجد مزاد بهذا الرقم."
+        if row["seller_id"] == bidder_id:
+            return "❌ لا يمكنك المزايدة على سلعتك."
+
+        top_bid, top_bidder = row["top_bid"], row["top_bidder"]
+        minimum = top_bid + 1 if top_bid else row["price"]
+        if bid < minimum:
+            return f"❌ يجب أن تكون مزايدتك {minimum} نقطة على الأقل."
+
+        status, _ = store.apply(bidder_id, -bid, "market_bid", f"market:{item_id}:bid:{bidder_id}:{bid}")
+        if status == STATUS_INSUFFICIENT:
+            return "❌ رصيدك لا يكفي لهذه المزايدة."
+        if top_bidder is not None:
+            store.apply(
+                top_bidder, top_bid, "market_refund", f"market:{item_id}:refund:{top_bidder}:{top_bid}",
+            )
+        conn.execute("UPDATE marketplace SET top_bidder=?, top_bid=? WHERE id=?", (bidder_id, bid, item_id))
+    return f"✅ أنت الآن صاحب أعلى مزايدة على '{row['item_name']}' بمبلغ {bid} نقطة."
 
-# List all items in the marketplace
-def list_items():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT id, seller_id, item_name, item_rarity, price, is_auction FROM marketplace")
-    items = c.fetchall()
-    conn.close()
-    return items
+def close_auction(item_id: int, seller_id: int):
+    """End an auction: the held top bid goes to the seller, the item to the winner."""
+    store = get_store()
+    with db.transaction() as conn:
+        row = conn.execute(f"SELECT {_LISTING_COLUMNS} FROM marketplace WHERE id=?", (item_id,)).fetchone()
+        if not row or not row["is_auction"] or row["seller_id"] != seller_id:
+            return "❌ لا يوجد مزاد لك بهذا الرقم."
+        if row["top_bidder"] is not None:
+            store.apply(seller_id, row["top_bid"], "market_sale", f"market:{item_id}:sale")
+            conn.execute(
+                "INSERT OR IGNORE INTO inventory (user_id, item_name, item_rarity) VALUES (?, ?, ?)",
+                (row["top_bidder"], row["item_name"], row["item_rarity"]),
+            )
+        conn.execute("DELETE FROM marketplace WHERE id=?", (item_id,))
+    if row["top_bidder"] is None:
+        return f"✅ تم إغلاق المزاد على '{row['item_name']}' بدون مزايدات."
+    return f"✅ تم بيع '{row['item_name']}' في المزاد بمبلغ {row['top_bid']} نقطة."
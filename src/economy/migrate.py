@@ -0,0 +1,116 @@
+"""
+One-shot economy migration — merge the other backend's accounts into the
+configured economy store.
+
+Before the store existed the bot kept two unrelated sets of balances: the
+auto-response bank in Redis ``user:{id}`` hashes and the economy commands
+in the SQLite ``users`` table. This tool folds the non-configured backend
+into the configured one (ECONOMY_BACKEND):
+
+  * balances are added together. Once an account is merged, a permanent
+    ``migrated:{user_id}`` marker goes to the target's meta table and later
+    runs skip that account, so re-running never double-credits. The credit
+    also uses the operation ID ``migrate:{user_id}``, which covers a crash
+    between the credit and the marker
+  * is_cheater / is_banned are OR-ed, the latest daily claim wins
+  * the Redis category is kept (SQLite accounts had none)
+
+Usage:
+    python -m src.economy.migrate [--dry-run] [--force]
+
+A marker is written to the target's meta table when the run finishes;
+--force runs again regardless, merging only accounts not merged before
+(e.g. ones created in the source since).
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+from src.config import Config
+from src.economy.store import Account, EconomyStore, create_store
+
+logger = logging.getLogger(__name__)
+
+MIGRATED_MARKER = "migrated_from"
+
+
+def _account_marker(user_id: int) -> str:
+    return f"migrated:{user_id}"
+
+
+def merge_account(target: EconomyStore, source: Account, dry_run: bool = False) -> int:
+    """Fold one source account into the target. Returns the points credited.
+
+    An account already merged by an earlier run is skipped (0 points).
+    """
+    if target.get_meta(_account_marker(source.user_id)):
+        return 0
+    current = target.get_account(source.user_id)
+    if dry_run:
+        return source.bank_balance
+
+    if current is None or not current.has_account:
+        target.open_account(source.user_id, source.category, balance=0)
+        current = target.get_account(source.user_id)
+
+    if source.bank_balance:
+        target.apply(
+            source.user_id, source.bank_balance, "migrate", f"migrate:{source.user_id}",
+            allow_negative=True,
+        )
+
+    flags = {}
+    if source.is_cheater and not current.is_cheater:
+        flags["is_cheater"] = True
+    if source.is_banned and not current.is_banned:
+        flags["is_banned"] = True
+    if source.category != "default" and current.category == "default":
+        flags["category"] = source.category
+    if source.last_daily_ts > current.last_daily_ts:
+        flags["last_daily_ts"] = source.last_daily_ts
+        flags["last_daily"] = source.last_daily
+    if flags:
+        target.update_flags(source.user_id, **flags)
+    # The op id only lasts OP_TTL; this marker keeps later runs from crediting again
+    target.set_meta(_account_marker(source.user_id), "1")
+    return source.bank_balance
+
+
+def migrate(source: EconomyStore, target: EconomyStore, source_name: str,
+            dry_run: bool = False, force: bool = False) -> tuple[int, int]:
+    """Merge every source account into target. Returns (accounts, points)."""
+    if not force and target.get_meta(MIGRATED_MARKER):
+        logger.info("Already migrated from %s — use --force to run again", target.get_meta(MIGRATED_MARKER))
+        return 0, 0
+
+    accounts = points = 0
+    for account in source.iter_accounts():
+        points += merge_account(target, account, dry_run)
+        accounts += 1
+    if not dry_run:
+        target.set_meta(MIGRATED_MARKER, source_name)
+    return accounts, points
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--dry-run", action="store_true", help="count what would be merged, write nothing")
+    parser.add_argument("--force", action="store_true", help="run even if a previous migration finished (already merged accounts are still skipped)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    target_name = Config.ECONOMY_BACKEND
+    source_name = "sqlite" if target_name == "redis" else "redis"
+    accounts, points = migrate(
+        create_store(source_name), create_store(target_name), source_name,
+        dry_run=args.dry_run, force=args.force,
+    )
+    verb = "Would merge" if args.dry_run else "Merged"
+    logger.info("%s %d accounts (%d points) from %s into %s", verb, accounts, points, source_name, target_name)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,697 @@
+"""
+Economy storage — one interface for every balance read and write.
+
+EconomyStore is implemented twice:
+  * RedisEconomyStore  — ``user:{id}`` hashes + ``bank:ledger`` stream,
+    every mutation a single Lua script (the production default)
+  * SqliteEconomyStore — the embedded ``users`` table in the economy
+    SQLite file, every mutation a single ``BEGIN IMMEDIATE`` transaction
+
+Both give the same guarantees: atomic check-and-write, idempotent
+operation IDs, and an append-only ledger. get_store() returns the backend
+selected by ``ECONOMY_BACKEND``; src.economy.migrate merges the other
+backend's data into it.
+"""
+from __future__ import annotations
+
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from src.config import Config
+from src.services import change_journal
+from src.services.redis_service import RedisService
+from src.services.sqlite_service import SqliteService
+
+T = TypeVar("T")
+
+OP_TTL = 7 * 24 * 3600  # seconds a Redis operation ID is remembered
+
+# Operation results
+STATUS_OK = "ok"
+STATUS_DUP = "dup"                    # operation ID already applied
+STATUS_INSUFFICIENT = "insufficient"
+STATUS_CATEGORY = "category"          # accounts in different categories
+STATUS_COOLDOWN = "cooldown"
+
+
+@dataclass
+class Account:
+    user_id: int
+    bank_balance: int = 0
+    has_account: bool = False
+    is_cheater: bool = False
+    is_banned: bool = False
+    category: str = "default"
+    last_daily: str = ""      # human-readable, kept for display
+    last_daily_ts: int = 0    # epoch seconds, used for the cooldown
+
+    def to_dict(self) -> dict:
+        return {
+            "user_id": self.user_id,
+            "bank_balance": self.bank_balance,
+            "has_account": self.has_account,
+            "is_cheater": self.is_cheater,
+            "is_banned": self.is_banned,
+            "category": self.category,
+            "last_daily": self.last_daily,
+            "last_daily_ts": self.last_daily_ts,
+        }
+
+
+def _flag(value) -> bool:
+    return value in (True, 1, "1", "True", "true")
+
+
+class EconomyStore(ABC):
+    """Balance storage. Every method is one atomic round trip."""
+
+    @abstractmethod
+    def get_account(self, user_id: int) -> Account | None:
+        """Return the account, or None if the user never had one."""
+
+    @abstractmethod
+    def open_account(self, user_id: int, category: str = "default", balance: int = 100) -> bool:
+        """Create an account. Returns False if it already exists."""
+
+    @abstractmethod
+    def get_balance(self, user_id: int) -> int:
+        ...
+
+    @abstractmethod
+    def apply(
+        self, user_id: int, amount: int, reason: str, op_id: str, allow_negative: bool = False,
+    ) -> tuple[str, int]:
+        """Add (or, if negative, take) points. Returns (status, balance)."""
+
+    @abstractmethod
+    def transfer(
+        self, from_user: int, to_user: int, amount: int, category: str, op_id: str,
+    ) -> tuple[str, int]:
+        """Move points between same-category accounts. Returns (status, sender balance)."""
+
+    @abstractmethod
+    def claim_daily(
+        self, user_id: int, gift: int, now: int, cooldown: int, label: str, op_id: str,
+    ) -> tuple[str, int]:
+        """Credit the daily gift unless claimed within cooldown.
+
+        Returns (status, gift) or (STATUS_COOLDOWN, seconds_left).
+        """
+
+    @abstractmethod
+    def update_flags(self, user_id: int, **fields) -> None:
+        """Set is_cheater / is_banned / category / last_daily_ts fields."""
+
+    @abstractmethod
+    def seize(self, user_id: int, reason: str = "seize") -> int:
+        """Zero the balance and mark the user a cheater. Returns the amount seized."""
+
+    @abstractmethod
+    def iter_accounts(self) -> Iterator[Account]:
+        ...
+
+    @abstractmethod
+    def get_ledger(self, count: int = 50) -> list[dict]:
+        """Newest-first ledger entries."""
+
+    @abstractmethod
+    def richest(self, count: int = 10, members: Iterable[int] | None = None) -> list[tuple[int, int]]:
+        """Top (user_id, balance) pairs, optionally only among ``members``."""
+
+    @abstractmethod
+    def rank(self, user_id: int, members: Iterable[int] | None = None) -> int | None:
+        """1-based wealth rank, or None if the user isn't ranked."""
+
+    @abstractmethod
+    def rebuild_leaderboard(self) -> int:
+        """Rebuild the ranking from the accounts. Returns how many are ranked."""
+
+    @abstractmethod
+    def get_meta(self, key: str) -> str | None:
+        ...
+
+    @abstractmethod
+    def set_meta(self, key: str, value: str) -> None:
+        ...
+
+    async def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Await a blocking economy function from a handler.
+
+        Redis round trips are short enough to run inline; disk-backed stores
+        override this to move the call off the event loop.
+        """
+        return func(*args, **kwargs)
+
+
+# ══════════════════════════════════════════════════
+# Redis
+# ══════════════════════════════════════════════════
+
+# Every script returns {status, value}. "dup" means the operation ID was
+# already applied; value then holds the stored result of the first run.
+# Each balance write also updates the wealth leaderboard (the last key) in
+# the same script, so the ranking never disagrees with the balances.
+
+# Ranks account holders who aren't flagged as cheaters; drops everyone else
+_RANK_LUA = """
+local function rank(user_key, board, uid)
+    if redis.call('HGET', user_key, 'has_account') == '1'
+       and redis.call('HGET', user_key, 'is_cheater') ~= '1' then
+        redis.call('ZADD', board, redis.call('HGET', user_key, 'bank_balance') or 0, uid)
+    else
+        redis.call('ZREM', board, uid)
+    end
+end
+"""
+
+_APPLY_LUA = _RANK_LUA + """
+local done = redis.call('GET', KEYS[3])
+if done then return {'dup', done} end
+local amount = tonumber(ARGV[1])
+if amount < 0 and ARGV[5] ~= '1' then
+    local balance = tonumber(redis.call('HGET', KEYS[1], 'bank_balance') or '0')
+    if balance + amount < 0 then return {'insufficient', tostring(balance)} end
+end
+local balance = redis.call('HINCRBY', KEYS[1], 'bank_balance', amount)
+redis.call('XADD', KEYS[2], '*', 'op', ARGV[3], 'op_id', ARGV[2],
+           'to', ARGV[4], 'amount', ARGV[1])
+redis.call('SET', KEYS[3], balance, 'EX', ARGV[6])
+rank(KEYS[1], KEYS[4], ARGV[4])
+return {'ok', tostring(balance)}
+"""
+
+_TRANSFER_LUA = _RANK_LUA + """
+local done = redis.call('GET', KEYS[4])
+if done then return {'dup', done} end
+local amount = tonumber(ARGV[1])
+if redis.call('HGET', KEYS[1], 'category') ~= ARGV[2]
+   or redis.call('HGET', KEYS[2], 'category') ~= ARGV[2] then
+    return {'category', '0'}
+end
+local balance = tonumber(redis.call('HGET', KEYS[1], 'bank_balance') or '0')
+if balance < amount then return {'insufficient', tostring(balance)} end
+local left = redis.call('HINCRBY', KEYS[1], 'bank_balance', -amount)
+redis.call('HINCRBY', KEYS[2], 'bank_balance', amount)
+redis.call('XADD', KEYS[3], '*', 'op', 'transfer', 'op_id', ARGV[3],
+           'from', ARGV[4], 'to', ARGV[5], 'amount', ARGV[1], 'category', ARGV[2])
+redis.call('SET', KEYS[4], left, 'EX', ARGV[6])
+rank(KEYS[1], KEYS[5], ARGV[4])
+rank(KEYS[2], KEYS[5], ARGV[5])
+return {'ok', tostring(left)}
+"""
+
+_DAILY_LUA = _RANK_LUA + """
+local done = redis.call('GET', KEYS[3])
+if done then return {'dup', done} end
+local now = tonumber(ARGV[2])
+local last = tonumber(redis.call('HGET', KEYS[1], 'last_daily_ts') or '0')
+local wait = last + tonumber(ARGV[3]) - now
+if wait > 0 then return {'cooldown', tostring(wait)} end
+redis.call('HINCRBY', KEYS[1], 'bank_balance', ARGV[1])
+redis.call('HSET', KEYS[1], 'last_daily_ts', ARGV[2], 'last_daily', ARGV[4])
+redis.call('XADD', KEYS[2], '*', 'op', 'daily', 'op_id', ARGV[5],
+           'to', ARGV[6], 'amount', ARGV[1])
+redis.call('SET', KEYS[3], ARGV[1], 'EX', ARGV[7])
+rank(KEYS[1], KEYS[4], ARGV[6])
+return {'ok', ARGV[1]}
+"""
+
+_SEIZE_LUA = """
+local balance = tonumber(redis.call('HGET', KEYS[1], 'bank_balance') or '0')
+redis.call('HSET', KEYS[1], 'bank_balance', 0, 'is_cheater', '1')
+redis.call('XADD', KEYS[2], '*', 'op', ARGV[2], 'op_id', ARGV[3],
+           'to', ARGV[1], 'amount', tostring(-balance))
+redis.call('ZREM', KEYS[3], ARGV[1])
+return balance
+"""
+
+# Re-evaluates one user's leaderboard entry after an account or flag change
+_SYNC_RANK_LUA = _RANK_LUA + """
+rank(KEYS[1], KEYS[2], ARGV[1])
+return 1
+"""
+
+
+class RedisEconomyStore(EconomyStore):
+    LEDGER_KEY = "bank:ledger"
+    META_KEY = "bank:meta"
+    LEADERBOARD_KEY = "bank:rich"
+
+    def __init__(self) -> None:
+        self.redis = RedisService()
+        client = self.redis.client
+        self._apply = client.register_script(_APPLY_LUA)
+        self._transfer = client.register_script(_TRANSFER_LUA)
+        self._daily = client.register_script(_DAILY_LUA)
+        self._seize = client.register_script(_SEIZE_LUA)
+        self._sync_rank = client.register_script(_SYNC_RANK_LUA)
+
+    # ── Key builders ──
+
+    def _user_key(self, user_id: int) -> str:
+        return f"user:{user_id}"
+
+    def _op_key(self, op_id: str) -> str:
+        return f"bank:op:{op_id}"
+
+    # ── Accounts ──
+
+    def get_account(self, user_id: int) -> Account | None:
+        data = self.redis.hgetall(self._user_key(user_id))
+        if not data:
+            return None
+        return Account(
+            user_id=user_id,
+            bank_balance=int(data.get("bank_balance") or 0),
+            has_account="has_account" in data,
+            is_cheater=_flag(data.get("is_cheater")),
+            is_banned=_flag(data.get("is_banned")),
+            category=data.get("category") or "default",
+            last_daily=data.get("last_daily") or "",
+            last_daily_ts=int(data.get("last_daily_ts") or 0),
+        )
+
+    def open_account(self, user_id: int, category: str = "default", balance: int = 100) -> bool:
+        key = self._user_key(user_id)
+        # HSETNX on the marker field makes concurrent opens create one account
+        if not self.redis.client.hsetnx(key, "has_account", "1"):
+            return False
+        pipe = self.redis.client.pipeline(transaction=False)
+        pipe.hset(key, mapping={
+            "bank_balance": balance,
+            "is_cheater": "0",
+            "is_banned": "0",
+            "category": category,
+        })
+        self._sync_rank(keys=[key, self.LEADERBOARD_KEY], args=[user_id], client=pipe)
+        change_journal.mark(pipe, (key, self.LEADERBOARD_KEY))
+        pipe.execute()
+        return True
+
+    def get_balance(self, user_id: int) -> int:
+        return int(self.redis.hget(self._user_key(user_id), "bank_balance") or 0)
+
+    # ── Mutations ──
+
+    def _run_script(self, script, keys: list[str], args: list) -> Any:
+        """Run a Lua script and journal the keys it may write, in one round trip."""
+        pipe = self.redis.client.pipeline(transaction=False)
+        script(keys=keys, args=args, client=pipe)
+        change_journal.mark(pipe, keys)
+        return pipe.execute()[0]
+
+    def apply(self, user_id, amount, reason, op_id, allow_negative=False):
+        status, value = self._run_script(
+            self._apply,
+            keys=[self._user_key(user_id), self.LEDGER_KEY, self._op_key(op_id), self.LEADERBOARD_KEY],
+            args=[int(amount), op_id, reason, user_id, "1" if allow_negative else "0", OP_TTL],
+        )
+        return status, int(value)
+
+    def transfer(self, from_user, to_user, amount, category, op_id):
+        status, value = self._run_script(
+            self._transfer,
+            keys=[
+                self._user_key(from_user), self._user_key(to_user),
+                self.LEDGER_KEY, self._op_key(op_id), self.LEADERBOARD_KEY,
+            ],
+            args=[int(amount), category, op_id, from_user, to_user, OP_TTL],
+        )
+        return status, int(value)
+
+    def claim_daily(self, user_id, gift, now, cooldown, label, op_id):
+        status, value = self._run_script(
+            self._daily,
+            keys=[self._user_key(user_id), self.LEDGER_KEY, self._op_key(op_id), self.LEADERBOARD_KEY],
+            args=[gift, now, cooldown, label, op_id, user_id, OP_TTL],
+        )
+        return status, int(value)
+
+    def update_flags(self, user_id: int, **fields) -> None:
+        mapping = {k: ("1" if v else "0") if isinstance(v, bool) else v for k, v in fields.items()}
+        if not mapping:
+            return
+        key = self._user_key(user_id)
+        pipe = self.redis.client.pipeline(transaction=False)
+        pipe.hset(key, mapping=mapping)
+        if "is_cheater" in mapping:
+            self._sync_rank(keys=[key, self.LEADERBOARD_KEY], args=[user_id], client=pipe)
+        change_journal.mark(pipe, (key, self.LEADERBOARD_KEY))
+        pipe.execute()
+
+    def seize(self, user_id: int, reason: str = "seize") -> int:
+        op_id = f"{reason}:{user_id}:{time.time_ns()}"
+        return int(self._run_script(
+            self._seize,
+            keys=[self._user_key(user_id), self.LEDGER_KEY, self.LEADERBOARD_KEY], args=[user_id, reason, op_id],
+        ))
+
+    # ── Bulk / admin ──
+
+    def iter_accounts(self) -> Iterator[Account]:
+        for key in self.redis.client.scan_iter(match="user:*", count=500):
+            user_part = key.split(":", 1)[1]
+            if not user_part.lstrip("-").isdigit():
+                continue  # user:{id}:transactions and similar
+            account = self.get_account(int(user_part))
+            if account and account.has_account:
+                yield account
+
+    def get_ledger(self, count: int = 50) -> list[dict]:
+        entries = self.redis.client.xrevrange(self.LEDGER_KEY, count=count)
+        return [dict(fields, id=entry_id) for entry_id, fields in entries]
+
+    # ── Leaderboard ──
+
+    def _member_scores(self, members: Iterable[int]) -> list[tuple[int, int]]:
+        """(user_id, balance) for the ranked members, richest first (one ZMSCORE)."""
+        members = list(members)
+        if not members:
+            return []
+        scores = self.redis.client.zmscore(self.LEADERBOARD_KEY, members)
+        ranked = [(int(uid), int(score)) for uid, score in zip(members, scores) if score is not None]
+        ranked.sort(key=lambda pair: (-pair[1], pair[0]))
+        return ranked
+
+    def richest(self, count=10, members=None):
+        if members is not None:
+            return self._member_scores(members)[:count]
+        entries = self.redis.client.zrevrange(self.LEADERBOARD_KEY, 0, count - 1, withscores=True)
+        return [(int(uid), int(score)) for uid, score in entries]
+
+    def rank(self, user_id, members=None):
+        if members is not None:
+            for position, (uid, _) in enumerate(self._member_scores(members), start=1):
+                if uid == user_id:
+                    return position
+            return None
+        position = self.redis.client.zrevrank(self.LEADERBOARD_KEY, user_id)
+        return None if position is None else position + 1
+
+    def rebuild_leaderboard(self) -> int:
+        # Build aside, then swap in with RENAME so readers never see a partial board
+        temp_key = f"{self.LEADERBOARD_KEY}:rebuild"
+        client = self.redis.client
+        client.delete(temp_key)
+        ranked = 0
+        pipe = client.pipeline(transaction=False)
+        for account in self.iter_accounts():
+            if account.is_cheater:
+                continue
+            pipe.zadd(temp_key, {account.user_id: account.bank_balance})
+            ranked += 1
+            if ranked % 500 == 0:
+                pipe.execute()
+        pipe.execute()
+        if ranked:
+            client.rename(temp_key, self.LEADERBOARD_KEY)
+        else:
+            client.delete(self.LEADERBOARD_KEY)
+        self.redis.mark_changed(self.LEADERBOARD_KEY)
+        return ranked
+
+    def get_meta(self, key: str) -> str | None:
+        return self.redis.hget(self.META_KEY, key)
+
+    def set_meta(self, key: str, value: str) -> None:
+        self.redis.hset(self.META_KEY, key, value)
+
+
+# ══════════════════════════════════════════════════
+# SQLite (embedded)
+# ══════════════════════════════════════════════════
+
+_SQLITE_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY,
+        bank_balance INTEGER DEFAULT 100,
+        is_cheater BOOLEAN DEFAULT 0,
+        is_banned BOOLEAN DEFAULT 0,
+        has_account BOOLEAN DEFAULT 0,
+        last_daily TEXT
+    )''',
+    '''CREATE TABLE IF NOT EXISTS economy_ledger (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts INTEGER NOT NULL,
+        op TEXT NOT NULL,
+        op_id TEXT NOT NULL,
+        from_user INTEGER,
+        to_user INTEGER,
+        amount INTEGER NOT NULL,
+        category TEXT
+    )''',
+    '''CREATE TABLE IF NOT EXISTS economy_ops (
+        op_id TEXT PRIMARY KEY,
+        result INTEGER NOT NULL
+    )''',
+    '''CREATE TABLE IF NOT EXISTS economy_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )''',
+    # The SQLite leaderboard is this index: maintained by every balance write
+    "CREATE INDEX IF NOT EXISTS idx_users_balance ON users (bank_balance DESC, user_id)",
+)
+# Columns added after the original users table shipped
+_SQLITE_USER_COLUMNS = {
+    "category": "TEXT DEFAULT 'default'",
+    "last_daily_ts": "INTEGER DEFAULT 0",
+}
+_SQLITE_FLAG_COLUMNS = ("is_cheater", "is_banned", "category", "last_daily_ts", "last_daily")
+
+
+class SqliteEconomyStore(EconomyStore):
+    def __init__(self, db_path: str | None = None) -> None:
+        self.db = SqliteService(db_path or Config.ECONOMY_DB_PATH)
+        with self.db.transaction() as conn:
+            for statement in _SQLITE_SCHEMA:
+                conn.execute(statement)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+            for column, decl in _SQLITE_USER_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE users ADD COLUMN {column} {decl}")
+
+    async def call(self, func, *args, **kwargs):
+        return await self.db.run(func, *args, **kwargs)
+
+    def _run(self, func):
+        """Run func(conn) inside one write transaction."""
+        with self.db.transaction() as conn:
+            return func(conn)
+
+    @staticmethod
+    def _done(conn: sqlite3.Connection, op_id: str) -> int | None:
+        row = conn.execute("SELECT result FROM economy_ops WHERE op_id=?", (op_id,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _record(conn, op, op_id, from_user, to_user, amount, category=None, result=0) -> None:
+        conn.execute(
+            "INSERT INTO economy_ledger (ts, op, op_id, from_user, to_user, amount, category) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (int(time.time()), op, op_id, from_user, to_user, amount, category),
+        )
+        conn.execute("INSERT INTO economy_ops (op_id, result) VALUES (?, ?)", (op_id, result))
+
+    @staticmethod
+    def _row_to_account(row: sqlite3.Row) -> Account:
+        return Account(
+            user_id=row["user_id"],
+            bank_balance=row["bank_balance"] or 0,
+            has_account=bool(row["has_account"]),
+            is_cheater=bool(row["is_cheater"]),
+            is_banned=bool(row["is_banned"]),
+            category=row["category"] or "default",
+            last_daily=row["last_daily"] or "",
+            last_daily_ts=row["last_daily_ts"] or 0,
+        )
+
+    # ── Accounts ──
+
+    def get_account(self, user_id: int) -> Account | None:
+        row = self.db.fetchone("SELECT * FROM users WHERE user_id=?", (user_id,))
+        return self._row_to_account(row) if row else None
+
+    def open_account(self, user_id: int, category: str = "default", balance: int = 100) -> bool:
+        def _open(conn):
+            row = conn.execute("SELECT has_account FROM users WHERE user_id=?", (user_id,)).fetchone()
+            if row and row[0]:
+                return False
+            conn.execute(
+                "INSERT INTO users (user_id, bank_balance, has_account, category) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET has_account=1, bank_balance=?, category=?",
+                (user_id, balance, category, balance, category),
+            )
+            return True
+        return self._run(_open)
+
+    def get_balance(self, user_id: int) -> int:
+        account = self.get_account(user_id)
+        return account.bank_balance if account else 0
+
+    # ── Mutations ──
+
+    def apply(self, user_id, amount, reason, op_id, allow_negative=False):
+        amount = int(amount)
+
+        def _apply(conn):
+            done = self._done(conn, op_id)
+            if done is not None:
+                return STATUS_DUP, done
+            row = conn.execute("SELECT bank_balance FROM users WHERE user_id=?", (user_id,)).fetchone()
+            balance = row[0] if row else 0
+            if amount < 0 and not allow_negative and balance + amount < 0:
+                return STATUS_INSUFFICIENT, balance
+            conn.execute(
+                "INSERT INTO users (user_id, bank_balance) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET bank_balance = bank_balance + ?",
+                (user_id, amount, amount),
+            )
+            self._record(conn, reason, op_id, None, user_id, amount, result=balance + amount)
+            return STATUS_OK, balance + amount
+        return self._run(_apply)
+
+    def transfer(self, from_user, to_user, amount, category, op_id):
+        amount = int(amount)
+
+        def _transfer(conn):
+            done = self._done(conn, op_id)
+            if done is not None:
+                return STATUS_DUP, done
+            rows = {
+                row["user_id"]: row for row in conn.execute(
+                    "SELECT user_id, bank_balance, category FROM users WHERE user_id IN (?, ?)",
+                    (from_user, to_user),
+                )
+            }
+            sender, receiver = rows.get(from_user), rows.get(to_user)
+            if not sender or not receiver or sender["category"] != category or receiver["category"] != category:
+                return STATUS_CATEGORY, 0
+            if sender["bank_balance"] < amount:
+                return STATUS_INSUFFICIENT, sender["bank_balance"]
+            left = sender["bank_balance"] - amount
+            conn.execute("UPDATE users SET bank_balance = bank_balance - ? WHERE user_id=?", (amount, from_user))
+            conn.execute("UPDATE users SET bank_balance = bank_balance + ? WHERE user_id=?", (amount, to_user))
+            self._record(conn, "transfer", op_id, from_user, to_user, amount, category, result=left)
+            return STATUS_OK, left
+        return self._run(_transfer)
+
+    def claim_daily(self, user_id, gift, now, cooldown, label, op_id):
+        def _daily(conn):
+            done = self._done(conn, op_id)
+            if done is not None:
+                return STATUS_DUP, done
+            row = conn.execute("SELECT last_daily_ts FROM users WHERE user_id=?", (user_id,)).fetchone()
+            wait = ((row[0] or 0) if row else 0) + cooldown - now
+            if wait > 0:
+                return STATUS_COOLDOWN, wait
+            conn.execute(
+                "INSERT INTO users (user_id, bank_balance, last_daily, last_daily_ts) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET bank_balance = bank_balance + ?, last_daily=?, last_daily_ts=?",
+                (user_id, gift, label, now, gift, label, now),
+            )
+            self._record(conn, "daily", op_id, None, user_id, gift, result=gift)
+            return STATUS_OK, gift
+        return self._run(_daily)
+
+    def update_flags(self, user_id: int, **fields) -> None:
+        columns = [c for c in fields if c in _SQLITE_FLAG_COLUMNS]
+        if not columns:
+            return
+        values = [int(v) if isinstance(v, bool) else v for v in (fields[c] for c in columns)]
+        assignments = ", ".join(f"{c}=?" for c in columns)
+        self._run(lambda conn: conn.execute(
+            f"UPDATE users SET {assignments} WHERE user_id=?", (*values, user_id),
+        ))
+
+    def seize(self, user_id: int, reason: str = "seize") -> int:
+        def _seize(conn):
+            row = conn.execute("SELECT bank_balance FROM users WHERE user_id=?", (user_id,)).fetchone()
+            balance = row[0] if row else 0
+            conn.execute("UPDATE users SET bank_balance=0, is_cheater=1 WHERE user_id=?", (user_id,))
+            op_id = f"{reason}:{user_id}:{time.time_ns()}"
+            self._record(conn, reason, op_id, None, user_id, -balance)
+            return balance
+        return self._run(_seize)
+
+    # ── Bulk / admin ──
+
+    def iter_accounts(self) -> Iterator[Account]:
+        for row in self.db.fetchall("SELECT * FROM users WHERE has_account=1"):
+            yield self._row_to_account(row)
+
+    def get_ledger(self, count: int = 50) -> list[dict]:
+        rows = self.db.fetchall("SELECT * FROM economy_ledger ORDER BY id DESC LIMIT ?", (count,))
+        return [dict(row) for row in rows]
+
+    # ── Leaderboard ──
+
+    _RANKED = "has_account=1 AND is_cheater=0"
+
+    def richest(self, count=10, members=None):
+        sql = f"SELECT user_id, bank_balance FROM users WHERE {self._RANKED}"
+        params: list = []
+        if members is not None:
+            members = list(members)
+            if not members:
+                return []
+            sql += f" AND user_id IN ({','.join('?' * len(members))})"
+            params.extend(members)
+        sql += " ORDER BY bank_balance DESC, user_id LIMIT ?"
+        return [tuple(row) for row in self.db.fetchall(sql, (*params, count))]
+
+    def rank(self, user_id, members=None):
+        row = self.db.fetchone(
+            f"SELECT bank_balance FROM users WHERE user_id=? AND {self._RANKED}", (user_id,),
+        )
+        if row is None:
+            return None
+        balance = row[0]
+        sql = (f"SELECT COUNT(*) FROM users WHERE {self._RANKED} "
+               "AND (bank_balance > ? OR (bank_balance = ? AND user_id < ?))")
+        params: list = [balance, balance, user_id]
+        if members is not None:
+            members = list(members)
+            if user_id not in members:
+                return None
+            sql += f" AND user_id IN ({','.join('?' * len(members))})"
+            params.extend(members)
+        return self.db.fetchone(sql, params)[0] + 1
+
+    def rebuild_leaderboard(self) -> int:
+        self.db.execute("REINDEX idx_users_balance")
+        return self.db.fetchone(f"SELECT COUNT(*) FROM users WHERE {self._RANKED}")[0]
+
+    def get_meta(self, key: str) -> str | None:
+        row = self.db.fetchone("SELECT value FROM economy_meta WHERE key=?", (key,))
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._run(lambda conn: conn.execute(
+            "INSERT INTO economy_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            (key, value),
+        ))
+
+
+# ── Backend selection ──
+
+_store: EconomyStore | None = None
+
+
+def create_store(backend: str) -> EconomyStore:
+    if backend == "sqlite":
+        return SqliteEconomyStore()
+    if backend == "redis":
+        return RedisEconomyStore()
+    raise ValueError(f"Unknown economy backend: {backend!r} (expected 'redis' or 'sqlite')")
+
+
+def get_store() -> EconomyStore:
+    """Return the configured economy store (created on first use)."""
+    global _store
+    if _store is None:
+        _store = create_store(Config.ECONOMY_BACKEND)
+    return _store
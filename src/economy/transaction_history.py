@@ -1,32 +1,108 @@
-import redis
-from datetime import datetime
-
-# Initialize Redis connection
-redis_client = redis.StrictRedis(
-    host=os.getenv("REDIS_HOST", "127.0.0.1"),
-    port=int(os.getenv("REDIS_PORT", 6379)),
-    db=int(os.getenv("REDIS_DB", 0)),
-    password=os.getenv("REDIS_PASSWORD", None),
-    decode_responses=True
-)
+"""
+Transaction history — per-user, capped, one round trip per page.
+
+Each user's history is a Redis Stream ``bank:history:{id}`` trimmed to about
+HISTORY_MAX entries on every append, so "last 20 transactions" is a single
+XREVRANGE … COUNT 20 however old the account is. Entry IDs are the stream
+IDs, which also serve as paging cursors.
+
+Entries trimmed off the stream are not lost: every append also bumps that
+day's counters (count, points in, points out) in the month's hash
+``bank:history:{id}:days:{YYYY-MM}``. A month's hash expires SUMMARY_DAYS
+days after the month ends, so summaries cover at least SUMMARY_DAYS days
+and a user never holds more than four month hashes, however they trade.
+The bank logs every applied balance change here (src/economy/bank_system.py).
+"""
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta
+
+from src.services.redis_service import RedisService
+
+HISTORY_MAX = 200      # stream entries kept per user (approximate trim)
+SUMMARY_DAYS = 90      # days of daily summaries kept
+
+# Shares the bot's connection pool (and its Vercel KV / REDIS_URL settings)
+redis_client = RedisService().client
+
+
+def _stream_key(user_id) -> str:
+    return f"bank:history:{user_id}"
+
+
+def _days_key(user_id, day: date) -> str:
+    return f"bank:history:{user_id}:days:{day:%Y-%m}"
+
+
+def _days_expiry(day: date) -> datetime:
+    """When the month holding day has left the retention window entirely."""
+    next_month = (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return datetime.combine(next_month + timedelta(days=SUMMARY_DAYS), datetime.min.time())
+
+
+def _append(pipe, user_id, transaction_type, amount, category, now: datetime) -> None:
+    pipe.xadd(
+        _stream_key(user_id),
+        {"type": transaction_type, "amount": amount, "category": category},
+        maxlen=HISTORY_MAX, approximate=True,
+    )
+    day = now.strftime("%Y-%m-%d")
+    days_key = _days_key(user_id, now.date())
+    pipe.hincrby(days_key, f"{day}:n", 1)
+    if amount >= 0:
+        pipe.hincrby(days_key, f"{day}:in", amount)
+    else:
+        pipe.hincrby(days_key, f"{day}:out", -amount)
+    pipe.expireat(days_key, _days_expiry(now.date()))
+
 
 def log_transaction(user_id, transaction_type, amount, category="default"):
     """Logs a transaction for a user."""
-    transaction_id = redis_client.incr("transaction_id")
-    transaction_data = {
-        "user_id": user_id,
-        "type": transaction_type,
-        "amount": amount,
-        "category": category,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    redis_client.hset(f"transaction:{transaction_id}", mapping=transaction_data)
-    redis_client.rpush(f"user:{user_id}:transactions", transaction_id)
-
-def get_transaction_history(user_id):
-    """Retrieves the transaction history for a user."""
-    transaction_ids = redis_client.lrange(f"user:{user_id}:transactions", 0, -1)
+    pipe = redis_client.pipeline()
+    _append(pipe, user_id, transaction_type, int(amount), category, datetime.now())
+    pipe.execute()
+
+
+def log_transfer(from_user, to_user, amount, category="default"):
+    """Logs both sides of a transfer in one round trip."""
+    now = datetime.now()
+    pipe = redis_client.pipeline()
+    _append(pipe, from_user, "transfer_out", -int(amount), category, now)
+    _append(pipe, to_user, "transfer_in", int(amount), category, now)
+    pipe.execute()
+
+
+def get_transaction_history(user_id, count=20, before=None):
+    """Newest-first transactions, ``count`` per page.
+
+    Pass the last entry's ``id`` as ``before`` to get the next (older) page.
+    """
+    end = f"({before}" if before else "+"
+    entries = redis_client.xrevrange(_stream_key(user_id), end, "-", count=count)
     history = []
-    for transaction_id in transaction_ids:
-        history.append(redis_client.hgetall(f"transaction:{transaction_id}"))
-    return history
\ No newline at end of file
+    for entry_id, fields in entries:
+        ms = int(entry_id.split("-", 1)[0])
+        history.append({
+            "id": entry_id,
+            "type": fields.get("type"),
+            "amount": int(fields.get("amount", 0)),
+            "category": fields.get("category", "default"),
+            "timestamp": datetime.fromtimestamp(ms / 1000).strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    return history
+
+
+def get_daily_summaries(user_id, days=7):
+    """Per-day totals for the last ``days`` days, newest first (days with no activity skipped)."""
+    today = date.fromtimestamp(time.time())
+    dates = [today - timedelta(days=i) for i in range(days)]
+    pipe = redis_client.pipeline(transaction=False)
+    for day in dates:
+        pipe.hmget(_days_key(user_id, day), [f"{day:%Y-%m-%d}:{part}" for part in ("n", "in", "out")])
+    summaries = []
+    for day, values in zip(dates, pipe.execute()):
+        count, points_in, points_out = (int(v or 0) for v in values)
+        if count:
+            summaries.append({"date": f"{day:%Y-%m-%d}", "count": count, "in": points_in, "out": points_out})
+    return summaries
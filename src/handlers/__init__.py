@@ -1,15 +1,19 @@
 """
-Handler registration — imports all handler modules and provides
+Handler registration — imports the handler modules and provides
 a single register_all_handlers() function for bot.py to call.
+
+Modules with heavy imports (maintenance, youtube, quran, time_converter,
+photo_editor) are registered through stubs in lazy.py and only imported
+when one of their handlers first matches.
 """
 from telegram.ext import Application
 
 from . import (
     start, admin, moderation, broadcast, games, tag, locks,
-    permissions, youtube, fun, dm_relay, custom_commands,
+    permissions, fun, dm_relay, custom_commands,
     user_info, auto_response, group_settings, misc_commands,
-    maintenance, notifications, quran, magic_8ball, time_converter,
-    photo_editor, force_subscribe, admin_dashboard, user_contact,
+    notifications, magic_8ball, lazy,
+    force_subscribe, admin_dashboard, user_contact,
     advanced_forwarding, user_lookup, rich_broadcast,
 )
 
@@ -18,7 +22,7 @@ def register_all_handlers(app: Application) -> None:
     """Register every handler module with the Application."""
     # Notifications first (low group number for priority)
     notifications.register(app)
-    maintenance.register(app)
+    lazy.register_maintenance(app)
     
     # Advanced forwarding (early for reply tracking)
     advanced_forwarding.register(app)
@@ -33,7 +37,7 @@ def register_all_handlers(app: Application) -> None:
     tag.register(app)
     locks.register(app)
     permissions.register(app)
-    youtube.register(app)
+    lazy.register_youtube(app)
     fun.register(app)
     dm_relay.register(app)
     custom_commands.register(app)
@@ -43,10 +47,10 @@ def register_all_handlers(app: Application) -> None:
     misc_commands.register(app)
     
     # New feature handlers
-    quran.register(app)
+    lazy.register_quran(app)
     magic_8ball.register(app)
-    time_converter.register(app)
-    photo_editor.register(app)
+    lazy.register_time_converter(app)
+    lazy.register_photo_editor(app)
     admin_dashboard.register(app)
     user_contact.register(app)
 
@@ -56,8 +56,11 @@ developer commands, and custom commands.
 Based on the role hierarchy from bian.lua / AVIRA.lua.
 """
 import logging
+import time
+from functools import partial
 
-from telegram import Update
+from telegram import Bot, ChatMember, Message, Update
+from telegram.error import BadRequest, Forbidden, TelegramError
 from telegram.ext import Application, ContextTypes, MessageHandler, filters
 
 from src.config import Config
@@ -74,6 +77,8 @@ from src.constants.roles import (
 from src.services.user_service import UserService
 from src.services.group_service import GroupService
 from src.services.redis_service import RedisService
+from src.services.batch_job import FAILED, JobReport, JobRunning
+from src.services.sweeper import REMOVED, Sweep
 from src.utils.decorators import group_only
 from src.utils.text_utils import extract_user_id, format_user_list
 from src.utils.api_helpers import promote_member, demote_member, is_bot_admin
@@ -83,6 +88,8 @@ user_svc = UserService()
 group_svc = GroupService()
 redis_svc = RedisService()
 
+SWEEP_PROGRESS_INTERVAL = 5.0  # seconds between sweep progress edits
+
 # Mapping Arabic role commands to role levels
 ROLE_COMMANDS = {
     "مطور ثانوي": ROLE_SECONDARY_DEVELOPER,
@@ -639,6 +646,75 @@ async def handle_lift_restrictions(update: Update, context: ContextTypes.DEFAULT
         await update.message.reply_text(f"✯ فشل رفع القيود: {e}")
 
 
+# ── Sweeps (تنظيف المجموعات / تنظيف المشتركين) ──
+
+async def _group_alive(bot: Bot, gid: str) -> bool:
+    try:
+        await bot.get_chat(int(gid))
+    except (BadRequest, Forbidden):  # chat not found / bot kicked
+        return False
+    return True
+
+
+async def _member_alive(bot: Bot, chat_id: int, uid: str) -> bool:
+    try:
+        member = await bot.get_chat_member(chat_id, int(uid))
+    except BadRequest:  # user not found
+        return False
+    return member.status not in (ChatMember.LEFT, ChatMember.BANNED)
+
+
+def _member_ids(chat_id: int):
+    prefix = f"bot:group:{chat_id}:user:"
+    for key in redis_svc.client.scan_iter(match=f"{prefix}*", count=1000):
+        uid = key[len(prefix):]
+        if uid.isdigit():
+            yield uid
+
+
+def _remove_member(chat_id: int, pipe, uid: str) -> list[str]:
+    key = f"bot:group:{chat_id}:user:{uid}"
+    pipe.delete(key)
+    return [key]
+
+
+def _sweep_progress(msg: Message, title: str):
+    last = 0.0
+
+    async def report(r: JobReport) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if now - last < SWEEP_PROGRESS_INTERVAL:
+            return
+        last = now
+        try:
+            await msg.edit_text(
+                f"✯ جاري {title}{' (استكمال)' if r.resumed else ''}... ⏳\n"
+                f"✯ تم فحص {r.checked}/{r.total}\n✯ تم حذف {r[REMOVED]}"
+            )
+        except TelegramError:
+            pass
+
+    return report
+
+
+async def _run_sweep(msg: Message, sweep: Sweep, snapshot, title: str, unit: str) -> None:
+    """Run a sweep in the background and report the outcome on msg."""
+    try:
+        report = await sweep.run(snapshot, progress=_sweep_progress(msg, title))
+    except JobRunning:
+        await msg.edit_text(f"✯ {title} قيد التشغيل بالفعل ⏳")
+        return
+    except Exception as e:
+        logger.error(f"Sweep {sweep.name} stopped: {e}", exc_info=True)
+        await msg.edit_text(f"✯ توقف {title}، ارسل الامر مجدداً للاستكمال ❌")
+        return
+    text = f"✯ تم تنظيف {report[REMOVED]} {unit} ✅"
+    if report[FAILED]:
+        text += f"\n✯ تعذر فحص: {report[FAILED]}"
+    await msg.edit_text(text)
+
+
 @group_only
 async def handle_clean_groups(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """تنظيف المجموعات — clean inactive groups from bot DB."""
@@ -648,16 +724,17 @@ async def handle_clean_groups(update: Update, context: ContextTypes.DEFAULT_TYPE
         await update.message.reply_text(MSG_NO_PERMISSION)
         return
 
-    group_ids = group_svc.get_all_group_ids()
-    removed = 0
-    for gid in group_ids:
-        try:
-            await context.bot.get_chat(gid)
-        except Exception:
-            group_svc.remove_group(gid)
-            removed += 1
-
-    await update.message.reply_text(f"✯ تم تنظيف {removed} مجموعه غير نشطه ✅")
+    sweep = Sweep(
+        "groups",
+        check=partial(_group_alive, context.bot),
+        remove=lambda pipe, gid: group_svc.queue_removal(pipe, int(gid)),
+    )
+    msg = await update.message.reply_text("✯ جاري تنظيف المجموعات... ⏳")
+    # Runs in the background, checkpointed: resending the command resumes a cut-short sweep
+    context.application.create_task(
+        _run_sweep(msg, sweep, group_svc.get_all_group_ids, "تنظيف المجموعات", "مجموعه غير نشطه"),
+        update=update,
+    )
 
 
 @group_only
@@ -670,17 +747,16 @@ async def handle_clean_members(update: Update, context: ContextTypes.DEFAULT_TYP
         await update.message.reply_text(MSG_NO_PERMISSION)
         return
 
-    pattern = f"bot:group:{chat_id}:user:*"
-    removed = 0
-    for key in redis_svc.keys(pattern):
-        uid = int(key.split(":")[-1])
-        try:
-            await context.bot.get_chat_member(chat_id, uid)
-        except Exception:
-            redis_svc.delete(key)
-            removed += 1
-
-    await update.message.reply_text(f"✯ تم تنظيف {removed} عضو غير نشط ✅")
+    sweep = Sweep(
+        f"members:{chat_id}",
+        check=partial(_member_alive, context.bot, chat_id),
+        remove=partial(_remove_member, chat_id),
+    )
+    msg = await update.message.reply_text("✯ جاري تنظيف المشتركين... ⏳")
+    context.application.create_task(
+        _run_sweep(msg, sweep, partial(_member_ids, chat_id), "تنظيف المشتركين", "عضو غير نشط"),
+        update=update,
+    )
 
 
 @group_only
@@ -6,11 +6,12 @@ import re
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.constants import ChatType
-from telegram.ext import Application, ContextTypes, MessageHandler, filters
+from telegram.ext import Application, CallbackQueryHandler, ContextTypes, MessageHandler, filters
 
 from src.config import Config
 from src.constants.messages import (
     ADVICE_RESPONSES,
+    CHANNEL_PHOTO_URL,
     CHAT_RESPONSES,
     GREETING_RESPONSES,
     INSULT_RESPONSES,
@@ -18,10 +19,22 @@ from src.constants.messages import (
     WOULD_YOU_RATHER,
 )
 from src.economy.bank_system import claim_daily, get_balance, open_bank_account, transfer_points
-from src.economy.marketplace import add_item, buy_item, list_items
+from src.economy import leaderboard
+from src.economy.marketplace import (
+    add_item,
+    buy_item,
+    close_auction,
+    db as market_db,
+    list_items,
+    place_bid,
+)
+from src.economy.store import get_store
+from src.economy.transaction_history import get_daily_summaries, get_transaction_history
 from src.services.group_service import GroupService
+from src.services.media_cache import media_cache
 from src.services.redis_service import RedisService
 from src.utils.decorators import group_only
+from src.utils.keyboard import build_market_keyboard
 
 redis_svc = RedisService()
 
@@ -103,9 +116,8 @@ async def handle_developer_contact(update: Update, context: ContextTypes.DEFAULT
         "◍قم بـ التواصل مع المطورين عبر الازرار تاليه ."
     )
 
-    await context.bot.send_photo(
-        chat_id=chat_id,
-        photo="https://t.me/BO_MR/45",
+    await media_cache.send(
+        context.bot, "photo", chat_id, CHANNEL_PHOTO_URL,
         caption=caption,
         reply_markup=keyboard,
     )
@@ -121,9 +133,8 @@ async def handle_taki_contact(update: Update, context: ContextTypes.DEFAULT_TYPE
         [InlineKeyboardButton("احمد", url="https://t.me/BO1MA")],
     ])
 
-    await context.bot.send_photo(
-        chat_id=chat_id,
-        photo="https://t.me/BO_MR/45",
+    await media_cache.send(
+        context.bot, "photo", chat_id, CHANNEL_PHOTO_URL,
         caption="مطور السورس للتواصل اضغط علي الازرار",
         reply_markup=keyboard,
     )
@@ -155,13 +166,11 @@ async def handle_bot_info(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         '◍ لو عايز بوت مميز بدون توقف وامان  .\n'
         '◍قم بـ التواصل مع المطورين عبر الازرار تاليه .'
     )
-    await context.bot.send_photo(
-        chat_id=chat_id,
-        photo='https://t.me/BO_MR/45',
+    await media_cache.send(
+        context.bot, "photo", chat_id, CHANNEL_PHOTO_URL,
         caption=caption,
         reply_markup=keyboard,
         parse_mode='HTML',
-        disable_web_page_preview=True
     )
 
 
@@ -179,9 +188,8 @@ async def handle_source_info(update: Update, context: ContextTypes.DEFAULT_TYPE)
         "◍ للتواصل مع المطور او الحصول على السورس اضغط الازرار."
     )
 
-    await context.bot.send_photo(
-        chat_id=chat_id,
-        photo="https://t.me/BO_MR/45",
+    await media_cache.send(
+        context.bot, "photo", chat_id, CHANNEL_PHOTO_URL,
         caption=caption,
         reply_markup=keyboard,
     )
@@ -299,27 +307,87 @@ async def handle_insult_target(update: Update, context: ContextTypes.DEFAULT_TYP
         await update.message.reply_text("✯ رد على شخص لاشتمه 😂")
 
 
+def _track_bank_user(update: Update) -> None:
+    """Remember bank users per group so the group leaderboard can find them."""
+    leaderboard.track_member(update.effective_chat.id, update.effective_user.id)
+
+
 @group_only
 async def handle_open_bank(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user_id = update.effective_user.id
-    response = open_bank_account(user_id)
+    _track_bank_user(update)
+    response = await get_store().call(open_bank_account, user_id)
     await update.message.reply_text(response)
 
 @group_only
 async def handle_check_balance(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user_id = update.effective_user.id
-    balance = get_balance(user_id)
+    _track_bank_user(update)
+    balance = await get_store().call(get_balance, user_id)
     await update.message.reply_text(f"🏦 رصيدك الحالي هو: {balance} نقطة.")
 
 @group_only
 async def handle_claim_daily(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user_id = update.effective_user.id
-    response = claim_daily(user_id)
+    _track_bank_user(update)
+    op_id = f"daily:{update.effective_chat.id}:{update.message.message_id}"
+    response = await get_store().call(claim_daily, user_id, op_id=op_id)
     await update.message.reply_text(response)
 
+@group_only
+async def handle_richest(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """/richest — this group's richest bank users; /richest_global — everyone's."""
+    is_global = (update.message.text or "").split()[0].lower().endswith("_global")
+    _track_bank_user(update)
+    chat_id = None if is_global else update.effective_chat.id
+    top = await get_store().call(leaderboard.richest, 10, chat_id)
+    if not top:
+        await update.message.reply_text("❌ لا يوجد أي حساب في الترتيب بعد.")
+        return
+
+    names = leaderboard.display_names([uid for uid, _ in top])
+    title = "🏆 أغنى المستخدمين:" if is_global else "🏆 أغنى أعضاء المجموعة:"
+    lines = [title]
+    for position, (uid, balance) in enumerate(top, start=1):
+        lines.append(f"{position}. {names[uid]} — {balance} نقطة")
+    await update.message.reply_text("\n".join(lines))
+
+@group_only
+async def handle_my_rank(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user_id = update.effective_user.id
+    _track_bank_user(update)
+    group_rank = await get_store().call(leaderboard.get_rank, user_id, update.effective_chat.id)
+    global_rank = await get_store().call(leaderboard.get_rank, user_id)
+    if global_rank is None:
+        await update.message.reply_text("❌ أنت غير مدرج في الترتيب، افتح حسابًا بنكيًا أولًا.")
+        return
+    await update.message.reply_text(
+        f"📊 ترتيبك في المجموعة: {group_rank or '-'}\n🌍 ترتيبك العام: {global_rank}"
+    )
+
+@group_only
+async def handle_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user_id = update.effective_user.id
+    _track_bank_user(update)
+    history = get_transaction_history(user_id, count=20)
+    if not history:
+        await update.message.reply_text("❌ لا توجد عمليات في سجلك.")
+        return
+
+    lines = ["🧾 آخر عملياتك:"]
+    for entry in history:
+        lines.append(f"🔹 {entry['timestamp']} | {entry['type']} | {entry['amount']:+d}")
+    summaries = get_daily_summaries(user_id, days=7)
+    if summaries:
+        lines.append("\n📅 ملخص آخر 7 أيام:")
+        for day in summaries:
+            lines.append(f"🔸 {day['date']}: {day['count']} عملية | +{day['in']} / -{day['out']}")
+    await update.message.reply_text("\n".join(lines))
+
 @group_only
 async def handle_transfer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    args = context.args
+    # Registered as a MessageHandler, so context.args is not populated
+    args = (update.message.text or "").split()[1:]
     if len(args) < 2:
         await update.message.reply_text("❌ استخدم الأمر كالتالي: /transfer [المعرف] [المبلغ]")
         return
@@ -328,38 +396,71 @@ async def handle_transfer(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         target_id = int(args[0])
         amount = int(args[1])
         user_id = update.effective_user.id
-        response = transfer_points(user_id, target_id, amount)
+        _track_bank_user(update)
+        # Message ID makes a redelivered update a no-op instead of a second transfer
+        op_id = f"transfer:{update.effective_chat.id}:{update.message.message_id}"
+        response = await get_store().call(transfer_points, user_id, target_id, amount, op_id=op_id)
         await update.message.reply_text(response)
     except ValueError:
         await update.message.reply_text("❌ تأكد من إدخال معرف صحيح ومبلغ صحيح.")
 
 
+def _format_market_page(page) -> str:
+    lines = ["📦 العناصر المتوفرة في السوق:"]
+    for item_id, seller_id, item_name, item_rarity, price, is_auction, top_bidder, top_bid in page.items:
+        if is_auction:
+            lines.append(f"🔨 [{item_id}] {item_name} ({item_rarity}) - مزاد، أعلى مزايدة: {top_bid or price} نقطة")
+        else:
+            lines.append(f"🔹 [{item_id}] {item_name} ({item_rarity}) - {price} نقطة")
+    return "\n".join(lines)
+
+
+def _market_keyboard(page, rarity):
+    return build_market_keyboard(rarity, page.first_cursor, page.last_cursor, page.has_prev, page.has_next)
+
+
 @group_only
 async def handle_list_market(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    items = list_items()
-    if not items:
+    args = (update.message.text or "").split()[1:]
+    rarity = args[0] if args else None
+    page = await market_db.run(list_items, rarity=rarity)
+    if not page.items:
         await update.message.reply_text("❌ السوق فارغ حاليًا.")
         return
+    await update.message.reply_text(_format_market_page(page), reply_markup=_market_keyboard(page, rarity))
+
+
+async def handle_market_page(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Previous / next buttons under a market listing: mkt:{rarity}:{n|p}:{price}:{id}."""
+    query = update.callback_query
+    rarity, direction, price, item_id = query.data[len("mkt:"):].rsplit(":", 3)
+    cursor = (int(price), int(item_id))
+    rarity = rarity or None
+    if direction == "n":
+        page = await market_db.run(list_items, after=cursor, rarity=rarity)
+    else:
+        page = await market_db.run(list_items, before=cursor, rarity=rarity)
+    await query.answer()
+    if not page.items:
+        return
+    await query.edit_message_text(_format_market_page(page), reply_markup=_market_keyboard(page, rarity))
 
-    response = "📦 العناصر المتوفرة في السوق:\n"
-    for item in items:
-        item_id, seller_id, item_name, item_rarity, price = item
-        response += f"🔹 [{item_id}] {item_name} ({item_rarity}) - {price} نقطة\n"
-    await update.message.reply_text(response)
 
 @group_only
 async def handle_add_market(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    args = context.args
+    # Registered as a MessageHandler, so context.args is not populated
+    command, *args = (update.message.text or "").split()
+    is_auction = command.lower() == "/add_auction"
     if len(args) < 3:
-        await update.message.reply_text("❌ استخدم الأمر كالتالي: /add_market [اسم العنصر] [الندرة] [السعر]")
+        await update.message.reply_text(f"❌ استخدم الأمر كالتالي: {command} [اسم العنصر] [الندرة] [السعر]")
         return
 
-    item_name = args[0]
-    item_rarity = args[1]
+    item_name = " ".join(args[:-2])
+    item_rarity = args[-2]
     try:
-        price = int(args[2])
+        price = int(args[-1])
         user_id = update.effective_user.id
-        response = add_item(user_id, item_name, item_rarity, price)
+        response = await market_db.run(add_item, user_id, item_name, item_rarity, price, is_auction)
         await update.message.reply_text(response)
     except ValueError:
         await update.message.reply_text("❌ تأكد من إدخال سعر صحيح.")
@@ -367,7 +468,7 @@ async def handle_add_market(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 @group_only
 async def handle_buy_market(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    args = context.args
+    args = (update.message.text or "").split()[1:]
     if len(args) < 1:
         await update.message.reply_text("❌ استخدم الأمر كالتالي: /buy_market [رقم العنصر]")
         return
@@ -375,12 +476,40 @@ async def handle_buy_market(update: Update, context: ContextTypes.DEFAULT_TYPE)
     try:
         item_id = int(args[0])
         user_id = update.effective_user.id
-        response = buy_item(user_id, item_id)
+        response = await market_db.run(buy_item, item_id, user_id)
         await update.message.reply_text(response)
     except ValueError:
         await update.message.reply_text("❌ تأكد من إدخال رقم عنصر صحيح.")
 
 
+@group_only
+async def handle_bid_market(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    args = (update.message.text or "").split()[1:]
+    if len(args) < 2:
+        await update.message.reply_text("❌ استخدم الأمر كالتالي: /bid [رقم المزاد] [المبلغ]")
+        return
+
+    try:
+        item_id, bid = int(args[0]), int(args[1])
+        user_id = update.effective_user.id
+        response = await market_db.run(place_bid, item_id, user_id, bid)
+        await update.message.reply_text(response)
+    except ValueError:
+        await update.message.reply_text("❌ تأكد من إدخال رقم مزاد ومبلغ صحيحين.")
+
+
+@group_only
+async def handle_close_auction(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    args = (update.message.text or "").split()[1:]
+    if len(args) < 1 or not args[0].isdigit():
+        await update.message.reply_text("❌ استخدم الأمر كالتالي: /close_auction [رقم المزاد]")
+        return
+
+    user_id = update.effective_user.id
+    response = await market_db.run(close_auction, int(args[0]), user_id)
+    await update.message.reply_text(response)
+
+
 @group_only
 async def handle_multi_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle multiple commands and send all related responses."""
@@ -511,7 +640,13 @@ def register(app: Application) -> None:
     app.add_handler(MessageHandler(filters.Regex(r"(?i)^/open_bank$") & G, handle_open_bank), group=40)
     app.add_handler(MessageHandler(filters.Regex(r"(?i)^/balance$") & G, handle_check_balance), group=40)
     app.add_handler(MessageHandler(filters.Regex(r"(?i)^/daily$") & G, handle_claim_daily), group=40)
+    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/history$") & G, handle_history), group=40)
+    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/richest(?:_global)?$") & G, handle_richest), group=40)
+    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/myrank$") & G, handle_my_rank), group=40)
     app.add_handler(MessageHandler(filters.Regex(r"(?i)^/transfer(?:\s+\d+\s+\d+)?$") & G, handle_transfer), group=40)
-    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/list_market$") & G, handle_list_market), group=40)
-    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/add_market(?:\s+.+\s+\S+\s+\d+)?$") & G, handle_add_market), group=40)
+    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/list_market(?:\s+\S+)?$") & G, handle_list_market), group=40)
+    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/add_(?:market|auction)(?:\s+.+\s+\S+\s+\d+)?$") & G, handle_add_market), group=40)
     app.add_handler(MessageHandler(filters.Regex(r"(?i)^/buy_market(?:\s+\d+)?$") & G, handle_buy_market), group=40)
+    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/bid(?:\s+\d+\s+\d+)?$") & G, handle_bid_market), group=40)
+    app.add_handler(MessageHandler(filters.Regex(r"(?i)^/close_auction(?:\s+\d+)?$") & G, handle_close_auction), group=40)
+    app.add_handler(CallbackQueryHandler(handle_market_page, pattern=r"^mkt:"))
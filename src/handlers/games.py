@@ -6,12 +6,14 @@ Games handler — 12 games ported from games.lua / AVIRA.lua:
 7. محيبس (hidden ring)         8. المختلف (spot difference)
 9. رياضيات (math quiz)         10. انكليزي (translation)
 11. امثله (proverbs)           12. كلمات (word scramble)
-+ اشتم (insult)
++ اشتم (insult)                 + بلاك جاك (blackjack, bank wagers)
 """
+import functools
 import random
 import logging
+from typing import Callable
 
-from telegram import Update
+from telegram import Bot, Update
 from telegram.ext import Application, ContextTypes, MessageHandler, CallbackQueryHandler, filters
 
 from src.config import Config
@@ -19,77 +21,41 @@ from src.constants.messages import (
     MSG_GAME_EMOJI_PROMPT, MSG_GAME_EMOJI_WIN, MSG_GAME_GUESS_PROMPT,
     MSG_GAME_GUESS_WIN, MSG_GAME_GUESS_WRONG, MSG_GAMES_LOCKED,
     MSG_GAME_MENU, MSG_FORCE_SUBSCRIBE, MSG_NO_PERMISSION,
-    get_random_insult, get_random_riddle, get_random_emoji_meaning,
-    get_random_proverb, get_random_english_word, generate_math_question,
+    get_random_insult, generate_math_question,
 )
+from src.constants.content import ShuffleBag
 from src.services.user_service import UserService
 from src.services.group_service import GroupService
 from src.services.redis_service import RedisService
+from src.services.game_scheduler import GameScheduler
 from src.utils.decorators import group_only
-from src.utils.keyboard import build_games_keyboard
+from src.utils.keyboard import build_games_keyboard, build_blackjack_keyboard
 from src.utils.api_helpers import check_channel_membership
-from src.economy.bank_system import update_balance, get_balance, has_bank_account, open_bank_account
+from src.economy.bank_system import award, debit, has_bank_account, open_bank_account
+from src.blackjack import (
+    BlackjackGame, BlackjackHand, card_label,
+    OUTCOME_BUST, OUTCOME_WIN, OUTCOME_LOSE, OUTCOME_PUSH, OUTCOME_BLACKJACK,
+)
 
 logger = logging.getLogger(__name__)
 user_svc = UserService()
 group_svc = GroupService()
 redis_svc = RedisService()
-
-# Emoji pool
-EMOJI_POOL = [
-    "😂", "😍", "🤣", "😎", "🤩", "😜", "😘", "🤪",
-    "👍", "❤️", "🔥", "⭐", "🌟", "🌈", "🚀", "🏆",
-    "🎉", "🎊", "👑", "💎", "🦁", "🐯", "🦅", "🐻",
-    "🌹", "🦋", "🐸", "🐧", "🦊", "🐼", "🦄", "🐬",
-    "🍎", "🍕", "⚽", "🎸", "🎯", "🎲", "🎮", "🎪",
-]
+blackjack = BlackjackGame()
+game_scheduler = GameScheduler()
 
 ARABIC_LETTERS = list("ابتثجحخدذرزسشصضطظعغفقكلمنهوي")
 
-# Speed words (Lua: الاسرع / ترتيب)
-SPEED_WORDS = [
-    "سحور", "سياره", "استقبال", "قنفه", "ايفون", "بزونه", "مطبخ", "كرستيانو",
-    "دجاجه", "مدرسه", "الوان", "غرفه", "ثلاجه", "كهوه", "سفينه", "العراق",
-    "محطه", "طياره", "رادار", "منزل", "مستشفى", "كهرباء", "تفاحه", "اخطبوط",
-    "سلمون", "فرنسا", "برتقاله", "تفاح", "مطرقه", "بتيته", "لهانه", "شباك",
-    "باص", "سمكه", "ذباب", "تلفاز", "حاسوب", "انترنيت", "ساحه", "جسر",
-]
-
-# Arabic words for word scramble game
-SCRAMBLE_WORDS = [
-    "مدرسه", "كتاب", "قلم", "حياه", "سماء", "بحر", "جبل",
-    "شجره", "ورده", "نجمه", "قمر", "شمس", "بيت", "باب",
-    "سياره", "طائره", "هاتف", "حاسوب", "صديق", "عائله",
-    "مسجد", "حديقه", "مطبخ", "غرفه", "شارع", "مدينه",
-]
-
-OPPOSITE_PAIRS = {
-    "باي": "هلو",
-    "فهمت": "مافهمت",
-    "موزين": "زين",
-    "اسمعك": "ماسمعك",
-    "احبك": "ماحبك",
-    "موحلو": "حلو",
-    "نضيف": "وصخ",
-    "حاره": "بارده",
-    "ناصي": "عالي",
-    "جوه": "فوك",
-    "سريع": "بطيء",
-    "ونسه": "ضوجه",
-    "طويل": "قزم",
-    "سمين": "ضعيف",
-    "ضعيف": "قوي",
-    "شريف": "كواد",
-    "شجاع": "جبان",
-    "رحت": "اجيت",
-    "عدل": "ميت",
-    "نشيط": "خامل",
-    "شبعان": "جوعان",
-    "موعطشان": "عطشان",
-    "خوش ولد": "موخوش ولد",
-    "اني": "موب اني",
-    "هادئ": "عصبي",
-}
+# Per-group shuffle bags over the content banks in data/game_content.json
+emoji_bag = ShuffleBag("emoji_pool")
+speed_bag = ShuffleBag("speed_words")
+scramble_bag = ShuffleBag("scramble_words")
+opposite_bag = ShuffleBag("opposite_pairs")
+different_bag = ShuffleBag("different_pairs")
+riddle_bag = ShuffleBag("riddles")
+meaning_bag = ShuffleBag("emoji_meanings")
+proverb_bag = ShuffleBag("proverbs")
+english_bag = ShuffleBag("english_words")
 
 
 # ── Helpers ──
@@ -133,10 +99,6 @@ async def _check_user_has_bank_account(update, context):
         open_bank_account(user_id)
         await update.message.reply_text("✅ Bank account created successfully! You can now play games.")
 
-def _game_key(game_type: str, chat_id: int) -> str:
-    return f"game:{game_type}:{chat_id}"
-
-
 def _score_key(chat_id: int, user_id: int) -> str:
     return f"game:fastest:{chat_id}:{user_id}"
 
@@ -159,43 +121,104 @@ def _normalize_answer(text: str) -> str:
     )
 
 
+# ── Rounds ──
+# Each game registers a builder: chat_id -> (prompt, answer), plus its timeout.
+# Rounds are opened through the GameScheduler, which owns the deadline and
+# announces the answer when nobody wins in time.
+
+MAX_CHAIN_ROUNDS = 20
+
+RoundBuilder = Callable[[int], "tuple[str, str]"]
+_ROUNDS: dict[str, tuple[RoundBuilder, int]] = {}
+
+
+def _round(game_type: str, timeout: int = 120):
+    """Decorator: register a round builder for game_type."""
+    def decorator(builder: RoundBuilder) -> RoundBuilder:
+        _ROUNDS[game_type] = (builder, timeout)
+        return builder
+    return decorator
+
+
+def _requested_rounds(update: Update) -> int:
+    """Rounds asked for with a trailing count, e.g. 'حزوره 5' -> 5."""
+    parts = (update.message.text or "").split()
+    if len(parts) > 1 and parts[-1].isdigit():
+        return max(1, min(int(parts[-1]), MAX_CHAIN_ROUNDS))
+    return 1
+
+
+def _open_round(game_type: str, chat_id: int, rounds_left: int = 0) -> str:
+    """Open a new round and return its prompt text."""
+    builder, timeout = _ROUNDS[game_type]
+    prompt, answer = builder(chat_id)
+    game_scheduler.open_round(game_type, chat_id, answer, timeout, rounds_left)
+    return prompt
+
+
+async def _start_chained_round(bot: Bot, chat_id: int, rounds_left: int, game_type: str) -> None:
+    await bot.send_message(chat_id, _open_round(game_type, chat_id, rounds_left))
+
+
+async def _start_game(update: Update, context: ContextTypes.DEFAULT_TYPE, game_type: str) -> None:
+    """Common body of every '<game> [rounds]' command."""
+    if not await _check_games_enabled(update, context):
+        return
+    rounds_left = _requested_rounds(update) - 1
+    await update.message.reply_text(_open_round(game_type, update.effective_chat.id, rounds_left))
+
+
+async def _finish_round(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, game_type: str, text: str, award: bool = True,
+) -> None:
+    """Close the round on an answer; only the first closer wins."""
+    chat_id = update.effective_chat.id
+    closed, rounds_left = game_scheduler.close_round(game_type, chat_id)
+    if not closed:
+        return
+    if award:
+        await _award_point(chat_id, update.effective_user.id)
+    await update.message.reply_text(text)
+    await game_scheduler.start_next(context.bot, game_type, chat_id, rounds_left)
+
+
 # ══════════════════════════════════════════════════
 # 1) السمايلات — Emoji Race
 # ══════════════════════════════════════════════════
 
+@_round("emoji")
+def _emoji_round(chat_id: int) -> tuple[str, str]:
+    emoji = emoji_bag.draw(chat_id)
+    return f"✯اسرع واحد يدز هاذا السمايل ? » {{{emoji}}}", emoji
+
+
 @group_only
 async def handle_emoji_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    emoji = random.choice(EMOJI_POOL)
-    redis_svc.set(_game_key("emoji", update.effective_chat.id), emoji, ex=120)
-    await update.message.reply_text(f"✯اسرع واحد يدز هاذا السمايل ? » {{{emoji}}}")
+    await _start_game(update, context, "emoji")
 
 
 @group_only
 async def handle_emoji_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip()
-    active = redis_svc.get(_game_key("emoji", chat_id))
+    active = game_scheduler.get_answer("emoji", chat_id)
     if not active or text != active:
         return
-    redis_svc.delete(_game_key("emoji", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ السمايلات , السمايلات }")
+    await _finish_round(update, context, "emoji", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ السمايلات , السمايلات }")
 
 
 # ══════════════════════════════════════════════════
 # 2) تخمين — Number Guess
 # ══════════════════════════════════════════════════
 
+@_round("guess")
+def _guess_round(chat_id: int) -> tuple[str, str]:
+    return MSG_GAME_GUESS_PROMPT.format(max=10), str(random.randint(1, 10))
+
+
 @group_only
 async def handle_guess_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    number = random.randint(1, 10)
-    redis_svc.set(_game_key("guess", update.effective_chat.id), str(number), ex=120)
-    await update.message.reply_text(MSG_GAME_GUESS_PROMPT.format(max=10))
+    await _start_game(update, context, "guess")
 
 
 @group_only
@@ -204,14 +227,12 @@ async def handle_guess_answer(update: Update, context: ContextTypes.DEFAULT_TYPE
     text = (update.message.text or "").strip()
     if not text.isdigit():
         return
-    active = redis_svc.get(_game_key("guess", chat_id))
+    active = game_scheduler.get_answer("guess", chat_id)
     if not active:
         return
     if text == active:
-        redis_svc.delete(_game_key("guess", chat_id))
         winner = update.effective_user
-        await _award_point(chat_id, winner.id)
-        await update.message.reply_text(MSG_GAME_GUESS_WIN.format(name=winner.first_name))
+        await _finish_round(update, context, "guess", MSG_GAME_GUESS_WIN.format(name=winner.first_name))
     else:
         await update.message.reply_text(MSG_GAME_GUESS_WRONG)
 
@@ -220,30 +241,28 @@ async def handle_guess_answer(update: Update, context: ContextTypes.DEFAULT_TYPE
 # 3) الاسرع — Speed Word Game (Lua parity)
 # ══════════════════════════════════════════════════
 
-@group_only
-async def handle_speed_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    word = random.choice(SPEED_WORDS)
+@_round("speed")
+def _speed_round(chat_id: int) -> tuple[str, str]:
+    word = speed_bag.draw(chat_id)
     letters = list(word)
     random.shuffle(letters)
     scrambled = " ".join(letters)
-    redis_svc.set(_game_key("speed", chat_id), word, ex=120)
-    await update.message.reply_text(f"✯اسرع واحد يرتبها » {{{scrambled}}}")
+    return f"✯اسرع واحد يرتبها » {{{scrambled}}}", word
+
+
+@group_only
+async def handle_speed_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await _start_game(update, context, "speed")
 
 
 @group_only
 async def handle_speed_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip()
-    active = redis_svc.get(_game_key("speed", chat_id))
+    active = game_scheduler.get_answer("speed", chat_id)
     if not active or text != active:
         return
-    redis_svc.delete(_game_key("speed", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯الف مبروك لقد فزت\n✯للعب مره اخره ارسل »{ الاسرع , ترتيب }")
+    await _finish_round(update, context, "speed", "✯الف مبروك لقد فزت\n✯للعب مره اخره ارسل »{ الاسرع , ترتيب }")
 
 
 # ══════════════════════════════════════════════════
@@ -274,24 +293,25 @@ async def handle_fastest_leaderboard(update: Update, context: ContextTypes.DEFAU
     await update.message.reply_text("\n".join(lines))
 
 
+
+
 # ══════════════════════════════════════════════════
 # 4) الحروف — Find the Different Letter
 # ══════════════════════════════════════════════════
 
-@group_only
-async def handle_letters_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
+@_round("letter")
+def _letter_round(chat_id: int) -> tuple[str, str]:
     main_letter = random.choice(ARABIC_LETTERS)
     diff_letter = random.choice([l for l in ARABIC_LETTERS if l != main_letter])
     grid = [main_letter] * 25
     grid[random.randint(0, 24)] = diff_letter
     rows = [" ".join(grid[i:i+5]) for i in range(0, 25, 5)]
-    redis_svc.set(_game_key("letter", chat_id), diff_letter, ex=120)
-    await update.message.reply_text(
-        f"✯اسرع واحد يلكه الحرف المختلف ↓\n\n" + "\n".join(rows)
-    )
+    return f"✯اسرع واحد يلكه الحرف المختلف ↓\n\n" + "\n".join(rows), diff_letter
+
+
+@group_only
+async def handle_letters_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await _start_game(update, context, "letter")
 
 
 @group_only
@@ -300,89 +320,80 @@ async def handle_letter_answer(update: Update, context: ContextTypes.DEFAULT_TYP
     text = (update.message.text or "").strip()
     if len(text) != 1:
         return
-    active = redis_svc.get(_game_key("letter", chat_id))
+    active = game_scheduler.get_answer("letter", chat_id)
     if not active or text != active:
         return
-    redis_svc.delete(_game_key("letter", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ حروف , الحروف }")
+    await _finish_round(update, context, "letter", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ حروف , الحروف }")
 
 
 # ══════════════════════════════════════════════════
 # 5) حزوره — Riddles
 # ══════════════════════════════════════════════════
 
+@_round("riddle", timeout=180)
+def _riddle_round(chat_id: int) -> tuple[str, str]:
+    question, answer = riddle_bag.draw(chat_id)
+    return f"✯اسرع واحد يحل الحزوره ↓\n {{{question}}}", answer
+
+
 @group_only
 async def handle_riddle_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    riddle = get_random_riddle()
-    redis_svc.set(_game_key("riddle", chat_id), riddle["answer"], ex=180)
-    await update.message.reply_text(f"✯اسرع واحد يحل الحزوره ↓\n {{{riddle['question']}}}")
+    await _start_game(update, context, "riddle")
 
 
 @group_only
 async def handle_riddle_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip()
-    active = redis_svc.get(_game_key("riddle", chat_id))
+    active = game_scheduler.get_answer("riddle", chat_id)
     if not active:
         return
     norm_text = _normalize_answer(text)
     choices = [c.strip() for c in active.replace("/", " - ").split(" - ") if c.strip()]
     if any(_normalize_answer(choice) == norm_text for choice in choices):
-        redis_svc.delete(_game_key("riddle", chat_id))
-        winner = update.effective_user
-        await _award_point(chat_id, winner.id)
-        await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ حزوره }")
+        await _finish_round(update, context, "riddle", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ حزوره }")
 
 
 # ══════════════════════════════════════════════════
 # 6) معاني — Emoji Meaning
 # ══════════════════════════════════════════════════
 
+@_round("meaning")
+def _meaning_round(chat_id: int) -> tuple[str, str]:
+    emoji, answer = meaning_bag.draw(chat_id)
+    return f"✯اسرع واحد يدز معنى السمايل » {{{emoji}}}", answer
+
+
 @group_only
 async def handle_meaning_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    em = get_random_emoji_meaning()
-    redis_svc.set(_game_key("meaning", chat_id), em["answer"], ex=120)
-    await update.message.reply_text(f"✯اسرع واحد يدز معنى السمايل » {{{em['emoji']}}}")
+    await _start_game(update, context, "meaning")
 
 
 @group_only
 async def handle_meaning_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip()
-    active = redis_svc.get(_game_key("meaning", chat_id))
+    active = game_scheduler.get_answer("meaning", chat_id)
     if not active:
         return
     if _normalize_answer(text) != _normalize_answer(active):
         return
-    redis_svc.delete(_game_key("meaning", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯ الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ معاني }")
+    await _finish_round(update, context, "meaning", "✯ الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ معاني }")
 
 
 # ══════════════════════════════════════════════════
 # 7) محيبس — Hidden Ring (pick a hand)
 # ══════════════════════════════════════════════════
 
+@_round("ring", timeout=60)
+def _ring_round(chat_id: int) -> tuple[str, str]:
+    hand = random.choice(["يمين", "يسار"])
+    return "✯ لعبة المحيبس 💍\n✯ وين المحبس؟ (يمين / يسار)", hand
+
+
 @group_only
 async def handle_ring_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    hand = random.choice(["يمين", "يسار"])
-    redis_svc.set(_game_key("ring", chat_id), hand, ex=60)
-    await update.message.reply_text(
-        "✯ لعبة المحيبس 💍\n"
-        "✯ وين المحبس؟ (يمين / يسار)"
-    )
+    await _start_game(update, context, "ring")
 
 
 @group_only
@@ -391,71 +402,57 @@ async def handle_ring_answer(update: Update, context: ContextTypes.DEFAULT_TYPE)
     text = (update.message.text or "").strip()
     if text not in ("يمين", "يسار"):
         return
-    active = redis_svc.get(_game_key("ring", chat_id))
+    active = game_scheduler.get_answer("ring", chat_id)
     if not active:
         return
-    redis_svc.delete(_game_key("ring", chat_id))
+    # One guess per round: a wrong hand closes it too
     if text == active:
-        winner = update.effective_user
-        await _award_point(chat_id, winner.id)
-        await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ محيبس }")
+        await _finish_round(update, context, "ring", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ محيبس }")
     else:
-        await update.message.reply_text(f"✯ خطأ! المحبس كان بال{active} 💍❌")
+        await _finish_round(update, context, "ring", f"✯ خطأ! المحبس كان بال{active} 💍❌", award=False)
 
 
 # ══════════════════════════════════════════════════
 # 8) المختلف — Spot the Different Emoji
 # ══════════════════════════════════════════════════
 
-@group_only
-async def handle_different_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    pairs = [
-        ("😀", "😃"), ("🐶", "🐕"), ("🌹", "🌺"), ("⭐", "🌟"),
-        ("🔴", "🟡"), ("🟢", "🔵"), ("🐱", "🐈"), ("🍎", "🍏"),
-        ("🌙", "🌛"), ("❤️", "🧡"), ("🐻", "🧸"), ("☀️", "🌤"),
-    ]
-    main_emoji, diff_emoji = random.choice(pairs)
+@_round("diff")
+def _different_round(chat_id: int) -> tuple[str, str]:
+    main_emoji, diff_emoji = different_bag.draw(chat_id)
     grid = [main_emoji] * 16
-    diff_pos = random.randint(0, 15)
-    grid[diff_pos] = diff_emoji
+    grid[random.randint(0, 15)] = diff_emoji
     rows = [" ".join(grid[i:i+4]) for i in range(0, 16, 4)]
-    # Store answer as row,col (1-based)
-    row = diff_pos // 4 + 1
-    col = diff_pos % 4 + 1
-    redis_svc.set(_game_key("diff", chat_id), diff_emoji, ex=120)
-    await update.message.reply_text(
-        f"✯اسرع واحد يلكه المختلف ↓\n\n" + "\n".join(rows)
-    )
+    return f"✯اسرع واحد يلكه المختلف ↓\n\n" + "\n".join(rows), diff_emoji
+
+
+@group_only
+async def handle_different_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await _start_game(update, context, "diff")
 
 
 @group_only
 async def handle_different_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip()
-    active = redis_svc.get(_game_key("diff", chat_id))
+    active = game_scheduler.get_answer("diff", chat_id)
     if not active or text != active:
         return
-    redis_svc.delete(_game_key("diff", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ المختلف }")
+    await _finish_round(update, context, "diff", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ المختلف }")
 
 
 # ══════════════════════════════════════════════════
 # 9) رياضيات — Math Quiz
 # ══════════════════════════════════════════════════
 
+@_round("math")
+def _math_round(chat_id: int) -> tuple[str, str]:
+    question, answer = generate_math_question()
+    return f"✯اسرع واحد يحل المساله ↓\n {{{question}}}", str(answer)
+
+
 @group_only
 async def handle_math_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    question, answer = generate_math_question()
-    redis_svc.set(_game_key("math", chat_id), str(answer), ex=120)
-    await update.message.reply_text(f"✯اسرع واحد يحل المساله ↓\n {{{question}}}")
+    await _start_game(update, context, "math")
 
 
 @group_only
@@ -464,125 +461,210 @@ async def handle_math_answer(update: Update, context: ContextTypes.DEFAULT_TYPE)
     text = (update.message.text or "").strip()
     if not text.lstrip('-').isdigit():
         return
-    active = redis_svc.get(_game_key("math", chat_id))
+    active = game_scheduler.get_answer("math", chat_id)
     if not active:
         return
     if text == active:
-        redis_svc.delete(_game_key("math", chat_id))
-        winner = update.effective_user
-        await _award_point(chat_id, winner.id)
-        await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ رياضيات }")
+        await _finish_round(update, context, "math", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ رياضيات }")
 
 
 # ══════════════════════════════════════════════════
 # 10) انكليزي — English Translation
 # ══════════════════════════════════════════════════
 
+@_round("english")
+def _english_round(chat_id: int) -> tuple[str, str]:
+    word, answer = english_bag.draw(chat_id)
+    return f"✯اسرع واحد يترجمها انكليزي ↓\n {{{word}}}", answer
+
+
 @group_only
 async def handle_english_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    word = get_random_english_word()
-    redis_svc.set(_game_key("english", chat_id), word["answer"], ex=120)
-    await update.message.reply_text(f"✯اسرع واحد يترجمها انكليزي ↓\n {{{word['word']}}}")
+    await _start_game(update, context, "english")
 
 
 @group_only
 async def handle_english_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip().lower()
-    active = redis_svc.get(_game_key("english", chat_id))
+    active = game_scheduler.get_answer("english", chat_id)
     if not active or text != active.lower():
         return
-    redis_svc.delete(_game_key("english", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ انكليزي }")
+    await _finish_round(update, context, "english", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ انكليزي }")
 
 
 # ══════════════════════════════════════════════════
 # 11) امثله — Proverb Completion
 # ══════════════════════════════════════════════════
 
+@_round("proverb")
+def _proverb_round(chat_id: int) -> tuple[str, str]:
+    proverb, answer = proverb_bag.draw(chat_id)
+    return f"✯اسرع واحد يكمل المثل ↓\n {{{proverb}}}", answer
+
+
 @group_only
 async def handle_proverb_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    proverb = get_random_proverb()
-    redis_svc.set(_game_key("proverb", chat_id), proverb["answer"], ex=120)
-    await update.message.reply_text(f"✯اسرع واحد يكمل المثل ↓\n {{{proverb['proverb']}}}")
+    await _start_game(update, context, "proverb")
 
 
 @group_only
 async def handle_proverb_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip()
-    active = redis_svc.get(_game_key("proverb", chat_id))
+    active = game_scheduler.get_answer("proverb", chat_id)
     if not active or _normalize_answer(text) != _normalize_answer(active):
         return
-    redis_svc.delete(_game_key("proverb", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ امثله }")
+    await _finish_round(update, context, "proverb", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ امثله }")
 
 
 # ══════════════════════════════════════════════════
 # 12) كلمات — Word Scramble
 # ══════════════════════════════════════════════════
 
-@group_only
-async def handle_scramble_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    word = random.choice(SCRAMBLE_WORDS)
+@_round("scramble")
+def _scramble_round(chat_id: int) -> tuple[str, str]:
+    word = scramble_bag.draw(chat_id)
     letters = list(word)
     random.shuffle(letters)
     scrambled = " ".join(letters)
-    redis_svc.set(_game_key("scramble", chat_id), word, ex=120)
-    await update.message.reply_text(f"✯اسرع واحد يرتبها ↓\n {{{scrambled}}}")
+    return f"✯اسرع واحد يرتبها ↓\n {{{scrambled}}}", word
+
+
+@group_only
+async def handle_scramble_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await _start_game(update, context, "scramble")
 
 
 @group_only
 async def handle_scramble_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip()
-    active = redis_svc.get(_game_key("scramble", chat_id))
+    active = game_scheduler.get_answer("scramble", chat_id)
     if not active or _normalize_answer(text) != _normalize_answer(active):
         return
-    redis_svc.delete(_game_key("scramble", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ كلمات }")
+    await _finish_round(update, context, "scramble", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ كلمات }")
 
 
 # ══════════════════════════════════════════════════
 # Extra) عكس — Opposite Word Game (Lua-inspired)
 # ══════════════════════════════════════════════════
 
+@_round("opposite")
+def _opposite_round(chat_id: int) -> tuple[str, str]:
+    prompt, answer = opposite_bag.draw(chat_id)
+    return f"✯ لعبة العكس\n✯ هات عكس: {prompt}", answer
+
+
 @group_only
 async def handle_opposite_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _check_games_enabled(update, context):
-        return
-    chat_id = update.effective_chat.id
-    prompt, answer = random.choice(list(OPPOSITE_PAIRS.items()))
-    redis_svc.set(_game_key("opposite", chat_id), answer, ex=120)
-    await update.message.reply_text(f"✯ لعبة العكس\n✯ هات عكس: {prompt}")
+    await _start_game(update, context, "opposite")
 
 
 @group_only
 async def handle_opposite_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     text = (update.message.text or "").strip()
-    active = redis_svc.get(_game_key("opposite", chat_id))
+    active = game_scheduler.get_answer("opposite", chat_id)
     if not active or text != active:
         return
-    redis_svc.delete(_game_key("opposite", chat_id))
-    winner = update.effective_user
-    await _award_point(chat_id, winner.id)
-    await update.message.reply_text("✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ عكس , العكس }")
+    await _finish_round(update, context, "opposite", "✯الف مبروك لقد فزت\n ✯للعب مره اخره ارسل »{ عكس , العكس }")
+
+
+# ══════════════════════════════════════════════════
+# Extra) بلاك جاك — Blackjack with bank wagers
+# ══════════════════════════════════════════════════
+
+BLACKJACK_DEFAULT_BET = 10
+
+_BLACKJACK_RESULTS = {
+    OUTCOME_BLACKJACK: "✯ بلاك جاك! 🎉 ربحت {payout} نقطة",
+    OUTCOME_WIN: "✯ الف مبروك لقد فزت 🏆 ربحت {payout} نقطة",
+    OUTCOME_PUSH: "✯ تعادل 🤝 تم ارجاع {payout} نقطة",
+    OUTCOME_LOSE: "✯ خسرت 😢 الديلر فاز",
+    OUTCOME_BUST: "✯ تجاوزت 21 💥 خسرت",
+}
+
+
+def _format_blackjack(hand: BlackjackHand) -> str:
+    player = " ".join(card_label(c) for c in hand.player)
+    if hand.finished:
+        dealer = " ".join(card_label(c) for c in hand.dealer)
+        dealer_line = f"✯ الديلر: {dealer} ({hand.dealer_value})"
+    else:
+        dealer_line = f"✯ الديلر: {card_label(hand.dealer[0])} ❓"
+    lines = [
+        "✯ لعبة البلاك جاك 🃏",
+        f"✯ الرهان: {hand.bet} نقطة",
+        f"✯ ورقك: {player} ({hand.player_value})",
+        dealer_line,
+    ]
+    if hand.finished:
+        lines.append("")
+        lines.append(_BLACKJACK_RESULTS[hand.outcome].format(payout=hand.payout()))
+    return "\n".join(lines)
+
+
+def _settle_blackjack(hand: BlackjackHand) -> None:
+    payout = hand.payout()
+    if payout:
+        # Derived from the bet's op id: a retried settle can't pay twice
+        op_id = f"{hand.op_id}:payout" if hand.op_id else None
+        award(hand.user_id, payout, "blackjack_payout", op_id=op_id)
+
+
+@group_only
+async def handle_blackjack_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not await _check_games_enabled(update, context):
+        return
+    chat_id = update.effective_chat.id
+    user_id = update.effective_user.id
+    parts = (update.message.text or "").split()
+    bet = int(parts[-1]) if parts[-1].isdigit() else BLACKJACK_DEFAULT_BET
+    if bet <= 0:
+        await update.message.reply_text("❌ الرهان يجب ان يكون اكبر من صفر.")
+        return
+
+    if blackjack.has_game(chat_id):
+        await update.message.reply_text("✯ توجد لعبة بلاك جاك جاريه في المجموعه، انتظر انتهائها")
+        return
+    await _check_user_has_bank_account(update, context)
+    op_id = f"blackjack:{chat_id}:{update.message.message_id}"
+    if not debit(user_id, bet, "blackjack_bet", op_id=op_id):
+        await update.message.reply_text("❌ رصيدك لا يكفي لهذا الرهان.")
+        return
+
+    hand = blackjack.start_game(chat_id, user_id, bet, op_id=op_id)
+    if hand is None:
+        # Lost the race to another player starting a game
+        award(user_id, bet, "blackjack_refund", op_id=f"{op_id}:refund")
+        await update.message.reply_text("✯ توجد لعبة بلاك جاك جاريه في المجموعه، انتظر انتهائها")
+        return
+    if hand.finished:
+        _settle_blackjack(hand)
+        await update.message.reply_text(_format_blackjack(hand))
+        return
+    await update.message.reply_text(_format_blackjack(hand), reply_markup=build_blackjack_keyboard())
+
+
+async def handle_blackjack_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    chat_id = query.message.chat.id
+    user_id = query.from_user.id
+    if query.data == "bj:hit":
+        hand = blackjack.hit(chat_id, user_id)
+    else:
+        hand = blackjack.stand(chat_id, user_id)
+
+    if hand is None:
+        await query.answer("✯ هذه اللعبة ليست لك او انتهت", show_alert=True)
+        return
+    await query.answer()
+    if hand.finished:
+        _settle_blackjack(hand)
+        await query.edit_message_text(_format_blackjack(hand))
+    else:
+        await query.edit_message_text(_format_blackjack(hand), reply_markup=build_blackjack_keyboard())
 
 
 # ══════════════════════════════════════════════════
@@ -607,27 +689,52 @@ async def handle_insult(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         await update.message.reply_text(get_random_insult())
 
 
+_GAME_TRIGGERS = {
+    "game:emoji": "السمايلات",
+    "game:guess": "تخمين",
+    "game:fastest": "الاسرع",
+    "game:letters": "الحروف",
+    "game:riddle": "حزوره",
+    "game:meaning": "معاني",
+    "game:ring": "محيبس",
+    "game:different": "المختلف",
+    "game:math": "رياضيات",
+    "game:english": "انكليزي",
+    "game:proverb": "امثله",
+    "game:scramble": "كلمات",
+}
+
+
 async def handle_game_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     query = update.callback_query
     await query.answer()
-    data = query.data
-    game_help = {
-        "game:emoji": "ارسل 'الالعاب$"
-    }
-    app.add_handler(MessageHandler(filters.Regex("^(تخمين|خمن)$") & G, handle_guess_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(اسرع|الاسرع|ترتيب|ترتيب الاوامر)$") & G, handle_speed_game), group=15)
+    trigger = _GAME_TRIGGERS.get(query.data)
+    if trigger and query.message:
+        await query.message.reply_text(f"✯ للعب ارسل »{{ {trigger} }}\n✯ لعدة جولات ارسل »{{ {trigger} 5 }}")
+
+
+def register(app: Application) -> None:
+    """Register all game-related handlers with the application."""
+    G = filters.ChatType.GROUPS
+    # Optional trailing round count, e.g. "حزوره 5"
+    N = "( \\d+)?"
+    app.add_handler(MessageHandler(filters.Regex("^(الالعاب|الألعاب)$") & G, handle_games_menu), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(السمايلات|السمايل|سمايل|سمايلات){N}$") & G, handle_emoji_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(تخمين|خمن){N}$") & G, handle_guess_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(اسرع|الاسرع|ترتيب|ترتيب الاوامر){N}$") & G, handle_speed_game), group=15)
     app.add_handler(MessageHandler(filters.Regex("^ترتيب الاسرع$") & G, handle_fastest_leaderboard), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(الحروف|حروف|حرف)$") & G, handle_letters_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(حزوره|الحزوره)$") & G, handle_riddle_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(معاني|المعاني)$") & G, handle_meaning_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(محيبس|المحيبس)$") & G, handle_ring_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^المختلف$") & G, handle_different_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^رياضيات$") & G, handle_math_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^انكليزي$") & G, handle_english_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(امثله|الامثله)$") & G, handle_proverb_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(كلمات|الكلمات|كتبات)$") & G, handle_scramble_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(عكس|العكس)$") & G, handle_opposite_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(الحروف|حروف|حرف){N}$") & G, handle_letters_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(حزوره|الحزوره){N}$") & G, handle_riddle_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(معاني|المعاني){N}$") & G, handle_meaning_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(محيبس|المحيبس){N}$") & G, handle_ring_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^المختلف{N}$") & G, handle_different_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^رياضيات{N}$") & G, handle_math_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^انكليزي{N}$") & G, handle_english_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(امثله|الامثله){N}$") & G, handle_proverb_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(كلمات|الكلمات|كتبات){N}$") & G, handle_scramble_game), group=15)
+    app.add_handler(MessageHandler(filters.Regex(f"^(عكس|العكس){N}$") & G, handle_opposite_game), group=15)
     app.add_handler(MessageHandler(filters.Regex("^(اشتم|اشتمو)$") & G, handle_insult), group=15)
+    app.add_handler(MessageHandler(filters.Regex("^(بلاك جاك|بلاكجاك)( \\d+)?$") & G, handle_blackjack_game), group=15)
 
     # Answer checkers — low priority so they don't conflict with commands
     app.add_handler(MessageHandler(filters.TEXT & G, handle_emoji_answer), group=90)
@@ -646,10 +753,9 @@ async def handle_game_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 
     # Callback query
     app.add_handler(CallbackQueryHandler(handle_game_callback, pattern="^game:"))
+    app.add_handler(CallbackQueryHandler(handle_blackjack_callback, pattern="^bj:(hit|stand)$"))
 
-def register(app):
-    """Register all game-related handlers with the application."""
-    app.add_handler(MessageHandler(filters.Regex("^(تخمين|خمن)$"), handle_guess_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(اسرع|الاسرع|ترتيب|ترتيب الاوامر)$"), handle_speed_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(الحروف|حروف|حرف)$"), handle_letters_game), group=15)
-    app.add_handler(MessageHandler(filters.Regex("^(حزوره|الحزوره)$"), handle_riddle_game), group=15)
+    # Round deadlines and chaining
+    for game_type in _ROUNDS:
+        game_scheduler.register_game(game_type, functools.partial(_start_chained_round, game_type=game_type))
+    game_scheduler.attach(app)
@@ -0,0 +1,114 @@
+"""
+Lazy handlers — register handlers whose module is imported on first match.
+
+Some handler modules pull in heavy dependencies at import time: PIL and the
+image pool (photo_editor), the download queue (youtube), the Quran corpus
+(quran), pytz and hijri_converter (time_converter), the backup engine
+(maintenance). Most updates never reach them, yet importing them up front
+is paid on every cold start.
+
+Their handlers are registered here with the filters defined up front and a
+``lazy("module:callback")`` stub as the callback: the module is imported
+the first time one of its handlers matches, then the real callback is
+cached and called directly.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import Any, Awaitable, Callable
+
+from telegram import Update
+from telegram.ext import Application, CallbackQueryHandler, ContextTypes, MessageHandler, filters
+
+Callback = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[Any]]
+
+
+def lazy(target: str) -> Callback:
+    """A callback stub for ``"module:attr"`` (module relative to src.handlers)."""
+    module_name, attr = target.split(":")
+    resolved: Callback | None = None
+
+    async def callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+        nonlocal resolved
+        if resolved is None:
+            module = importlib.import_module(f"src.handlers.{module_name}")
+            resolved = getattr(module, attr)
+        return await resolved(update, context)
+
+    callback.__name__ = attr
+    callback.__qualname__ = f"lazy({target})"
+    callback.target = target
+    return callback
+
+
+# ── Maintenance (sudo) ──
+
+def register_maintenance(app: Application) -> None:
+    """Register maintenance handlers."""
+    routes = (
+        (r"^(تحديث السورس|تحديث السورس 𖥔)$", "handle_update_source"),
+        (r"^(تحديث الملفات|تحديث الملفات 𖥔)$", "handle_update_files"),
+        (r"^(جلب نسخه احتياطيه|جلب النسخه الاحتياطيه 𖥔)$", "handle_backup_export"),
+        (r"^(جلب نسخه جزئيه|جلب النسخه الجزئيه)$", "handle_backup_export_incremental"),
+        (r"^(رفع نسخه احتياطيه|رفع النسخه الاحتياطيه)$", "handle_backup_restore"),
+        (r"^رفع نسخه كلير$", "handle_backup_restore_clear"),
+        (r"^(فحص نسخه احتياطيه|فحص النسخه الاحتياطيه)$", "handle_backup_check"),
+    )
+    for pattern, attr in routes:
+        app.add_handler(MessageHandler(
+            filters.Regex(pattern) & filters.ALL,
+            lazy(f"maintenance:{attr}"),
+        ), group=3)
+
+
+# ── YouTube ──
+
+def register_youtube(app: Application) -> None:
+    """Register YouTube handlers."""
+    app.add_handler(MessageHandler(
+        filters.Regex("^(بحث يوتيوب|يوتيوب)"),
+        lazy("youtube:handle_youtube_search"),
+    ), group=20)
+    app.add_handler(CallbackQueryHandler(lazy("youtube:handle_yt_callback"), pattern="^yt:"))
+
+
+# ── Quran ──
+
+def register_quran(app: Application) -> None:
+    """Register Quran handler."""
+    app.add_handler(MessageHandler(
+        filters.Regex("^(ميسر|جلالين|بحث قرآن) "),
+        lazy("quran:handle_quran_search"),
+    ), group=10)
+
+
+# ── Date converter ──
+
+def register_time_converter(app: Application) -> None:
+    """Register time converter handlers."""
+    app.add_handler(MessageHandler(
+        filters.Regex("^(التاريخ الهجري|التاريخ|hijri date|date)$"),
+        lazy("time_converter:handle_hijri_date"),
+    ), group=10)
+    app.add_handler(MessageHandler(
+        filters.Regex("^تحويل"),
+        lazy("time_converter:handle_gregorian_to_hijri"),
+    ), group=10)
+    app.add_handler(MessageHandler(
+        filters.Regex("^تحويل هـ"),
+        lazy("time_converter:handle_hijri_to_gregorian"),
+    ), group=10)
+
+
+# ── Photo editor ──
+
+def register_photo_editor(app: Application) -> None:
+    """Register photo editor handlers."""
+    app.add_handler(MessageHandler(
+        filters.Regex("^كتابة"),
+        lazy("photo_editor:handle_photo_text_command"),
+    ), group=10)
+    app.add_handler(MessageHandler(
+        filters.Regex("^فلتر"),
+        lazy("photo_editor:handle_photo_filter"),
+    ), group=10)
@@ -2,30 +2,37 @@
 Maintenance handler — sudo-only operational commands.
 Implements missing Lua-style maintenance commands such as:
 - تحديث السورس / تحديث الملفات
-- جلب نسخه احتياطيه
+- جلب نسخه احتياطيه / جلب نسخه جزئيه
 - رفع نسخه احتياطيه
 - رفع نسخه كلير
+- فحص نسخه احتياطيه
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import subprocess
 import sys
-from datetime import datetime
-from io import BytesIO
+import tempfile
+import time
 from pathlib import Path
 
 from telegram import Update
-from telegram.ext import Application, ContextTypes, MessageHandler, filters
+from telegram.error import TelegramError
+from telegram.ext import ContextTypes
 
 from src.constants.messages import MSG_NO_PERMISSION
+from src.services.backup import (
+    BackupRestorer, Manifest, SwapFailed, export_backup, file_sha256, iter_files, last_snapshot,
+    part_path, set_snapshot,
+)
 from src.services.user_service import UserService
-from src.services.redis_service import RedisService
 
 logger = logging.getLogger(__name__)
 user_svc = UserService()
-redis_svc = RedisService()
+
+PROGRESS_INTERVAL = 3.0  # seconds between restore progress edits
 
 
 def _is_sudo(update: Update) -> bool:
@@ -54,69 +61,28 @@ def _run_command(command: list[str], cwd: Path, timeout: int = 120) -> tuple[boo
         return False, str(exc)
 
 
-def _dump_bot_data() -> dict:
-    payload: dict = {
-        "version": 1,
-        "exported_at": datetime.utcnow().isoformat() + "Z",
-        "keys": [],
-    }
-
-    keys = redis_svc.keys("bot:*")
-    for key in keys:
-        key_type = redis_svc.client.type(key)
-
-        if key_type == "string":
-            payload["keys"].append({"key": key, "type": "string", "value": redis_svc.get(key)})
-        elif key_type == "hash":
-            payload["keys"].append({"key": key, "type": "hash", "value": redis_svc.hgetall(key)})
-        elif key_type == "set":
-            payload["keys"].append({"key": key, "type": "set", "value": sorted(list(redis_svc.smembers(key)))})
-        elif key_type == "list":
-            payload["keys"].append({"key": key, "type": "list", "value": redis_svc.client.lrange(key, 0, -1)})
-
-    return payload
-
+async def _edit_quietly(msg, text: str) -> None:
+    try:
+        await msg.edit_text(text)
+    except TelegramError:
+        pass
 
-def _restore_bot_data(data: dict, clear_first: bool = False) -> tuple[int, int]:
-    if clear_first:
-        existing = redis_svc.keys("bot:*")
-        if existing:
-            redis_svc.client.delete(*existing)
 
-    restored = 0
-    skipped = 0
+def _progress_reporter(msg, loop: asyncio.AbstractEventLoop):
+    """A BackupRestorer progress callback (called from the worker thread) that edits msg."""
+    last = 0.0
+    labels = {"stage": "تجهيز", "swap": "تطبيق"}
 
-    for item in data.get("keys", []):
-        key = item.get("key")
-        key_type = item.get("type")
-        value = item.get("value")
-        if not key or not key_type:
-            skipped += 1
-            continue
+    def report(phase: str, done: int) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if now - last < PROGRESS_INTERVAL:
+            return
+        last = now
+        text = f"✯ جاري استرجاع النسخة... ⏳\n✯ {labels.get(phase, phase)}: {done} مفتاح"
+        asyncio.run_coroutine_threadsafe(_edit_quietly(msg, text), loop)
 
-        try:
-            if key_type == "string":
-                redis_svc.set(key, value or "")
-            elif key_type == "hash":
-                redis_svc.client.delete(key)
-                if isinstance(value, dict) and value:
-                    redis_svc.client.hset(key, mapping=value)
-            elif key_type == "set":
-                redis_svc.client.delete(key)
-                if isinstance(value, list) and value:
-                    redis_svc.client.sadd(key, *value)
-            elif key_type == "list":
-                redis_svc.client.delete(key)
-                if isinstance(value, list) and value:
-                    redis_svc.client.rpush(key, *value)
-            else:
-                skipped += 1
-                continue
-            restored += 1
-        except Exception:
-            skipped += 1
-
-    return restored, skipped
+    return report
 
 
 async def handle_update_source(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -164,26 +130,88 @@ async def handle_update_files(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
+async def _send_backup(update: Update, incremental: bool) -> None:
+    since = None
+    if incremental:
+        since = last_snapshot()
+        if since is None:
+            await update.effective_message.reply_text("✯ لا توجد نسخة سابقة، ارسل: جلب نسخه احتياطيه")
+            return
+
+    msg = await update.effective_message.reply_text("✯ جاري إنشاء النسخة الاحتياطية... ⏳")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        try:
+            # SCAN (or the change journal) + gzip run in a thread; the data is streamed
+            manifest = await asyncio.to_thread(export_backup, directory, since=since)
+        except ValueError:
+            await msg.edit_text("✯ النسخة السابقة قديمة جداً، ارسل: جلب نسخه احتياطيه")
+            return
+        total = len(manifest.parts)
+        for i, part in enumerate(manifest.parts, 1):
+            with open(directory / part.file, "rb") as f:
+                sent = await update.effective_message.reply_document(
+                    document=f,
+                    filename=part.file,
+                    caption=f"✯ الجزء {i}/{total}\n✯ عدد المفاتيح: {part.keys}",
+                )
+            part.file_id = sent.document.file_id
+        # With the parts' file_ids, replying to the manifest restores every part
+        title = "نسخة جزئية (التغييرات فقط)" if incremental else "النسخة الاحتياطية"
+        with open(manifest.write(directory), "rb") as f:
+            await update.effective_message.reply_document(
+                document=f,
+                filename=f"{manifest.name}.manifest.json",
+                caption=(
+                    f"✯ تم إنشاء {title}\n"
+                    f"✯ عدد المفاتيح: {manifest.keys}\n✯ عدد الأجزاء: {total}"
+                    + (f"\n✯ محذوف: {manifest.deleted}" if incremental else "")
+                ),
+            )
+    # Delivered: the next incremental starts from this export
+    set_snapshot(manifest.snapshot)
+    await msg.delete()
+
+
 async def handle_backup_export(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """جلب نسخه احتياطيه — export bot Redis data."""
     if not _is_sudo(update):
         await update.effective_message.reply_text(MSG_NO_PERMISSION)
         return
+    await _send_backup(update, incremental=False)
 
-    payload = _dump_bot_data()
-    content = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
-    bio = BytesIO(content)
-    bio.name = f"bo_backup_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-    bio.seek(0)
 
-    await update.effective_message.reply_document(
-        document=bio,
-        filename=bio.name,
-        caption=f"✯ تم إنشاء النسخة الاحتياطية\n✯ عدد المفاتيح: {len(payload.get('keys', []))}",
-    )
-
-
-async def _restore_backup(update: Update, context: ContextTypes.DEFAULT_TYPE, clear_first: bool) -> None:
+async def handle_backup_export_incremental(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """جلب نسخه جزئيه — export only the keys changed since the last backup."""
+    if not _is_sudo(update):
+        await update.effective_message.reply_text(MSG_NO_PERMISSION)
+        return
+    await _send_backup(update, incremental=True)
+
+
+async def _download_parts(bot, doc, directory: Path) -> list[Path]:
+    """Download the backup doc refers to; a manifest brings all its parts, checksum-verified."""
+    path = directory / "backup"
+    await (await bot.get_file(doc.file_id)).download_to_drive(path)
+    if not (doc.file_name or "").endswith(".manifest.json"):
+        return [path]
+
+    with open(path, encoding="utf-8") as f:
+        manifest = Manifest.from_dict(json.load(f))
+    parts = []
+    for part in manifest.parts:
+        if not part.file_id:
+            raise ValueError("الملف لا يحتوي على معرفات الأجزاء، قم بالرد على كل جزء")
+        dest = part_path(directory, part.file)  # rejects ../ and absolute names
+        await (await bot.get_file(part.file_id)).download_to_drive(dest)
+        if file_sha256(dest) != part.sha256:
+            raise ValueError(f"الجزء {part.file} تالف (checksum)")
+        parts.append(dest)
+    return parts
+
+
+async def _restore_backup(update: Update, context: ContextTypes.DEFAULT_TYPE,
+                          clear_first: bool, dry_run: bool = False) -> None:
     if not _is_sudo(update):
         await update.effective_message.reply_text(MSG_NO_PERMISSION)
         return
@@ -197,23 +225,53 @@ async def _restore_backup(update: Update, context: ContextTypes.DEFAULT_TYPE, cl
 
     if not doc:
         await update.effective_message.reply_text(
-            "✯ ارسل الامر مع الرد على ملف النسخة الاحتياطية (.json)"
+            "✯ ارسل الامر مع الرد على ملف النسخة الاحتياطية (.manifest.json او .jsonl.gz او .json)"
         )
         return
 
-    try:
-        tg_file = await context.bot.get_file(doc.file_id)
-        file_bytes = await tg_file.download_as_bytearray()
-        data = json.loads(bytes(file_bytes).decode("utf-8"))
-    except Exception as exc:
-        await update.effective_message.reply_text(f"✯ فشل قراءة ملف النسخة: {exc}")
-        return
+    msg = await update.effective_message.reply_text("✯ جاري قراءة النسخة... ⏳")
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            parts = await _download_parts(context.bot, doc, Path(tmp))
+        except Exception as exc:
+            await msg.edit_text(f"✯ فشل قراءة ملف النسخة: {exc}")
+            return
 
-    restored, skipped = _restore_bot_data(data, clear_first=clear_first)
-    mode = "(كلير)" if clear_first else ""
-    await update.effective_message.reply_text(
-        f"✯ تم استرجاع النسخة {mode} ✅\n✯ تم: {restored}\n✯ تخطي: {skipped}"
-    )
+        restorer = BackupRestorer(progress=_progress_reporter(msg, asyncio.get_running_loop()))
+        try:
+            # Staged restore: live keys change only after every part was read and staged
+            report = await asyncio.to_thread(
+                restorer.restore, iter_files(parts), clear_first=clear_first, dry_run=dry_run,
+            )
+        except SwapFailed as exc:
+            # The swap is per batch: the batches before this one are live
+            logger.error(f"Backup restore failed mid-swap: {exc}", exc_info=True)
+            await msg.edit_text(
+                f"✯ فشل الاسترجاع في الدفعة {exc.batch} من {exc.batches} ⚠️\n"
+                f"✯ تم تطبيق {exc.swapped} مفتاح قبلها، اعد رفع النسخة لاكمالها"
+            )
+            return
+        except Exception as exc:
+            logger.error(f"Backup restore failed: {exc}", exc_info=True)
+            await msg.edit_text(f"✯ فشل استرجاع النسخة، لم يتم تغيير البيانات ❌\n{str(exc)[:200]}")
+            return
+
+    types = "، ".join(f"{t}: {n}" for t, n in sorted(report.types.items()))
+    lines = [
+        "✯ فحص النسخة (بدون تطبيق) ✅" if dry_run else
+        f"✯ تم استرجاع النسخة {'(كلير)' if clear_first else ''} ✅",
+        f"✯ {'صالح' if dry_run else 'تم'}: {report.keys}",
+        f"✯ تخطي: {report.invalid}",
+    ]
+    if not dry_run:
+        lines.append(f"✯ دفعات التبديل: {report.batches}")
+    if types:
+        lines.append(f"✯ الانواع: {types}")
+    if clear_first:
+        lines.append(f"✯ حذف: {report.removed}")
+    if report.errors:
+        lines.append("✯ اخطاء:\n" + "\n".join(report.errors))
+    await _edit_quietly(msg, "\n".join(lines))
 
 
 async def handle_backup_restore(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -222,35 +280,10 @@ async def handle_backup_restore(update: Update, context: ContextTypes.DEFAULT_TY
 
 
 async def handle_backup_restore_clear(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """رفع نسخه كلير — clear bot keys then restore backup."""
+    """رفع نسخه كلير — restore backup, then delete bot keys it doesn't contain."""
     await _restore_backup(update, context, clear_first=True)
 
 
-def register(app: Application) -> None:
-    """Register maintenance handlers."""
-    ANY = filters.ALL
-
-    app.add_handler(MessageHandler(
-        filters.Regex(r"^(تحديث السورس|تحديث السورس 𖥔)$") & ANY,
-        handle_update_source,
-    ), group=3)
-
-    app.add_handler(MessageHandler(
-        filters.Regex(r"^(تحديث الملفات|تحديث الملفات 𖥔)$") & ANY,
-        handle_update_files,
-    ), group=3)
-
-    app.add_handler(MessageHandler(
-        filters.Regex(r"^(جلب نسخه احتياطيه|جلب النسخه الاحتياطيه 𖥔)$") & ANY,
-        handle_backup_export,
-    ), group=3)
-
-    app.add_handler(MessageHandler(
-        filters.Regex(r"^(رفع نسخه احتياطيه|رفع النسخه الاحتياطيه)$") & ANY,
-        handle_backup_restore,
-    ), group=3)
-
-    app.add_handler(MessageHandler(
-        filters.Regex(r"^رفع نسخه كلير$") & ANY,
-        handle_backup_restore_clear,
-    ), group=3)
+async def handle_backup_check(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """فحص نسخه احتياطيه — dry run: validate and count without writing."""
+    await _restore_backup(update, context, clear_first=False, dry_run=True)
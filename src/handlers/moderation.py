@@ -3,8 +3,11 @@ Moderation handler — ban, unban, mute, unmute, kick, warn.
 Based on moderation features from bian.lua.
 """
 import logging
+import time
+from typing import Awaitable, Callable
 
-from telegram import Update
+from telegram import Bot, ChatMember, Message, Update
+from telegram.error import BadRequest, Forbidden, TelegramError
 from telegram.ext import Application, ContextTypes, MessageHandler, filters
 
 from src.config import Config
@@ -17,18 +20,23 @@ from src.constants.messages import (
 )
 from src.constants.roles import is_higher_role
 from src.services.user_service import UserService
+from src.services.batch_job import FAILED, JobReport, JobRunning
+from src.services.fanout import APPLIED, SKIPPED, FanOut
 from src.services.group_service import GroupService
+from src.services.rate_limiter import api_limiter
 from src.utils.decorators import group_only
 from src.utils.text_utils import extract_user_id, format_user_list
 from src.utils.api_helpers import (
     ban_member, unban_member, kick_member, mute_member, unmute_member,
-    is_bot_admin,
+    is_bot_admin, MUTED_PERMISSIONS, UNMUTED_PERMISSIONS,
 )
 
 logger = logging.getLogger(__name__)
 user_svc = UserService()
 group_svc = GroupService()
 
+FANOUT_PROGRESS_INTERVAL = 5.0  # seconds between global action progress edits
+
 
 async def _check_permissions(update: Update, target_id: int) -> bool:
     """Common permission checks for moderation actions. Returns True if allowed."""
@@ -95,6 +103,96 @@ async def handle_unban(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     await update.message.reply_text(MSG_UNBANNED.format(name=target.full_name))
 
 
+# ── Global actions (background fan-out over every group) ──
+
+async def _bot_admin_cached(bot: Bot, chat_id: int) -> bool:
+    """Is the bot admin in chat_id; cached, so a fan-out asks Telegram once per group."""
+    cached = group_svc.get_bot_admin(chat_id)
+    if cached is None:
+        try:
+            member = await api_limiter.call(bot.get_chat_member, chat_id, bot.id)
+            cached = member.status in (ChatMember.ADMINISTRATOR, ChatMember.OWNER)
+        except (BadRequest, Forbidden):
+            cached = False
+        group_svc.set_bot_admin(chat_id, cached)
+    return cached
+
+
+# BadRequest texts meaning the bot lost its admin rights in the chat
+_NO_RIGHTS_ERRORS = ("not enough rights", "chat_admin_required", "administrator rights")
+
+
+def _lost_rights(e: TelegramError) -> bool:
+    if isinstance(e, Forbidden):
+        return True  # kicked, or the chat is gone
+    return any(text in e.message.lower() for text in _NO_RIGHTS_ERRORS)
+
+
+def _group_action(bot: Bot, method: Callable[..., Awaitable], user_id: int, **kwargs) -> Callable[[int], Awaitable[bool]]:
+    """A FanOut action calling method(chat_id, user_id, **kwargs) where the bot is admin."""
+    async def action(chat_id: int) -> bool:
+        if not await _bot_admin_cached(bot, chat_id):
+            return False
+        try:
+            await api_limiter.call(method, chat_id, user_id, **kwargs)
+        except (BadRequest, Forbidden) as e:
+            if _lost_rights(e):
+                # Demoted or removed since it was cached: look again next time
+                group_svc.forget_bot_admin(chat_id)
+                raise
+            # About the target (not a member, an admin, the owner): nothing to do here
+            return False
+        return True
+    return action
+
+
+def _fanout_progress(msg: Message):
+    last = 0.0
+
+    async def report(r: JobReport) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if now - last < FANOUT_PROGRESS_INTERVAL:
+            return
+        last = now
+        try:
+            await msg.edit_text(f"✯ جاري التنفيذ في المجموعات... ⏳\n✯ {r.checked}/{r.total}")
+        except TelegramError:
+            pass
+
+    return report
+
+
+async def _run_fanout(msg: Message, job: FanOut, done_text: str) -> None:
+    """Run a global action in the background and report the outcome on msg."""
+    try:
+        report = await job.run(group_svc.get_all_group_ids, progress=_fanout_progress(msg))
+    except JobRunning:
+        await msg.edit_text("✯ هذا الامر قيد التنفيذ بالفعل ⏳")
+        return
+    except Exception as e:
+        logger.error(f"Fan-out {job.name} stopped: {e}", exc_info=True)
+        await msg.edit_text("✯ توقف التنفيذ، ارسل الامر مجدداً للاستكمال ❌")
+        return
+    if report.cancelled:
+        await msg.edit_text("✯ تم ايقاف التنفيذ لان الامر تم الغاؤه ⚠️")
+        return
+    lines = [done_text, f"✯ ({report[APPLIED]} مجموعه)"]
+    if report[SKIPPED]:
+        lines.append(f"✯ تخطي (البوت ليس مشرف او لا ينطبق على العضو): {report[SKIPPED]}")
+    if report[FAILED]:
+        lines.append(f"✯ فشل: {report[FAILED]}")
+    await msg.edit_text("\n".join(lines))
+
+
+def _start_global(context: ContextTypes.DEFAULT_TYPE, msg: Message, update: Update,
+                  kind: str, opposite: str, target_id: int, action, while_, done_text: str) -> None:
+    job = FanOut(f"{kind}:{target_id}", action, while_=while_)
+    # A half-done opposite job must start over if it is ever run again
+    FanOut(f"{opposite}:{target_id}", action).discard()
+    context.application.create_task(_run_fanout(msg, job, done_text), update=update)
+
+
 @group_only
 async def handle_global_ban(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Ban a user from all groups."""
@@ -111,14 +209,12 @@ async def handle_global_ban(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_svc.global_ban(target_id)
     target = user_svc.get_user(target_id)
 
-    # Ban from all registered groups
-    count = 0
-    for gid in group_svc.get_all_group_ids():
-        if await ban_member(context.bot, gid, target_id):
-            count += 1
-
-    await update.message.reply_text(
-        MSG_GLOBAL_BANNED.format(name=target.full_name) + f"\n\u2756 ({count} مجموعه)"
+    msg = await update.message.reply_text("✯ جاري الحظر في جميع المجموعات... ⏳")
+    _start_global(
+        context, msg, update, "gban", "gunban", target_id,
+        _group_action(context.bot, context.bot.ban_chat_member, target_id),
+        lambda: user_svc.is_global_banned(target_id),
+        MSG_GLOBAL_BANNED.format(name=target.full_name),
     )
 
 
@@ -138,10 +234,13 @@ async def handle_global_unban(update: Update, context: ContextTypes.DEFAULT_TYPE
     user_svc.global_unban(target_id)
     target = user_svc.get_user(target_id)
 
-    for gid in group_svc.get_all_group_ids():
-        await unban_member(context.bot, gid, target_id)
-
-    await update.message.reply_text(MSG_GLOBAL_UNBANNED.format(name=target.full_name))
+    msg = await update.message.reply_text("✯ جاري الغاء الحظر في جميع المجموعات... ⏳")
+    _start_global(
+        context, msg, update, "gunban", "gban", target_id,
+        _group_action(context.bot, context.bot.unban_chat_member, target_id, only_if_banned=True),
+        lambda: not user_svc.is_global_banned(target_id),
+        MSG_GLOBAL_UNBANNED.format(name=target.full_name),
+    )
 
 
 @group_only
@@ -202,13 +301,12 @@ async def handle_global_mute(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_svc.global_mute(target_id)
     target = user_svc.get_user(target_id)
 
-    count = 0
-    for gid in group_svc.get_all_group_ids():
-        if await mute_member(context.bot, gid, target_id):
-            count += 1
-
-    await update.message.reply_text(
-        MSG_GLOBAL_MUTED.format(name=target.full_name) + f"\n\u2756 ({count} مجموعه)"
+    msg = await update.message.reply_text("✯ جاري الكتم في جميع المجموعات... ⏳")
+    _start_global(
+        context, msg, update, "gmute", "gunmute", target_id,
+        _group_action(context.bot, context.bot.restrict_chat_member, target_id, permissions=MUTED_PERMISSIONS),
+        lambda: user_svc.get_user(target_id).is_global_muted,
+        MSG_GLOBAL_MUTED.format(name=target.full_name),
     )
 
 
@@ -348,13 +446,12 @@ async def handle_global_unmute(update: Update, context: ContextTypes.DEFAULT_TYP
     user_svc.global_unmute(target_id)
     target = user_svc.get_user(target_id)
 
-    count = 0
-    for gid in group_svc.get_all_group_ids():
-        if await unmute_member(context.bot, gid, target_id):
-            count += 1
-
-    await update.message.reply_text(
-        MSG_GLOBAL_UNMUTED.format(name=target.full_name) + f"\n✯ ({count} مجموعه)"
+    msg = await update.message.reply_text("✯ جاري الغاء الكتم في جميع المجموعات... ⏳")
+    _start_global(
+        context, msg, update, "gunmute", "gmute", target_id,
+        _group_action(context.bot, context.bot.restrict_chat_member, target_id, permissions=UNMUTED_PERMISSIONS),
+        lambda: not user_svc.get_user(target_id).is_global_muted,
+        MSG_GLOBAL_UNMUTED.format(name=target.full_name),
     )
 
 
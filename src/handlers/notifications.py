@@ -107,6 +107,9 @@ async def handle_bot_added_to_group(update: Update, context: ContextTypes.DEFAUL
     new_status = my_chat_member.new_chat_member.status
     old_status = my_chat_member.old_chat_member.status
     added_by = my_chat_member.from_user
+
+    # Keeps the admin status global moderation relies on fresh
+    group_svc.set_bot_admin(chat.id, new_status in ("administrator", "creator"))
     
     # Bot was added (status changed to member or administrator)
     if old_status in ("left", "kicked") and new_status in ("member", "administrator"):
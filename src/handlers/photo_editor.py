@@ -1,16 +1,21 @@
 """Photo text editor - add text to images."""
 
 import logging
-import io
-from PIL import Image, ImageDraw, ImageFont
 from telegram import Update
-from telegram.ext import Application, ContextTypes, MessageHandler, filters
+from telegram.ext import ContextTypes
 from telegram.error import BadRequest
 
+from src.services.image_pool import ImagePool, ImagePoolBusy
 from src.utils.decorators import group_only
+from src.utils.image_ops import FILTERS, render_filter, render_text
 
 logger = logging.getLogger(__name__)
 
+# Image work runs in worker processes, one job per chat at a time
+image_pool = ImagePool(per_chat=1)
+
+MSG_CHAT_BUSY = "✯ يتم تحرير صورة أخرى في هذه المجموعة، انتظر قليلًا ⏳"
+
 
 @group_only
 async def handle_photo_text_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -51,18 +56,10 @@ async def handle_photo_text_command(update: Update, context: ContextTypes.DEFAUL
     try:
         # Download photo
         photo_file = await reply_msg.photo[-1].get_file()
-        photo_bytes = await photo_file.download_as_bytearray()
-        
-        # Open image
-        img = Image.open(io.BytesIO(photo_bytes))
-        
-        # Add text to image
-        img_with_text = add_text_to_image(img, write_text)
+        photo_bytes = bytes(await photo_file.download_as_bytearray())
         
-        # Save to bytes
-        output = io.BytesIO()
-        img_with_text.save(output, format="PNG")
-        output.seek(0)
+        # Decode, draw and encode in a worker process
+        output = await image_pool.run(update.effective_chat.id, render_text, photo_bytes, write_text)
         
         # Send edited photo
         await update.message.reply_photo(
@@ -72,6 +69,8 @@ async def handle_photo_text_command(update: Update, context: ContextTypes.DEFAUL
         
         await msg.delete()
         
+    except ImagePoolBusy:
+        await msg.edit_text(MSG_CHAT_BUSY)
     except BadRequest as e:
         logger.error(f"Photo download error: {e}")
         await msg.edit_text("✯ خطأ في تحميل الصورة ❌")
@@ -80,48 +79,6 @@ async def handle_photo_text_command(update: Update, context: ContextTypes.DEFAUL
         await msg.edit_text(f"✯ خطأ: {str(e)[:50]} ❌")
 
 
-def add_text_to_image(img: Image.Image, text: str) -> Image.Image:
-    """Add text to image."""
-    # Create a copy
-    img_copy = img.copy()
-    
-    # Get drawing context
-    draw = ImageDraw.Draw(img_copy)
-    
-    # Try to use a nice font, fallback to default
-    try:
-        # Try to load Arabic font
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 30)
-    except:
-        try:
-            font = ImageFont.truetype("C:\\Windows\\Fonts\\arial.ttf", 30)
-        except:
-            font = ImageFont.load_default()
-    
-    # Get image dimensions
-    width, height = img_copy.size
-    
-    # Calculate text position (bottom center)
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-    
-    x = (width - text_width) // 2
-    y = height - text_height - 20
-    
-    # Add white background for text
-    padding = 10
-    draw.rectangle(
-        [x - padding, y - padding, x + text_width + padding, y + text_height + padding],
-        fill=(255, 255, 255, 200)
-    )
-    
-    # Draw text
-    draw.text((x, y), text, fill=(0, 0, 0), font=font)
-    
-    return img_copy
-
-
 @group_only
 async def handle_photo_filter(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Apply filters to photos."""
@@ -145,32 +102,20 @@ async def handle_photo_filter(update: Update, context: ContextTypes.DEFAULT_TYPE
         )
         return
     
+    if not any(name in filter_type for name in FILTERS):
+        await update.message.reply_text("✯ فلتر غير معروف")
+        return
+    
     msg = await update.message.reply_text("✯ جاري تطبيق الفلتر... ⏳")
     
     try:
         # Download photo
         reply_msg = update.message.reply_to_message
         photo_file = await reply_msg.photo[-1].get_file()
-        photo_bytes = await photo_file.download_as_bytearray()
-        
-        # Open image
-        img = Image.open(io.BytesIO(photo_bytes))
-        
-        # Apply filter
-        if "رمادي" in filter_type:
-            filtered = img.convert("L")
-        elif "سيبيا" in filter_type:
-            filtered = apply_sepia(img)
-        elif "معكوس" in filter_type:
-            filtered = apply_invert(img)
-        else:
-            await msg.edit_text("✯ فلتر غير معروف")
-            return
+        photo_bytes = bytes(await photo_file.download_as_bytearray())
         
-        # Save to bytes
-        output = io.BytesIO()
-        filtered.save(output, format="PNG")
-        output.seek(0)
+        # Apply filter in a worker process
+        output = await image_pool.run(update.effective_chat.id, render_filter, photo_bytes, filter_type)
         
         # Send filtered photo
         await update.message.reply_photo(
@@ -180,54 +125,8 @@ async def handle_photo_filter(update: Update, context: ContextTypes.DEFAULT_TYPE
         
         await msg.delete()
         
+    except ImagePoolBusy:
+        await msg.edit_text(MSG_CHAT_BUSY)
     except Exception as e:
         logger.error(f"Filter error: {e}")
         await msg.edit_text(f"✯ خطأ: {str(e)[:50]} ❌")
-
-
-def apply_sepia(img: Image.Image) -> Image.Image:
-    """Apply sepia tone filter."""
-    img = img.convert("RGB")
-    pixels = img.load()
-    width, height = img.size
-    
-    for y in range(height):
-        for x in range(width):
-            r, g, b = pixels[x, y]
-            
-            tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-            tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-            tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-            
-            pixels[x, y] = (min(255, tr), min(255, tg), min(255, tb))
-    
-    return img
-
-
-def apply_invert(img: Image.Image) -> Image.Image:
-    """Apply invert colors filter."""
-    img = img.convert("RGB")
-    inverted = Image.new("RGB", img.size)
-    pixels = img.load()
-    inv_pixels = inverted.load()
-    
-    width, height = img.size
-    
-    for y in range(height):
-        for x in range(width):
-            r, g, b = pixels[x, y]
-            inv_pixels[x, y] = (255 - r, 255 - g, 255 - b)
-    
-    return inverted
-
-
-def register(app: Application) -> None:
-    """Register photo editor handlers."""
-    app.add_handler(
-        MessageHandler(filters.Regex("^كتابة"), handle_photo_text_command),
-        group=10
-    )
-    app.add_handler(
-        MessageHandler(filters.Regex("^فلتر"), handle_photo_filter),
-        group=10
-    )
@@ -1,15 +1,55 @@
 """Quran search and tafsir handler."""
 
+import asyncio
+import hashlib
+import json
 import logging
-import httpx
+import struct
+from typing import Any, Awaitable, Callable
+from urllib.parse import quote
+
 from telegram import Update
-from telegram.ext import Application, ContextTypes, MessageHandler, filters
+from telegram.ext import ContextTypes
 
+from src.services.http_client import http_client
+from src.services.quran_corpus import QuranCorpus
+from src.services.redis_service import RedisService
 from src.utils.decorators import group_only
+from src.utils.text_utils import normalize_query
 
 logger = logging.getLogger(__name__)
+redis = RedisService()
 
 QURAN_API = "https://api.alquran.cloud/v1"
+TAFSIR_EDITIONS = {"muyassar": "ar.muyassar", "jalalayn": "ar.jalalayn"}
+MAX_MATCHES = 3
+MAX_VERSES = 5         # verses listed by بحث قرآن (the reply shows five results)
+VERSE_PREVIEW = 300    # characters of each verse's text
+
+# Verse text and tafsir never change, so entries live long
+SURAHS_KEY = "quran:surahs"
+SURAHS_TTL = 7 * 24 * 3600
+SEARCH_TTL = 7 * 24 * 3600
+TAFSIR_TTL = 30 * 24 * 3600
+EMPTY_TTL = 10 * 60
+
+# Optional offline corpus (data/quran_corpus.bin); the API is the fallback
+corpus = QuranCorpus()
+_corpus_failed = False
+
+
+def _local() -> QuranCorpus | None:
+    """The offline corpus if it exists and loads, else None."""
+    global _corpus_failed
+    if _corpus_failed or not corpus.available():
+        return None
+    try:
+        corpus.surahs()  # maps the file on first use
+        return corpus
+    except (OSError, ValueError, struct.error) as e:
+        logger.error(f"Quran corpus unusable, using the API: {e}")
+        _corpus_failed = True
+        return None
 
 
 @group_only
@@ -63,90 +103,119 @@ async def handle_quran_search(update: Update, context: ContextTypes.DEFAULT_TYPE
         await msg.edit_text("✯ حدث خطأ في البحث ❌")
 
 
+async def _cached(key: str, ttl: int, fetch: Callable[[], Awaitable[Any]], empty_ttl: int = EMPTY_TTL) -> Any:
+    """Return the JSON value cached at key, or fetch() it and cache the result.
+
+    Empty results are cached for empty_ttl only; failures (None) aren't cached.
+    """
+    cached = redis.get_json(key)
+    if cached is not None:
+        return cached
+    value = await fetch()
+    if value is not None:
+        redis.client.set(key, json.dumps(value, ensure_ascii=False), ex=ttl if value else empty_ttl)
+    return value
+
+
+def _query_hash(query: str) -> str:
+    return hashlib.sha1(normalize_query(query).encode()).hexdigest()
+
+
+async def _fetch_surahs() -> list | None:
+    data = await http_client.get_json(f"{QURAN_API}/surah")
+    if data is None:
+        return None
+    return [
+        {"name": s.get("name", ""), "ayahs": s.get("numberOfAyahs")}
+        for s in data.get("data", [])
+    ]
+
+
+def _verse_matches(local: QuranCorpus, query: str) -> list:
+    """Verses containing every word of query, from the corpus's inverted index."""
+    names = [name for name, _ in local.surahs()]
+    return [
+        f"سورة {names[surah - 1]} - الآية {ayah}:\n{(local.text(surah, ayah) or '')[:VERSE_PREVIEW]}"
+        for surah, ayah in local.search(query, MAX_VERSES)
+    ]
+
+
 async def search_quran(query: str) -> list:
-    """Search Quran by text."""
+    """Search Quran by text: matching verses (offline corpus), else matching surah names."""
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(
-                f"{QURAN_API}/surah",
-                params={"language": "ar"}
-            )
-            
-            if response.status_code != 200:
-                return []
-            
-            data = response.json()
-            results = []
-            
-            # Simple search through surahs
-            for surah in data.get("data", []):
-                if query.lower() in surah.get("name", "").lower():
-                    results.append(
-                        f"سورة {surah.get('name')} - عدد الآيات: {surah.get('numberOfAyahs')}"
-                    )
-            
-            return results
-            
+        local = _local()
+        if local is not None:
+            verses = _verse_matches(local, query)
+            if verses:
+                return verses
+            surahs = [{"name": name, "ayahs": count} for name, count in local.surahs()]
+        else:
+            # The surah list never changes: fetched once, then filtered locally
+            surahs = await _cached(SURAHS_KEY, SURAHS_TTL, _fetch_surahs)
+        if not surahs:
+            return []
+        needle = query.lower()
+        return [
+            f"سورة {s['name']} - عدد الآيات: {s['ayahs']}"
+            for s in surahs
+            if needle in s["name"].lower()
+        ]
+
     except Exception as e:
         logger.error(f"Quran API error: {e}")
         return []
 
 
+async def _find_ayahs(query: str) -> list | None:
+    """[[surah, ayah], ...] for verses containing query (first MAX_MATCHES)."""
+    data = await http_client.get_json(f"{QURAN_API}/search/{quote(query)}/all/ar")
+    if data is None:
+        return None
+    matches = (data.get("data") or {}).get("matches", [])
+    return [
+        [m["surah"]["number"], m["numberInSurah"]]
+        for m in matches[:MAX_MATCHES]
+    ]
+
+
+async def _fetch_tafsir(edition: str, surah: int, ayah: int) -> str | None:
+    data = await http_client.get_json(f"{QURAN_API}/ayah/{surah}:{ayah}/{edition}")
+    if data is None:
+        return None
+    return (data.get("data") or {}).get("text", "")
+
+
+async def _tafsir(edition: str, surah: int, ayah: int) -> str | None:
+    local = _local()
+    if local is not None and local.has_edition(edition):
+        return local.text(surah, ayah, edition)
+    return await _cached(
+        f"quran:tafsir:{edition}:{surah}:{ayah}", TAFSIR_TTL,
+        lambda: _fetch_tafsir(edition, surah, ayah),
+    )
+
+
 async def get_tafsir(query: str, tafsir_type: str) -> list:
     """Get tafsir interpretation for a Quranic verse."""
+    edition = TAFSIR_EDITIONS[tafsir_type]
     try:
-        # Find the surah/ayah first
-        async with httpx.AsyncClient(timeout=10) as client:
-            # Search for the query in the Quran
-            response = await client.get(
-                f"{QURAN_API}/search",
-                params={"query": query, "language": "ar"}
-            )
-            
-            if response.status_code != 200:
-                return []
-            
-            data = response.json()
-            matches = data.get("data", {}).get("matches", [])
-            
-            if not matches:
-                return []
-            
-            results = []
-            
-            # Get tafsir for first 3 matches
-            for match in matches[:3]:
-                surah_num = match.get("surah", 1)
-                ayah_num = match.get("ayah", 1)
-                
-                tafsir_response = await client.get(
-                    f"{QURAN_API}/ayah/{surah_num}:{ayah_num}/tafsirs"
-                )
-                
-                if tafsir_response.status_code == 200:
-                    tafsir_data = tafsir_response.json()
-                    tafsirs = tafsir_data.get("data", [])
-                    
-                    if tafsirs:
-                        first_tafsir = tafsirs[0]
-                        results.append(
-                            f"السورة {surah_num} الآية {ayah_num}:\n"
-                            f"{first_tafsir.get('text', 'لا يوجد تفسير')[:200]}..."
-                        )
-            
-            return results
-            
+        local = _local()
+        if local is not None:
+            ayahs = local.search(query, MAX_MATCHES)
+        else:
+            ayahs = await _cached(f"quran:search:{_query_hash(query)}", SEARCH_TTL, lambda: _find_ayahs(query))
+        if not ayahs:
+            return []
+
+        # Each verse's tafsir is independent: fetch them concurrently
+        texts = await asyncio.gather(*(_tafsir(edition, surah, ayah) for surah, ayah in ayahs))
+        return [
+            f"السورة {surah} الآية {ayah}:\n"
+            f"{(text or 'لا يوجد تفسير')[:200]}..."
+            for (surah, ayah), text in zip(ayahs, texts)
+            if text is not None
+        ]
+
     except Exception as e:
         logger.error(f"Tafsir error: {e}")
         return []
-
-
-def register(app: Application) -> None:
-    """Register Quran handler."""
-    app.add_handler(
-        MessageHandler(
-            filters.Regex("^(ميسر|جلالين|بحث قرآن) "),
-            handle_quran_search
-        ),
-        group=10
-    )
@@ -5,7 +5,7 @@ import pytz
 import logging
 from hijri_converter import convert, Hijri, Gregorian
 from telegram import Update
-from telegram.ext import Application, ContextTypes, MessageHandler, filters
+from telegram.ext import ContextTypes
 
 from src.utils.decorators import group_only
 
@@ -129,22 +129,3 @@ async def handle_hijri_to_gregorian(update: Update, context: ContextTypes.DEFAUL
         
     except Exception as e:
         await update.message.reply_text(f"✯ خطأ: {str(e)[:50]} ❌")
-
-
-def register(app: Application) -> None:
-    """Register time converter handlers."""
-    app.add_handler(
-        MessageHandler(
-            filters.Regex("^(التاريخ الهجري|التاريخ|hijri date|date)$"),
-            handle_hijri_date
-        ),
-        group=10
-    )
-    app.add_handler(
-        MessageHandler(filters.Regex("^تحويل"), handle_gregorian_to_hijri),
-        group=10
-    )
-    app.add_handler(
-        MessageHandler(filters.Regex("^تحويل هـ"), handle_hijri_to_gregorian),
-        group=10
-    )
@@ -3,21 +3,27 @@ YouTube handler — search and download YouTube videos.
 Based on yt.php and YouTube features from the Lua bot.
 Uses yt-dlp for downloading.
 """
-import logging
-import os
 import asyncio
+import functools
+import logging
 import tempfile
+import time
 from pathlib import Path
 
 from telegram import Update
-from telegram.ext import Application, ContextTypes, MessageHandler, CallbackQueryHandler, filters
-from telegram.error import TelegramError
+from telegram.ext import ContextTypes
+from telegram.error import BadRequest, TelegramError
 
+from src.config import Config
 from src.constants.messages import MSG_YT_CHOOSE, MSG_YT_SEARCHING, MSG_YT_NOT_FOUND
+from src.services.download_queue import DownloadQueue, DownloadQueueFull
+from src.services.youtube_cache import NOT_FOUND, YouTubeCache, normalize_query
 from src.utils.keyboard import build_yt_keyboard
 
 logger = logging.getLogger(__name__)
 
+yt_cache = YouTubeCache()
+
 # Use /tmp on Vercel (read-only filesystem), fallback to local 'downloads' dir
 DOWNLOAD_DIR = Path(tempfile.gettempdir()) / "yt_downloads"
 DOWNLOAD_DIR.mkdir(exist_ok=True)
@@ -45,6 +51,117 @@ async def handle_youtube_search(update: Update, context: ContextTypes.DEFAULT_TY
     )
 
 
+DOWNLOAD_TIMEOUT = 120          # seconds per yt-dlp run
+PROGRESS_EDIT_INTERVAL = 3.0    # seconds between progress message edits
+_PROGRESS_MARK = "YTP"
+
+MSG_YT_QUEUED = "✯ طلبك في قائمة الانتظار ⏳"
+MSG_YT_BUSY = "✯ التحميلات مشغولة الآن، حاول بعد قليل ⏳"
+MSG_YT_PROGRESS = "✯ جاري التحميل: {percent} ⬇️"
+MSG_YT_TIMEOUT = "\u2756 انتهى الوقت المحدد للتحميل \u23F0"
+
+download_queue = DownloadQueue(
+    DOWNLOAD_DIR, max_concurrent=Config.YT_MAX_JOBS, max_queued=Config.YT_MAX_JOBS * 10, per_chat=2,
+)
+
+
+def _build_command(target: str, fmt: str, output_dir: Path) -> list[str]:
+    """yt-dlp command that downloads target and prints "id<TAB>title<TAB>path"."""
+    cmd = [
+        "yt-dlp",
+        target,
+        "-o", str(output_dir / "%(id)s.%(ext)s"),
+        "--no-playlist",
+        "--max-filesize", "50M",
+        "--print", "after_move:%(id)s\t%(title)s\t%(filepath)s",
+        "--progress", "--newline",
+        "--progress-template", f"download:{_PROGRESS_MARK} %(progress._percent_str)s",
+    ]
+    if Config.YT_RATE_LIMIT:
+        cmd += ["--limit-rate", Config.YT_RATE_LIMIT]
+    if fmt == "mp3":
+        cmd += [
+            "--extract-audio",
+            "--audio-format", "mp3",
+            "--audio-quality", "128K",
+        ]
+    else:  # mp4
+        cmd += ["-f", "best[filesize<50M]"]
+    return cmd
+
+
+async def _send_media(bot, chat_id: int, fmt: str, media, title: str):
+    """Send audio or video (a file object or a cached file_id) and return the message."""
+    if fmt == "mp3":
+        return await bot.send_audio(chat_id=chat_id, audio=media, title=title)
+    return await bot.send_video(chat_id=chat_id, video=media, caption=title)
+
+
+async def _run_yt_dlp(cmd: list[str], status) -> tuple[int, str | None, str]:
+    """Run yt-dlp, editing status with its progress. Returns (returncode, result line, stderr)."""
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    result: str | None = None
+    errors: list[str] = []
+    last_edit = 0.0
+
+    async def read(stream) -> None:
+        nonlocal result, last_edit
+        async for raw in stream:
+            line = raw.decode(errors="replace").strip()
+            if line.startswith(_PROGRESS_MARK):
+                now = time.monotonic()
+                if now - last_edit >= PROGRESS_EDIT_INTERVAL:
+                    last_edit = now
+                    try:
+                        await status.edit_text(MSG_YT_PROGRESS.format(percent=line[len(_PROGRESS_MARK):].strip()))
+                    except TelegramError:
+                        pass
+            elif line.count("\t") >= 2:
+                result = line
+            elif line:
+                errors.append(line)
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(read(process.stdout), read(process.stderr), process.wait()),
+            timeout=DOWNLOAD_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, result, "\n".join(errors[-20:])
+
+
+async def _download_job(workdir: Path, *, bot, chat_id: int, fmt: str, target: str,
+                        search_query: str, status) -> tuple[str, str, str] | None:
+    """Download into workdir, upload to chat_id and cache the file_id.
+
+    Returns (video_id, file_id, title), or None if nothing was found.
+    """
+    returncode, line, stderr = await _run_yt_dlp(_build_command(target, fmt, workdir), status)
+    if returncode != 0 or line is None:
+        logger.error(f"yt-dlp error: {stderr}")
+        if returncode == 0:
+            yt_cache.remember_not_found(search_query)  # search ran, nothing matched
+        return None
+
+    video_id, title, path = line.split("\t", 2)
+    file_path = Path(path)
+    if not file_path.exists():
+        return None
+
+    with open(file_path, "rb") as f:
+        message = await _send_media(bot, chat_id, fmt, f, title)
+    media = message.audio if fmt == "mp3" else message.video
+    if media is None:
+        return None
+    yt_cache.remember_file(search_query, video_id, fmt, media.file_id, title)
+    return video_id, media.file_id, title
+
+
 async def handle_yt_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle YouTube download button press."""
     query = update.callback_query
@@ -57,88 +174,51 @@ async def handle_yt_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     fmt = parts[1]  # mp3 or mp4
     search_query = parts[2]
+    chat_id = query.message.chat_id
 
-    await query.message.reply_text(MSG_YT_SEARCHING.format(query=search_query))
-
-    try:
-        output_path = DOWNLOAD_DIR / f"%(title)s.%(ext)s"
-
-        if fmt == "mp3":
-            cmd = [
-                "yt-dlp",
-                f"ytsearch1:{search_query}",
-                "--extract-audio",
-                "--audio-format", "mp3",
-                "--audio-quality", "128K",
-                "-o", str(output_path),
-                "--no-playlist",
-                "--max-filesize", "50M",
-            ]
-        else:  # mp4
-            cmd = [
-                "yt-dlp",
-                f"ytsearch1:{search_query}",
-                "-f", "best[filesize<50M]",
-                "-o", str(output_path),
-                "--no-playlist",
-            ]
-
-        # Run yt-dlp
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=120)
-
-        if process.returncode != 0:
-            logger.error(f"yt-dlp error: {stderr.decode()}")
-            await query.message.reply_text(MSG_YT_NOT_FOUND)
+    # Cached upload: resend by file_id, no search / download / upload
+    video_id, file_id, title = yt_cache.lookup(search_query, fmt)
+    if video_id == NOT_FOUND:
+        await query.message.reply_text(MSG_YT_NOT_FOUND)
+        return
+    if file_id:
+        try:
+            await _send_media(context.bot, chat_id, fmt, file_id, title or search_query)
             return
+        except BadRequest as e:
+            logger.warning("Cached file_id for %s rejected, downloading again: %s", video_id, e)
+            yt_cache.forget_file(video_id, fmt)
+
+    status = await query.message.reply_text(MSG_YT_SEARCHING.format(query=search_query))
+
+    # A known video is fetched directly instead of searching again
+    target = f"https://www.youtube.com/watch?v={video_id}" if video_id else f"ytsearch1:{search_query}"
+    job_key = f"{fmt}:{video_id or normalize_query(search_query)}"
+    work = functools.partial(
+        _download_job, bot=context.bot, chat_id=chat_id, fmt=fmt, target=target,
+        search_query=search_query, status=status,
+    )
+    try:
+        future, started_here = download_queue.submit(job_key, chat_id, work)
+    except DownloadQueueFull:
+        await status.edit_text(MSG_YT_BUSY)
+        return
+    if started_here and download_queue.is_waiting():
+        await status.edit_text(MSG_YT_QUEUED)
 
-        # Find the downloaded file
-        downloaded_files = sorted(DOWNLOAD_DIR.glob("*"), key=os.path.getmtime, reverse=True)
-        if not downloaded_files:
-            await query.message.reply_text(MSG_YT_NOT_FOUND)
+    try:
+        # shield: a waiter giving up must not cancel the shared download
+        result = await asyncio.shield(future)
+        if result is None:
+            await status.edit_text(MSG_YT_NOT_FOUND)
             return
-
-        file_path = downloaded_files[0]
-
-        # Send the file
-        try:
-            if fmt == "mp3":
-                with open(file_path, "rb") as f:
-                    await context.bot.send_audio(
-                        chat_id=query.message.chat_id,
-                        audio=f,
-                        title=file_path.stem,
-                    )
-            else:
-                with open(file_path, "rb") as f:
-                    await context.bot.send_video(
-                        chat_id=query.message.chat_id,
-                        video=f,
-                        caption=file_path.stem,
-                    )
-        finally:
-            # Clean up downloaded file
-            try:
-                file_path.unlink()
-            except OSError:
-                pass
-
+        if not started_here:
+            # Same file requested elsewhere: it's uploaded once, then shared by file_id
+            _, file_id, title = result
+            await _send_media(context.bot, chat_id, fmt, file_id, title)
+        await status.delete()
     except asyncio.TimeoutError:
-        await query.message.reply_text("\u2756 انتهى الوقت المحدد للتحميل \u23F0")
+        await status.edit_text(MSG_YT_TIMEOUT)
     except Exception as e:
         logger.error(f"YouTube download error: {e}")
-        await query.message.reply_text(f"\u2756 حدث خطأ: {str(e)[:100]}")
-
-
-def register(app: Application) -> None:
-    """Register YouTube handlers."""
-    app.add_handler(MessageHandler(
-        filters.Regex("^(بحث يوتيوب|يوتيوب)"),
-        handle_youtube_search,
-    ), group=20)
-
-    app.add_handler(CallbackQueryHandler(handle_yt_callback, pattern="^yt:"))
+        await status.edit_text(f"\u2756 حدث خطأ: {str(e)[:100]}")
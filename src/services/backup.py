@@ -0,0 +1,626 @@
+"""
+Backup export — streams Redis keys into gzip-compressed JSON Lines parts.
+
+The exporter never holds the dataset in memory. Keys are walked with SCAN
+in chunks; for each chunk one pipeline fetches every key's TYPE and PTTL
+and a second fetches the values. Each key becomes one JSON line written
+straight into a gzip stream:
+
+    {"key": "bot:user:1", "type": "hash", "ttl": -1, "value": {...}}
+
+ttl is the remaining lifetime in milliseconds (-1: no expiry). When a part
+reaches PART_LIMIT compressed bytes, it is closed and the next one opens,
+so every file can be sent to Telegram and downloaded back by the bot. A
+manifest lists the parts with their key counts, sizes and SHA-256
+checksums (and, once sent, their Telegram file_ids):
+
+    bo_backup_20240101_120000.part001.jsonl.gz
+    bo_backup_20240101_120000.part002.jsonl.gz
+    bo_backup_20240101_120000.manifest.json
+
+Incremental exports (since=) use the change journal instead of SCAN: only
+keys written since the previous export's snapshot, plus a DELETED tombstone
+for each of those that no longer exists. They are restored in order on top
+of the full backup they build on.
+
+Restore (BackupRestorer) streams the parts back in pipelined batches. Keys
+are first written under a staging prefix, ``restore:{run}:{key}``, and are
+only renamed over the live keys once every part has been read and staged,
+so a corrupt or truncated backup never touches live data. Before the swap,
+every staged key's TTL is refreshed and its existence checked; if any is
+gone, the restore stops with live data untouched.
+
+The swap is not atomic as a whole: it runs as one MULTI/EXEC per batch of
+RESTORE_BATCH RENAMEs. If a batch fails, the batches before it
+stay applied and SwapFailed says which batch failed and how many keys were
+already swapped. A dry run validates and counts without writing.
+
+Command line (from the project root):
+    python -m src.services.backup export DIR [--incremental]
+    python -m src.services.backup restore MANIFEST_OR_PART... [--clear] [--dry-run]
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import re
+import sys
+import time
+import uuid
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, TypeVar
+
+from src.services import change_journal
+from src.services.redis_service import RedisService
+
+T = TypeVar("T")
+
+FORMAT_VERSION = 2
+PART_LIMIT = 19 * 1024 * 1024      # bots can upload 50 MB but only download 20 MB back
+FLUSH_BYTES = 1024 * 1024          # sync-flush gzip this often so part sizes are known
+SCAN_COUNT = 500
+# Bot data plus the Redis economy backend (accounts, leaderboard, group rosters)
+DEFAULT_PATTERNS = ("bot:*", "user:*", "bank:*")
+DELETED = "deleted"                # incremental tombstone: the key no longer exists
+
+# type → how to fetch its value in a pipeline
+_FETCH = {
+    "string": lambda pipe, key: pipe.get(key),
+    "hash": lambda pipe, key: pipe.hgetall(key),
+    "set": lambda pipe, key: pipe.smembers(key),
+    "list": lambda pipe, key: pipe.lrange(key, 0, -1),
+    "zset": lambda pipe, key: pipe.zrange(key, 0, -1, withscores=True),
+}
+
+
+@dataclass
+class BackupPart:
+    file: str
+    keys: int = 0
+    bytes: int = 0
+    sha256: str = ""
+    file_id: str = ""      # Telegram document, filled in once the part is sent
+
+
+@dataclass
+class Manifest:
+    name: str
+    patterns: list[str]
+    exported_at: str
+    version: int = FORMAT_VERSION
+    format: str = "jsonl.gz"
+    kind: str = "full"             # or "incremental": only keys changed since `since`
+    since: float | None = None     # unix time of the snapshot an incremental builds on
+    snapshot: float = 0.0          # unix time this export started; the next incremental's `since`
+    keys: int = 0
+    deleted: int = 0               # tombstones in an incremental
+    skipped: int = 0
+    parts: list[BackupPart] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Manifest":
+        parts = [BackupPart(**part) for part in data.get("parts", [])]
+        return cls(**{**data, "parts": parts})
+
+    def write(self, directory: Path) -> Path:
+        path = directory / f"{self.name}.manifest.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+class _PartWriter:
+    """File wrapper that counts and hashes the compressed bytes gzip writes."""
+
+    def __init__(self, path: Path) -> None:
+        self._file = open(path, "wb")
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._hash.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> str:
+        self._file.close()
+        return self._hash.hexdigest()
+
+
+def _encode(key: str, key_type: str, ttl: int, value: Any) -> bytes:
+    if key_type == DELETED:
+        ttl = -2  # PTTL's "no such key"
+    elif key_type == "set":
+        value = sorted(value)
+    elif key_type == "zset":
+        value = [[member, score] for member, score in value]
+    item = {"key": key, "type": key_type, "ttl": ttl, "value": value}
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _chunks(items: Iterable[T], count: int) -> Iterator[list[T]]:
+    chunk: list[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= count:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _scan_chunks(redis: RedisService, pattern: str, count: int) -> Iterator[list[str]]:
+    return _chunks(redis.client.scan_iter(match=pattern, count=count), count)
+
+
+def _matches(key: str, patterns: Iterable[str]) -> bool:
+    return any(fnmatch.fnmatchcase(key, pattern) for pattern in patterns)
+
+
+def _journal_chunks(redis: RedisService, since: float, patterns: Iterable[str], count: int) -> Iterator[list[str]]:
+    """Chunks of keys matching patterns that the change journal saw since `since`."""
+    client = redis.client
+    buckets = change_journal.bucket_keys_since(since)
+    union = f"{change_journal.JOURNAL_PREFIX}export:{uuid.uuid4().hex[:12]}"
+    pipe = client.pipeline(transaction=False)
+    pipe.sunionstore(union, buckets)
+    pipe.expire(union, 3600)
+    pipe.execute()
+    try:
+        keys = (key for key in client.sscan_iter(union, count=count) if _matches(key, patterns))
+        yield from _chunks(keys, count)
+    finally:
+        client.unlink(union)
+
+
+def iter_records(
+    redis: RedisService,
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+    count: int = SCAN_COUNT,
+    since: float | None = None,
+) -> Iterator[tuple[str, bytes | None]]:
+    """Yield (type, encoded JSON line) per key matching patterns; the line is None for skipped keys.
+
+    With since, only keys the change journal recorded since then, and a
+    DELETED tombstone for each of those that no longer exists.
+    """
+    client = redis.client
+    if since is None:
+        chunks = (chunk for pattern in patterns for chunk in _scan_chunks(redis, pattern, count))
+    else:
+        chunks = _journal_chunks(redis, since, patterns, count)
+    for keys in chunks:
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.type(key)
+            pipe.pttl(key)
+        meta = pipe.execute()
+        types, ttls = meta[0::2], meta[1::2]
+
+        pipe = client.pipeline(transaction=False)
+        fetched = []
+        for key, key_type, ttl in zip(keys, types, ttls):
+            fetch = _FETCH.get(key_type)
+            if fetch is None:
+                if key_type != "none":
+                    yield key_type, None  # a type the format doesn't carry
+                elif since is not None:
+                    yield DELETED, _encode(key, DELETED, -2, None)
+                continue  # otherwise gone since SCAN
+            fetch(pipe, key)
+            fetched.append((key, key_type, ttl))
+        for (key, key_type, ttl), value in zip(fetched, pipe.execute()):
+            yield key_type, _encode(key, key_type, ttl, value)
+
+
+def export_backup(
+    directory: Path,
+    name: str | None = None,
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+    part_limit: int = PART_LIMIT,
+    redis: RedisService | None = None,
+    since: float | None = None,
+) -> Manifest:
+    """Export keys matching patterns into gzip JSONL parts plus a manifest in directory.
+
+    With since, an incremental export of the keys changed since then.
+    """
+    redis = redis or RedisService()
+    started = time.time()  # changes during the export land in the next incremental
+    if since is not None and since < started - change_journal.RETENTION + change_journal.BUCKET_SECONDS:
+        raise ValueError("the change journal no longer covers that snapshot; take a full backup")
+    kind = "full" if since is None else "incremental"
+    name = name or f"bo_{'backup' if since is None else 'delta'}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+    manifest = Manifest(
+        name=name, patterns=list(patterns), exported_at=datetime.utcnow().isoformat() + "Z",
+        kind=kind, since=since, snapshot=started,
+    )
+
+    writer: _PartWriter | None = None
+    stream: gzip.GzipFile | None = None
+    part: BackupPart | None = None
+    flush_every = min(FLUSH_BYTES, part_limit // 8)
+    unflushed = 0
+
+    def close_part() -> None:
+        stream.close()
+        part.sha256 = writer.close()
+        part.bytes = writer.size
+
+    for key_type, record in iter_records(redis, manifest.patterns, since=since):
+        if record is None:
+            manifest.skipped += 1
+            continue
+        if key_type == DELETED:
+            manifest.deleted += 1
+        # zlib holds back output until flushed: writer.size trails by at most flush_every
+        if stream is None or (part.keys and writer.size + unflushed + len(record) > part_limit):
+            if stream is not None:
+                close_part()
+            part = BackupPart(file=f"{name}.part{len(manifest.parts) + 1:03d}.jsonl.gz")
+            manifest.parts.append(part)
+            writer = _PartWriter(directory / part.file)
+            stream = gzip.GzipFile(filename="", mode="wb", fileobj=writer, mtime=0)
+            unflushed = 0
+        stream.write(record)
+        unflushed += len(record)
+        if unflushed >= flush_every:
+            stream.flush(zlib.Z_SYNC_FLUSH)
+            unflushed = 0
+        part.keys += 1
+        manifest.keys += 1
+    if stream is not None:
+        close_part()
+
+    manifest.write(directory)
+    return manifest
+
+
+def iter_backup_items(fileobj: BinaryIO) -> Iterator[dict]:
+    """Yield key records from a backup part (gzip JSONL) or a legacy JSON export."""
+    head = fileobj.read(2)
+    fileobj.seek(0)
+    if head == b"\x1f\x8b":
+        with gzip.GzipFile(fileobj=fileobj, mode="rb") as stream:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        yield from json.load(fileobj).get("keys", [])
+
+
+def last_snapshot(redis: RedisService | None = None) -> float | None:
+    """Start time of the last delivered export, the base for the next incremental."""
+    value = (redis or RedisService()).get(change_journal.SNAPSHOT_KEY)
+    return float(value) if value else None
+
+
+def set_snapshot(ts: float, redis: RedisService | None = None) -> None:
+    (redis or RedisService()).set(change_journal.SNAPSHOT_KEY, repr(ts))
+
+
+_PART_NAME = re.compile(r"[\w.-]+\.part\d{3,}\.jsonl\.gz")
+
+
+def part_path(directory: Path, file: str) -> Path:
+    """Where a manifest's part lives in directory.
+
+    Manifests can be uploaded by anyone who can send a file, so the part
+    name must be a bare file name in the exporter's ``*.partNNN.jsonl.gz``
+    form: no directories, no ``..``, no absolute paths.
+    """
+    if not isinstance(file, str) or Path(file).name != file or not _PART_NAME.fullmatch(file):
+        raise ValueError(f"bad part name: {file!r}")
+    return directory / file
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ── Restore ──
+
+RESTORE_BATCH = 500
+STAGE_TTL = 6 * 3600             # staged keys of an abandoned restore expire on their own
+
+_SCALAR = (str, int, float)
+
+
+def validate_record(item: Any, patterns: Iterable[str] = DEFAULT_PATTERNS) -> str | None:
+    """Why item can't be restored, or None if it's a valid key record."""
+    if not isinstance(item, dict):
+        return "not an object"
+    key, key_type, value = item.get("key"), item.get("type"), item.get("value")
+    if not isinstance(key, str) or not key:
+        return "missing key"
+    if not _matches(key, patterns):
+        return f"{key}: outside the backup patterns"
+    if key_type == DELETED:
+        return None
+    if key_type == "string":
+        ok = isinstance(value, _SCALAR)
+    elif key_type == "hash":
+        ok = isinstance(value, dict) and bool(value) and all(isinstance(v, _SCALAR) for v in value.values())
+    elif key_type in ("set", "list"):
+        ok = isinstance(value, list) and bool(value) and all(isinstance(v, _SCALAR) for v in value)
+    elif key_type == "zset":
+        ok = isinstance(value, list) and bool(value) and all(
+            isinstance(v, list) and len(v) == 2 and isinstance(v[1], (int, float)) for v in value
+        )
+    else:
+        return f"{key}: unknown type {key_type!r}"
+    if not ok:
+        return f"{key}: bad {key_type} value"
+    ttl = item.get("ttl", -1)
+    if not isinstance(ttl, int):
+        return f"{key}: bad ttl"
+    return None
+
+
+class SwapFailed(Exception):
+    """A swap batch failed; the batches before it are already applied."""
+
+    def __init__(self, batch: int, batches: int, swapped: int, error: Exception) -> None:
+        super().__init__(
+            f"swap batch {batch}/{batches} failed, {swapped} keys already swapped: {error}"
+        )
+        self.batch = batch
+        self.batches = batches
+        self.swapped = swapped
+
+
+@dataclass
+class RestoreReport:
+    dry_run: bool = False
+    keys: int = 0                  # valid records (restored, or counted in a dry run)
+    batches: int = 0               # swap batches applied (one MULTI/EXEC each)
+    invalid: int = 0
+    removed: int = 0               # live keys missing from the backup, deleted with clear_first
+    types: dict[str, int] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)   # first MAX_ERRORS reasons
+
+    MAX_ERRORS = 10
+
+    def reject(self, reason: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(reason)
+
+
+# progress(phase, done): phase is "stage" or "swap", done counts keys so far
+Progress = Callable[[str, int], None]
+
+
+class BackupRestorer:
+    def __init__(
+        self,
+        redis: RedisService | None = None,
+        patterns: Iterable[str] = DEFAULT_PATTERNS,
+        batch_size: int = RESTORE_BATCH,
+        progress: Progress | None = None,
+    ) -> None:
+        self.redis = redis or RedisService()
+        self.patterns = tuple(patterns)
+        self.batch_size = batch_size
+        self.progress = progress or (lambda phase, done: None)
+
+    def restore(self, records: Iterable[dict], clear_first: bool = False, dry_run: bool = False) -> RestoreReport:
+        """Restore records (from iter_backup_items, across any number of parts).
+
+        With clear_first, live keys matching the patterns that aren't in the
+        backup are deleted after the swap. Incremental backups are applied in
+        order on top of the full one they build on, without clear_first;
+        their DELETED tombstones remove keys.
+        """
+        report = RestoreReport(dry_run=dry_run)
+        run = uuid.uuid4().hex[:12]
+        prefix = f"restore:{run}:"
+        index = f"restore:{run}"  # staged key → ttl
+        try:
+            batch: list[dict] = []
+            for item in records:
+                reason = validate_record(item, self.patterns)
+                if reason:
+                    report.reject(reason)
+                    continue
+                report.keys += 1
+                report.types[item["type"]] = report.types.get(item["type"], 0) + 1
+                if dry_run:
+                    continue
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self._stage(batch, prefix, index)
+                    batch = []
+                    self.progress("stage", report.keys)
+            if batch:
+                self._stage(batch, prefix, index)
+            if dry_run:
+                return report
+            self.progress("stage", report.keys)
+            self._check_staged(prefix, index)
+            self._swap(prefix, index, report)
+            if clear_first:
+                report.removed = self._remove_missing(index)
+        finally:
+            if not dry_run:
+                self._drop_staging(prefix, index)
+        return report
+
+    # ── Phases ──
+
+    def _stage(self, batch: list[dict], prefix: str, index: str) -> None:
+        pipe = self.redis.client.pipeline(transaction=False)
+        for item in batch:
+            key, key_type, value = prefix + item["key"], item["type"], item["value"]
+            pipe.delete(key)  # a duplicate record replaces, never merges
+            if key_type == DELETED:
+                continue  # nothing to stage; the swap removes the live key
+            if key_type == "string":
+                pipe.set(key, value)
+            elif key_type == "hash":
+                pipe.hset(key, mapping=value)
+            elif key_type == "set":
+                pipe.sadd(key, *value)
+            elif key_type == "list":
+                pipe.rpush(key, *value)
+            else:  # zset
+                pipe.zadd(key, {member: score for member, score in value})
+            pipe.expire(key, STAGE_TTL)
+        pipe.hset(index, mapping={
+            item["key"]: -2 if item["type"] == DELETED else item.get("ttl", -1) for item in batch
+        })
+        pipe.expire(index, STAGE_TTL)
+        pipe.execute()
+
+    def _check_staged(self, prefix: str, index: str) -> None:
+        """Refresh the staging TTLs for the swap and make sure no staged key is gone."""
+        client = self.redis.client
+        client.expire(index, STAGE_TTL)
+        missing: list[str] = []
+        for batch in _chunks(self._index_items(index), self.batch_size):
+            pipe = client.pipeline(transaction=False)
+            staged = [key for key, ttl in batch if ttl != -2]
+            for key in staged:
+                pipe.expire(prefix + key, STAGE_TTL)
+            missing.extend(key for key, found in zip(staged, pipe.execute()) if not found)
+        if missing:
+            raise ValueError(
+                f"{len(missing)} staged keys expired before the swap (e.g. {missing[0]}); nothing was swapped"
+            )
+
+    def _index_items(self, index: str) -> Iterator[tuple[str, int]]:
+        for key, ttl in self.redis.client.hscan_iter(index, count=self.batch_size):
+            yield key, int(ttl)
+
+    def _swap(self, prefix: str, index: str, report: RestoreReport) -> None:
+        """RENAME staged keys over live ones, one MULTI/EXEC per batch."""
+        batches = -(-self.redis.client.hlen(index) // self.batch_size)
+        done = 0
+        for batch in _chunks(self._index_items(index), self.batch_size):
+            try:
+                self._rename(batch, prefix)
+            except Exception as e:
+                raise SwapFailed(report.batches + 1, batches, done, e) from e
+            report.batches += 1
+            done += len(batch)
+            self.progress("swap", done)
+
+    def _rename(self, batch: list[tuple[str, int]], prefix: str) -> None:
+        pipe = self.redis.client.pipeline(transaction=True)
+        for key, ttl in batch:
+            if ttl == -2:
+                pipe.unlink(key)
+                continue
+            pipe.rename(prefix + key, key)
+            if ttl > 0:
+                pipe.pexpire(key, ttl)
+            else:
+                pipe.persist(key)
+        change_journal.mark(pipe, [key for key, _ in batch])
+        pipe.execute()
+
+    def _remove_missing(self, index: str) -> int:
+        """Delete live keys the backup would have carried but doesn't.
+
+        Keys a backup can't hold are left alone: types the format doesn't
+        carry (the ledger and history streams) and keys the change journal
+        doesn't track (idempotency markers).
+        """
+        removed = 0
+        client = self.redis.client
+        chunks = (c for pattern in self.patterns for c in _scan_chunks(self.redis, pattern, self.batch_size))
+        for keys in chunks:
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                pipe.hexists(index, key)
+                pipe.type(key)
+            meta = pipe.execute()
+            stale = [
+                key for key, kept, key_type in zip(keys, meta[0::2], meta[1::2])
+                if not kept and key_type in _FETCH and change_journal.tracks(key)
+            ]
+            if stale:
+                client.unlink(*stale)
+                self.redis.mark_changed(*stale)
+                removed += len(stale)
+        return removed
+
+    def _drop_staging(self, prefix: str, index: str) -> None:
+        client = self.redis.client
+        for keys in _scan_chunks(self.redis, prefix + "*", self.batch_size):
+            client.unlink(*keys)
+        client.unlink(index)
+
+
+# ── Command line ──
+
+def _load_sources(paths: list[Path]) -> list[Path]:
+    """Expand manifests into their part files, verifying checksums."""
+    files: list[Path] = []
+    for path in paths:
+        if path.name.endswith(".manifest.json"):
+            with open(path, encoding="utf-8") as f:
+                manifest = Manifest.from_dict(json.load(f))
+            for part in manifest.parts:
+                source = part_path(path.parent, part.file)
+                if file_sha256(source) != part.sha256:
+                    raise ValueError(f"checksum mismatch: {source}")
+                files.append(source)
+        else:
+            files.append(path)
+    return files
+
+
+def iter_files(paths: Iterable[Path]) -> Iterator[dict]:
+    for path in paths:
+        with open(path, "rb") as f:
+            yield from iter_backup_items(f)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.services.backup")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="export bot keys into DIR")
+    export.add_argument("directory", type=Path)
+    export.add_argument("--incremental", action="store_true", help="only keys changed since the last export")
+    restore = sub.add_parser("restore", help="restore from a manifest or part files")
+    restore.add_argument("paths", type=Path, nargs="+")
+    restore.add_argument("--clear", action="store_true", help="delete bot keys missing from the backup")
+    restore.add_argument("--dry-run", action="store_true", help="validate and count only")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        since = last_snapshot() if args.incremental else None
+        if args.incremental and since is None:
+            print("no previous export; run a full export first", file=sys.stderr)
+            return 1
+        manifest = export_backup(args.directory, since=since)
+        set_snapshot(manifest.snapshot)
+        print(f"{manifest.kind}: {manifest.keys} keys ({manifest.deleted} deleted) "
+              f"in {len(manifest.parts)} part(s), {manifest.skipped} skipped")
+        return 0
+
+    restorer = BackupRestorer(progress=lambda phase, done: print(f"{phase}: {done}", file=sys.stderr))
+    report = restorer.restore(iter_files(_load_sources(args.paths)), clear_first=args.clear, dry_run=args.dry_run)
+    print(json.dumps(asdict(report), ensure_ascii=False, indent=2))
+    return 0 if not report.invalid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Batch jobs — resumable, bounded-concurrency passes over a list of items.
+
+The base for bulk Telegram work (sweeps, global ban fan-outs):
+  * items are processed ``concurrency`` at a time, in batches; each item
+    yields an outcome ("removed", "applied", "failed", ...) and the report
+    counts outcomes
+  * after each batch, the job's own writes for the batch (``commit``) and
+    the advanced checkpoint go to Redis in one MULTI pipeline
+  * the snapshot and checkpoint live in Redis (``{prefix}:{name}:items`` and
+    ``{prefix}:{name}``), so a job cut short (restart, serverless timeout)
+    resumes where it stopped when started again, redoing at most one batch
+  * ``{prefix}:{name}:lock`` keeps two runs of the same job apart; it
+    expires if its runner dies, so the job can be picked up again
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable
+
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger(__name__)
+
+JOB_TTL = 24 * 3600       # an abandoned job's checkpoint is dropped after a day
+LOCK_TTL = 120            # refreshed every batch; a dead runner frees the job by then
+FAILED = "failed"
+
+
+class JobRunning(Exception):
+    """Another runner holds this job."""
+
+
+@dataclass
+class JobReport:
+    total: int = 0
+    checked: int = 0
+    counts: dict[str, int] = field(default_factory=dict)
+    resumed: bool = False
+    cancelled: bool = False
+
+    def __getitem__(self, outcome: str) -> int:
+        return self.counts.get(outcome, 0)
+
+
+class BatchJob(ABC):
+    """A resumable job; subclasses implement process() and may override the other hooks."""
+
+    prefix = "job"
+
+    def __init__(self, name: str, *, concurrency: int = 8, batch_size: int = 200) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.redis = RedisService()
+        self._state_key = f"{self.prefix}:{name}"
+        self._items_key = f"{self.prefix}:{name}:items"
+        self._lock_key = f"{self.prefix}:{name}:lock"
+
+    # ── Subclass hooks ──
+
+    @abstractmethod
+    async def process(self, item: str) -> str:
+        """Handle one item and return its outcome. Raising counts as FAILED."""
+
+    def commit(self, pipe: Any, results: list[tuple[str, str]]) -> None:
+        """Queue the job's writes for a batch of (item, outcome) onto pipe."""
+
+    def active(self) -> bool:
+        """Checked before every batch; False cancels the job and drops its checkpoint."""
+        return True
+
+    # ── Checkpoint ──
+
+    def _load(self) -> JobReport | None:
+        state = self.redis.client.hgetall(self._state_key)
+        if not state or not self.redis.client.exists(self._items_key):
+            return None
+        return JobReport(
+            total=int(state.get("total", 0)),
+            checked=int(state.get("cursor", 0)),
+            counts={k[2:]: int(v) for k, v in state.items() if k.startswith("n:")},
+            resumed=True,
+        )
+
+    def _start(self, items: Iterable[Any]) -> JobReport:
+        client = self.redis.client
+        client.delete(self._items_key)
+        total = 0
+        chunk: list[str] = []
+        for item in items:
+            chunk.append(str(item))
+            if len(chunk) >= 1000:
+                client.rpush(self._items_key, *chunk)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            client.rpush(self._items_key, *chunk)
+            total += len(chunk)
+        pipe = client.pipeline()
+        pipe.delete(self._state_key)
+        pipe.hset(self._state_key, mapping={"total": total, "cursor": 0, "started": int(time.time())})
+        pipe.expire(self._state_key, JOB_TTL)
+        pipe.expire(self._items_key, JOB_TTL)
+        pipe.execute()
+        return JobReport(total=total)
+
+    def discard(self) -> None:
+        """Drop the checkpoint, so the next run starts from a fresh snapshot."""
+        self.redis.client.delete(self._state_key, self._items_key)
+
+    def _commit(self, cursor: int, results: list[tuple[str, str]]) -> None:
+        """The batch's writes and the advanced checkpoint, all or nothing."""
+        pipe = self.redis.client.pipeline(transaction=True)
+        self.commit(pipe, results)
+        pipe.hset(self._state_key, "cursor", cursor)
+        for _, outcome in results:
+            pipe.hincrby(self._state_key, f"n:{outcome}", 1)
+        pipe.expire(self._lock_key, LOCK_TTL)
+        pipe.execute()
+
+    # ── Run ──
+
+    async def _process(self, semaphore: asyncio.Semaphore, item: str) -> str:
+        async with semaphore:
+            try:
+                return await self.process(item)
+            except Exception as e:
+                logger.warning("%s %s: %s failed: %s", self.prefix, self.name, item, e)
+                return FAILED
+
+    async def run(self, snapshot: Callable[[], Iterable[Any]],
+                  progress: Callable[[JobReport], Awaitable[None]] | None = None) -> JobReport:
+        """Process the items snapshot() returns, or resume an unfinished run.
+
+        Raises JobRunning if another runner holds the job.
+        """
+        if not self.redis.client.set(self._lock_key, "1", nx=True, ex=LOCK_TTL):
+            raise JobRunning(self.name)
+        try:
+            report = self._load()
+            if report:
+                logger.info("%s %s: resuming at %s/%s", self.prefix, self.name, report.checked, report.total)
+            else:
+                report = self._start(snapshot())
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            while report.checked < report.total:
+                if not self.active():
+                    report.cancelled = True
+                    break
+                cursor = report.checked
+                batch = self.redis.client.lrange(self._items_key, cursor, cursor + self.batch_size - 1)
+                if not batch:
+                    break
+                outcomes = await asyncio.gather(*(self._process(semaphore, item) for item in batch))
+                results = list(zip(batch, outcomes))
+                self._commit(cursor + len(batch), results)
+                report.checked = cursor + len(batch)
+                for outcome in outcomes:
+                    report.counts[outcome] = report.counts.get(outcome, 0) + 1
+                if progress:
+                    await progress(report)
+        except BaseException:
+            # Keep the checkpoint for a resume, free the job for the next runner
+            self.redis.client.delete(self._lock_key)
+            raise
+        self.redis.client.delete(self._state_key, self._items_key, self._lock_key)
+        return report
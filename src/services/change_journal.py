@@ -0,0 +1,51 @@
+"""
+Change journal — which keys changed, so backups can export just the delta.
+
+Every tracked write also adds the key name to an hourly bucket set,
+``journal:{hour}``, in the same pipeline as the write itself (no extra
+round trip). Buckets expire after RETENTION. An incremental backup unions
+the buckets since the last snapshot and exports only those keys; buckets
+are coarse, so the delta may include a few keys changed just before the
+snapshot, never fewer.
+
+This module only builds journal commands onto a caller's pipeline, so
+RedisService can use it without an import cycle.
+"""
+from __future__ import annotations
+
+import time
+from typing import Iterable
+
+BUCKET_SECONDS = 3600
+RETENTION = 8 * 24 * 3600        # a week of daily incrementals, plus slack
+JOURNAL_PREFIX = "journal:"
+SNAPSHOT_KEY = "journal:snapshot"
+
+# Keys covered by backups. Not tracked: idempotency markers (they expire on
+# their own) and the ledger / history streams, which backups don't carry
+TRACKED_PREFIXES = ("bot:", "user:", "bank:")
+_UNTRACKED_PREFIXES = ("bank:op:", "bank:ledger", "bank:history:")
+
+
+def tracks(key: str) -> bool:
+    return key.startswith(TRACKED_PREFIXES) and not key.startswith(_UNTRACKED_PREFIXES)
+
+
+def bucket_key(ts: float) -> str:
+    return f"{JOURNAL_PREFIX}{int(ts) // BUCKET_SECONDS}"
+
+
+def bucket_keys_since(since: float, now: float | None = None) -> list[str]:
+    """Bucket keys covering [since, now]."""
+    now = time.time() if now is None else now
+    first, last = int(since) // BUCKET_SECONDS, int(now) // BUCKET_SECONDS
+    return [f"{JOURNAL_PREFIX}{bucket}" for bucket in range(first, last + 1)]
+
+
+def mark(pipe, keys: Iterable[str], now: float | None = None) -> None:
+    """Queue journal writes for the tracked keys among keys onto pipe."""
+    tracked = [key for key in keys if tracks(key)]
+    if tracked:
+        bucket = bucket_key(time.time() if now is None else now)
+        pipe.sadd(bucket, *tracked)
+        pipe.expire(bucket, RETENTION)
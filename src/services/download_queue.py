@@ -0,0 +1,129 @@
+"""
+Download queue — bounded, fair scheduling for long-running download jobs.
+
+Each job runs in its own temporary directory (removed when the job ends),
+so concurrent jobs never see each other's files. The queue enforces:
+  * ``max_concurrent`` jobs running at once (CPU / disk / bandwidth cap)
+  * ``max_queued`` jobs waiting at once; further requests are refused
+  * ``per_chat`` jobs queued or running per chat; chats are served
+    round-robin, so one busy chat can't starve the others
+  * de-duplication: submitting a key that is already queued or running
+    returns the existing job's future instead of starting a second download
+
+Workers are asyncio tasks bound to the running event loop. If the loop
+changes (a fresh loop per serverless invocation), the queue starts over.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+import tempfile
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# work(workdir) does the job inside its private directory
+JobWork = Callable[[Path], Awaitable[Any]]
+
+
+class DownloadQueueFull(Exception):
+    """The queue, or the chat's share of it, is full."""
+
+
+@dataclass
+class _Job:
+    key: str
+    chat_id: int
+    work: JobWork
+    future: asyncio.Future = field(repr=False)
+
+
+class DownloadQueue:
+    def __init__(self, root: Path, max_concurrent: int = 2, max_queued: int = 20, per_chat: int = 2) -> None:
+        self.root = root
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.per_chat = per_chat
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _reset(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queues: dict[int, deque[_Job]] = {}
+        self._ready: deque[int] = deque()          # chats with queued jobs, round-robin order
+        self._jobs: dict[str, _Job] = {}           # key -> queued or running job
+        self._per_chat: dict[int, int] = {}        # chat -> queued + running jobs
+        self._queued = 0
+        self._running = 0
+        self._pending = asyncio.Semaphore(0)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrent)]
+
+    # ── Submitting ──
+
+    def submit(self, key: str, chat_id: int, work: JobWork) -> tuple[asyncio.Future, bool]:
+        """Queue work under key. Returns (future, started_here).
+
+        started_here is False when an identical job was already in flight;
+        the caller then shares its result. Raises DownloadQueueFull.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            self._reset()
+        job = self._jobs.get(key)
+        if job is not None:
+            return job.future, False
+        if self._queued >= self.max_queued or self._per_chat.get(chat_id, 0) >= self.per_chat:
+            raise DownloadQueueFull(chat_id)
+
+        job = _Job(key, chat_id, work, self._loop.create_future())
+        self._jobs[key] = job
+        self._per_chat[chat_id] = self._per_chat.get(chat_id, 0) + 1
+        if chat_id not in self._queues:
+            self._queues[chat_id] = deque()
+            self._ready.append(chat_id)
+        self._queues[chat_id].append(job)
+        self._queued += 1
+        self._pending.release()
+        return job.future, True
+
+    def is_waiting(self) -> bool:
+        """True if a newly submitted job would wait for a free worker."""
+        return self._loop is asyncio.get_running_loop() and self._running + self._queued > self.max_concurrent
+
+    # ── Workers ──
+
+    def _next_job(self) -> _Job:
+        chat_id = self._ready.popleft()
+        queue = self._queues[chat_id]
+        job = queue.popleft()
+        if queue:
+            self._ready.append(chat_id)  # back of the line: other chats go first
+        else:
+            del self._queues[chat_id]
+        self._queued -= 1
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            await self._pending.acquire()
+            job = self._next_job()
+            self._running += 1
+            workdir = Path(tempfile.mkdtemp(prefix="job_", dir=self.root))
+            try:
+                job.future.set_result(await job.work(workdir))
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as e:
+                job.future.set_exception(e)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+                self._running -= 1
+                del self._jobs[job.key]
+                remaining = self._per_chat[job.chat_id] - 1
+                if remaining:
+                    self._per_chat[job.chat_id] = remaining
+                else:
+                    del self._per_chat[job.chat_id]
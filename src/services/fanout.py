@@ -0,0 +1,41 @@
+"""
+Fan-out — apply one action in every registered group, in the background.
+
+Global moderation (حظر عام, كتم عام and their reversals) touches every
+group the bot is in. A FanOut runs the action over a snapshot of the group
+ids as a resumable BatchJob, so the update handler returns at once and a
+restart picks the job up where it stopped.
+
+The action decides the outcome per group: APPLIED, or SKIPPED when the bot
+can't act there (not admin) or the action doesn't apply to the target
+there (not a member, an admin). ``while_`` is re-checked before every batch:
+when it turns False (the ban was lifted meanwhile) the job stops instead of
+racing the reversing job.
+"""
+from __future__ import annotations
+
+from typing import Awaitable, Callable
+
+from src.services.batch_job import BatchJob
+
+# action(chat_id) -> True if applied, False if skipped; raising counts as failed
+FanOutAction = Callable[[int], Awaitable[bool]]
+
+APPLIED = "applied"
+SKIPPED = "skipped"
+
+
+class FanOut(BatchJob):
+    prefix = "fanout"
+
+    def __init__(self, name: str, action: FanOutAction, *, while_: Callable[[], bool] | None = None,
+                 concurrency: int = 8, batch_size: int = 200) -> None:
+        super().__init__(name, concurrency=concurrency, batch_size=batch_size)
+        self.action = action
+        self.while_ = while_
+
+    async def process(self, item: str) -> str:
+        return APPLIED if await self.action(int(item)) else SKIPPED
+
+    def active(self) -> bool:
+        return self.while_ is None or self.while_()
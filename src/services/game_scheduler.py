@@ -0,0 +1,206 @@
+"""
+Game round scheduler — owns round deadlines for the chat games.
+
+Every open round is a Redis string ``game:{type}:{chat_id}`` holding the
+answer, plus a member ``{type}:{chat_id}`` in the sorted set
+``bot:game:deadlines`` scored by its deadline. Because the deadlines live in
+Redis they survive restarts and are visible to every worker.
+
+A repeating JobQueue job (or the webhook, opportunistically) calls sweep():
+each overdue round is claimed with ZREM — so exactly one worker handles it —
+closed, its answer announced, and the next round started if the round was
+part of a chain.
+
+Answer handlers read through a small process-local cache: a round whose
+deadline has passed is answered "no game" without touching Redis, and
+repeated lookups within CACHE_TTL seconds reuse the last read.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Awaitable, Callable
+
+from telegram import Bot
+from telegram.error import TelegramError
+from telegram.ext import Application, ContextTypes
+
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger(__name__)
+
+_DEADLINES_KEY = "bot:game:deadlines"
+_CHAIN_KEY = "bot:game:chain"  # hash: member -> rounds left after this one
+
+SWEEP_INTERVAL = 5     # seconds between deadline sweeps
+KEY_GRACE = 60         # answer keys outlive their deadline so the sweep can announce them
+CACHE_TTL = 2.0        # seconds a cached lookup is trusted (other workers may open rounds)
+CACHE_MAX_ENTRIES = 4096
+
+MSG_ROUND_TIMEOUT = "✯ انتهى الوقت ⏰\n✯ الجواب كان » {answer}"
+
+# starter(bot, chat_id, rounds_left) opens and announces a fresh round
+RoundStarter = Callable[[Bot, int, int], Awaitable[None]]
+
+
+def _member(game_type: str, chat_id: int) -> str:
+    return f"{game_type}:{chat_id}"
+
+
+def game_key(game_type: str, chat_id: int) -> str:
+    return f"game:{game_type}:{chat_id}"
+
+
+class GameScheduler:
+    """Round deadlines, timeouts and chaining for chat games."""
+
+    def __init__(self) -> None:
+        self.redis = RedisService()
+        self._starters: dict[str, RoundStarter] = {}
+        # (game_type, chat_id) -> (answer or None, deadline, cached_at)
+        self._cache: dict[tuple[str, int], tuple[str | None, float, float]] = {}
+        self._last_sweep = 0.0
+
+    # ── Wiring ──
+
+    def register_game(self, game_type: str, starter: RoundStarter) -> None:
+        """Register the coroutine used to start chained rounds of a game."""
+        self._starters[game_type] = starter
+
+    def attach(self, app: Application) -> None:
+        """Run sweep() on the application's JobQueue, if it has one."""
+        if app.job_queue is None:
+            logger.warning("JobQueue unavailable — game rounds are swept on incoming updates only")
+            return
+        app.job_queue.run_repeating(
+            self._sweep_job, interval=SWEEP_INTERVAL, first=SWEEP_INTERVAL, name="game_round_sweep",
+        )
+
+    # ── Rounds ──
+
+    def open_round(
+        self, game_type: str, chat_id: int, answer: str, timeout: int, rounds_left: int = 0,
+    ) -> None:
+        """Store a new round's answer and deadline (replacing any running round)."""
+        deadline = time.time() + timeout
+        member = _member(game_type, chat_id)
+        pipe = self.redis.client.pipeline()
+        pipe.set(game_key(game_type, chat_id), answer, ex=timeout + KEY_GRACE)
+        pipe.zadd(_DEADLINES_KEY, {member: deadline})
+        if rounds_left > 0:
+            pipe.hset(_CHAIN_KEY, member, rounds_left)
+        else:
+            pipe.hdel(_CHAIN_KEY, member)
+        pipe.execute()
+        self._remember(game_type, chat_id, answer, deadline)
+
+    def get_answer(self, game_type: str, chat_id: int) -> str | None:
+        """Return the running round's answer, or None if there is no live round."""
+        now = time.time()
+        cached = self._cache.get((game_type, chat_id))
+        if cached is not None:
+            answer, deadline, cached_at = cached
+            if answer is not None and deadline <= now:
+                return None
+            if now - cached_at < CACHE_TTL:
+                return answer
+
+        pipe = self.redis.client.pipeline(transaction=False)
+        pipe.get(game_key(game_type, chat_id))
+        pipe.zscore(_DEADLINES_KEY, _member(game_type, chat_id))
+        answer, deadline = pipe.execute()
+        if answer is None or deadline is None or deadline <= now:
+            self._remember(game_type, chat_id, None, 0.0)
+            return None
+        self._remember(game_type, chat_id, answer, deadline)
+        return answer
+
+    def close_round(self, game_type: str, chat_id: int) -> tuple[bool, int]:
+        """Close a round on a correct answer.
+
+        Returns (closed, rounds_left). ``closed`` is False when another worker
+        or the sweep already closed it, so only one winner is ever awarded.
+        """
+        member = _member(game_type, chat_id)
+        pipe = self.redis.client.pipeline()
+        pipe.delete(game_key(game_type, chat_id))
+        pipe.zrem(_DEADLINES_KEY, member)
+        pipe.hget(_CHAIN_KEY, member)
+        pipe.hdel(_CHAIN_KEY, member)
+        deleted, _, rounds_left, _ = pipe.execute()
+        self._remember(game_type, chat_id, None, 0.0)
+        return bool(deleted), int(rounds_left or 0) if deleted else 0
+
+    async def start_next(self, bot: Bot, game_type: str, chat_id: int, rounds_left: int) -> None:
+        """Start the next round of a chain (rounds_left counts this new round)."""
+        starter = self._starters.get(game_type)
+        if starter is None or rounds_left <= 0:
+            return
+        try:
+            await starter(bot, chat_id, rounds_left - 1)
+        except TelegramError as e:
+            logger.warning("Failed to chain %s round in %s: %s", game_type, chat_id, e)
+
+    # ── Sweeping ──
+
+    async def sweep(self, bot: Bot) -> int:
+        """Close every overdue round. Returns how many rounds this worker closed."""
+        now = time.time()
+        self._last_sweep = now
+        self._evict_expired(now)
+        due = self.redis.client.zrangebyscore(_DEADLINES_KEY, "-inf", now)
+        closed = 0
+        for member in due:
+            # ZREM is the claim: only one worker gets 1 back
+            if not self.redis.client.zrem(_DEADLINES_KEY, member):
+                continue
+            game_type, _, chat_str = member.partition(":")
+            chat_id = int(chat_str)
+            pipe = self.redis.client.pipeline()
+            pipe.get(game_key(game_type, chat_id))
+            pipe.delete(game_key(game_type, chat_id))
+            pipe.hget(_CHAIN_KEY, member)
+            pipe.hdel(_CHAIN_KEY, member)
+            answer, _, rounds_left, _ = pipe.execute()
+            self._remember(game_type, chat_id, None, 0.0)
+            if answer is None:
+                continue
+            closed += 1
+            try:
+                await bot.send_message(chat_id, MSG_ROUND_TIMEOUT.format(answer=answer))
+            except TelegramError as e:
+                logger.warning("Failed to announce %s timeout in %s: %s", game_type, chat_id, e)
+                continue
+            await self.start_next(bot, game_type, chat_id, int(rounds_left or 0))
+        return closed
+
+    async def maybe_sweep(self, bot: Bot) -> None:
+        """Sweep if no sweep ran in this process for SWEEP_INTERVAL seconds.
+
+        Used where no JobQueue is running (serverless webhook).
+        """
+        if time.time() - self._last_sweep >= SWEEP_INTERVAL:
+            await self.sweep(bot)
+
+    async def _sweep_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        try:
+            await self.sweep(context.bot)
+        except Exception as e:
+            logger.error("Game round sweep failed: %s", e, exc_info=True)
+
+    # ── Local cache ──
+
+    def _remember(self, game_type: str, chat_id: int, answer: str | None, deadline: float) -> None:
+        if len(self._cache) >= CACHE_MAX_ENTRIES:
+            self._evict_expired(time.time())
+            if len(self._cache) >= CACHE_MAX_ENTRIES:
+                self._cache.clear()
+        self._cache[(game_type, chat_id)] = (answer, deadline, time.time())
+
+    def _evict_expired(self, now: float) -> None:
+        stale = [
+            slot for slot, (answer, deadline, cached_at) in self._cache.items()
+            if (answer is not None and deadline <= now) or now - cached_at >= CACHE_TTL
+        ]
+        for slot in stale:
+            del self._cache[slot]
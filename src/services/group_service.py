@@ -8,11 +8,13 @@ import json
 import logging
 
 from src.models.group import Group, GroupSettings
+from src.services import change_journal
 from src.services.redis_service import RedisService
 
 logger = logging.getLogger(__name__)
 
 _PREFIX = "bot:group:"
+BOT_ADMIN_TTL = 6 * 3600   # bot admin status cache; my_chat_member updates refresh it sooner
 
 
 class GroupService:
@@ -90,10 +92,16 @@ class GroupService:
         return self.redis.scard("bot:groups")
 
     def remove_group(self, chat_id: int) -> None:
-        self.redis.srem("bot:groups", str(chat_id))
-        self.redis.delete(self._group_key(chat_id))
-        self.redis.delete(self._settings_key(chat_id))
-        self.redis.delete(self._locks_key(chat_id))
+        pipe = self.redis.client.pipeline(transaction=False)
+        change_journal.mark(pipe, self.queue_removal(pipe, chat_id))
+        pipe.execute()
+
+    def queue_removal(self, pipe, chat_id: int) -> list[str]:
+        """Queue remove_group's writes onto pipe; returns the keys touched."""
+        keys = [self._group_key(chat_id), self._settings_key(chat_id), self._locks_key(chat_id)]
+        pipe.srem("bot:groups", str(chat_id))
+        pipe.delete(*keys, self._bot_admin_key(chat_id))
+        return ["bot:groups", *keys]
 
     # ── Settings ──
 
@@ -194,6 +202,22 @@ class GroupService:
         val = self.redis.get(f"{_PREFIX}{chat_id}:flood:{user_id}")
         return int(val) if val else 0
 
+    # ── Bot admin status (cache) ──
+
+    def _bot_admin_key(self, chat_id: int) -> str:
+        return f"cache:bot_admin:{chat_id}"
+
+    def get_bot_admin(self, chat_id: int) -> bool | None:
+        """Cached 'bot is admin in chat_id'; None when unknown."""
+        val = self.redis.get(self._bot_admin_key(chat_id))
+        return None if val is None else val == "1"
+
+    def set_bot_admin(self, chat_id: int, is_admin: bool) -> None:
+        self.redis.set(self._bot_admin_key(chat_id), "1" if is_admin else "0", ex=BOT_ADMIN_TTL)
+
+    def forget_bot_admin(self, chat_id: int) -> None:
+        self.redis.delete(self._bot_admin_key(chat_id))
+
     # ── Statistics ──
 
     def increment_total_messages(self) -> int:
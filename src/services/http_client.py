@@ -0,0 +1,57 @@
+"""
+HTTP client — one pooled httpx.AsyncClient shared by every handler.
+
+Opening a client per request pays DNS, TCP and TLS setup on every call;
+the shared client keeps connections alive between requests instead.
+httpx clients are bound to the event loop they were first used on, so
+the client is created lazily and recreated if the loop changes (a fresh
+loop per serverless invocation). Call aclose() when the application stops.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10.0
+
+
+class HttpClient:
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_connections: int = 20, max_keepalive: int = 10) -> None:
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # A client from a previous loop can't be closed from this one; let it go
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._loop = loop
+        return self._client
+
+    async def get_json(self, url: str, params: dict | None = None) -> Any | None:
+        """GET url and decode the JSON body; None on any error or non-200 status."""
+        try:
+            response = await self.client.get(url, params=params)
+            if response.status_code != 200:
+                return None
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"HTTP GET {url} failed: {e}")
+            return None
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+http_client = HttpClient()
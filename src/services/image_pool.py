@@ -0,0 +1,108 @@
+"""
+Image pool — runs CPU-heavy image work in worker processes.
+
+Decoding, drawing and encoding a photo holds the GIL for tens to hundreds
+of milliseconds; done on the event loop it stalls every chat the process
+serves. ImagePool sends that work to a ProcessPoolExecutor and bounds it
+twice:
+  * at most ``max_pending`` jobs are queued or running at once; further
+    callers wait their turn on a semaphore instead of piling up in the pool
+  * one chat can have at most ``per_chat`` jobs in flight; extra requests
+    are refused with ImagePoolBusy, so a single chat can't starve the rest
+
+The pool starts on first use. Call shutdown() when the application stops.
+
+Serverless runtimes (Vercel, AWS Lambda) can't start worker processes: there
+is no /dev/shm for the pool's queues. There, or whenever the process pool
+fails to start, jobs run in threads with asyncio.to_thread instead. Pillow
+releases the GIL for most of its work, so threads still keep the event loop
+responsive; the same bounds apply.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from src.config import Config
+from src.utils.image_ops import warm_up
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SERVERLESS = bool(os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+
+
+class ImagePoolBusy(Exception):
+    """The chat already has its maximum number of image jobs running."""
+
+
+class ImagePool:
+    """Bounded process pool with per-chat concurrency limits."""
+
+    def __init__(self, workers: int | None = None, per_chat: int = 1, max_pending: int | None = None,
+                 processes: bool | None = None) -> None:
+        self.workers = workers or Config.PHOTO_WORKERS or min(4, os.cpu_count() or 1)
+        self.per_chat = per_chat
+        self.max_pending = max_pending or self.workers * 4
+        # None: worker processes unless running serverless
+        self.processes = not SERVERLESS if processes is None else processes
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._in_flight: dict[int, int] = {}
+
+    def _ensure_started(self) -> None:
+        if self._slots is not None:
+            return
+        self._slots = asyncio.Semaphore(self.max_pending)
+        if self.processes:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up)
+            except (OSError, NotImplementedError) as e:
+                self._use_threads(e)
+
+    def _use_threads(self, error: Exception) -> None:
+        logger.warning("Process pool unavailable (%s); running image jobs in threads", error)
+        self.processes = False
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, chat_id: int, func: Callable[..., T], *args: Any) -> T:
+        """Run func(*args) in a worker process (or thread) on behalf of chat_id.
+
+        func and its arguments must be picklable (module-level function, bytes).
+        Raises ImagePoolBusy if chat_id is at its limit.
+        """
+        if self._in_flight.get(chat_id, 0) >= self.per_chat:
+            raise ImagePoolBusy(chat_id)
+        self._ensure_started()
+        self._in_flight[chat_id] = self._in_flight.get(chat_id, 0) + 1
+        try:
+            async with self._slots:
+                if self._executor is not None:
+                    loop = asyncio.get_running_loop()
+                    try:
+                        # Workers are spawned on submit, so startup can fail here too
+                        future = loop.run_in_executor(self._executor, partial(func, *args))
+                    except (OSError, NotImplementedError) as e:
+                        self._use_threads(e)
+                    else:
+                        return await future
+                return await asyncio.to_thread(func, *args)
+        finally:
+            remaining = self._in_flight[chat_id] - 1
+            if remaining:
+                self._in_flight[chat_id] = remaining
+            else:
+                del self._in_flight[chat_id]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._slots = None
@@ -0,0 +1,99 @@
+"""
+Media cache — send static media by Telegram file_id after the first upload.
+
+Sending a photo by URL makes Telegram fetch it again on every send, and a
+local path is re-uploaded every time. MediaCache sends by source once,
+keeps the file_id Telegram returns (keyed by media kind and source URL or
+path) and sends by file_id from then on:
+  * ``media:file:{kind}:{sha1(source)}`` in Redis, shared by every process
+  * a small in-process dict in front of it, so hot sends skip Redis too
+
+A file_id Telegram rejects is forgotten and the send is retried by source.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any
+
+from telegram import Bot, Message
+from telegram.error import BadRequest
+
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger(__name__)
+
+FILE_ID_TTL = 30 * 24 * 3600   # refreshed by a plain send once a month
+
+# kind → (Bot method, Message attribute holding the sent media)
+_KINDS = {
+    "photo": ("send_photo", "photo"),
+    "video": ("send_video", "video"),
+    "audio": ("send_audio", "audio"),
+    "animation": ("send_animation", "animation"),
+    "document": ("send_document", "document"),
+}
+
+
+def _sent_file_id(message: Message, kind: str) -> str | None:
+    media = getattr(message, _KINDS[kind][1])
+    if kind == "photo":
+        media = media[-1] if media else None  # largest size
+    return media.file_id if media else None
+
+
+class MediaCache:
+    def __init__(self) -> None:
+        self.redis = RedisService()
+        self._local: dict[str, str] = {}
+
+    def _key(self, kind: str, source: str | Path) -> str:
+        digest = hashlib.sha1(str(source).encode()).hexdigest()
+        return f"media:file:{kind}:{digest}"
+
+    def get(self, kind: str, source: str | Path) -> str | None:
+        key = self._key(kind, source)
+        file_id = self._local.get(key)
+        if file_id is None:
+            file_id = self.redis.get(key)
+            if file_id:
+                self._local[key] = file_id
+        return file_id
+
+    def remember(self, kind: str, source: str | Path, file_id: str) -> None:
+        key = self._key(kind, source)
+        self._local[key] = file_id
+        self.redis.set(key, file_id, ex=FILE_ID_TTL)
+
+    def forget(self, kind: str, source: str | Path) -> None:
+        key = self._key(kind, source)
+        self._local.pop(key, None)
+        self.redis.delete(key)
+
+    async def send(self, bot: Bot, kind: str, chat_id: int, source: str | Path, **kwargs: Any) -> Message:
+        """Send media from source (URL or local path), by cached file_id when known.
+
+        Extra keyword arguments go to the Bot method (caption, reply_markup, ...).
+        """
+        method = getattr(bot, _KINDS[kind][0])
+        file_id = self.get(kind, source)
+        if file_id:
+            try:
+                return await method(chat_id, file_id, **kwargs)
+            except BadRequest as e:
+                logger.warning("Cached %s file_id for %s rejected: %s", kind, source, e)
+                self.forget(kind, source)
+
+        if isinstance(source, Path):
+            with open(source, "rb") as f:
+                message = await method(chat_id, f, **kwargs)
+        else:
+            message = await method(chat_id, source, **kwargs)
+        file_id = _sent_file_id(message, kind)
+        if file_id:
+            self.remember(kind, source, file_id)
+        return message
+
+
+media_cache = MediaCache()
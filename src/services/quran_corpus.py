@@ -0,0 +1,282 @@
+"""
+Quran corpus — offline verse text, tafsir and search from a local file.
+
+data/quran_corpus.bin is optional. When present, Quran search and tafsir
+lookups are answered in-process and the remote API is only a fallback.
+Build it once (it is not generated at runtime):
+
+    python -m src.services.quran_corpus build                  # download
+    python -m src.services.quran_corpus build --from-dir dumps # offline
+
+Each edition (the Quran text plus any tafsir editions) comes from an
+alquran.cloud ``/quran/{edition}`` response.
+
+The file is memory-mapped on first use and never parsed up front: every
+section is a string table (u32 count, count + 1 u32 offsets, then a blob)
+read in place with struct.unpack_from. Sections, in order:
+  * verse refs   — u16 surah, u16 ayah per verse, in mushaf order
+  * surah names, edition names, then one text table per edition
+  * tokens       — normalized Arabic words, sorted, for binary search
+  * postings     — per token, the ascending u16 verse numbers containing it
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import mmap
+import re
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable
+
+CORPUS_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "quran_corpus.bin"
+QURAN_API = "https://api.alquran.cloud/v1"
+
+TEXT_EDITION = "quran-simple"
+TAFSIR_EDITIONS = ("ar.muyassar", "ar.jalalayn")
+
+MAGIC = b"QCORPUS1"
+_HEADER = struct.Struct("<8sIII5Q")   # magic, verses, surahs, editions, 5 section offsets
+_U32 = struct.Struct("<I")
+_REF = struct.Struct("<HH")
+_MAX_CHAR = "\U0010ffff"
+
+# ── Arabic normalization ──
+
+# Tashkeel, superscript alef, Quranic annotation marks, tatweel
+_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_LETTER_FORMS = str.maketrans({
+    "\u0623": "\u0627", "\u0625": "\u0627", "\u0622": "\u0627", "\u0671": "\u0627",  # أ إ آ ٱ → ا
+    "\u0649": "\u064a", "\u0626": "\u064a",                                       # ى ئ → ي
+    "\u0624": "\u0648",                                                           # ؤ → و
+    "\u0629": "\u0647",                                                           # ة → ه
+})
+_WORD = re.compile(r"\w+")
+
+
+def normalize_arabic(text: str) -> str:
+    """Strip diacritics and unify letter variants so spelling differences still match."""
+    return _DIACRITICS.sub("", text).translate(_LETTER_FORMS).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(normalize_arabic(text))
+
+
+# ── Reading ──
+
+class _StringTable:
+    """A string table read in place from the mapped file."""
+
+    def __init__(self, buf: mmap.mmap, offset: int) -> None:
+        self.buf = buf
+        (self.count,) = _U32.unpack_from(buf, offset)
+        self._offsets = offset + 4
+        self._blob = self._offsets + 4 * (self.count + 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def raw(self, i: int) -> bytes:
+        start, end = struct.unpack_from("<II", self.buf, self._offsets + 4 * i)
+        return self.buf[self._blob + start:self._blob + end]
+
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode("utf-8")
+
+
+class QuranCorpus:
+    def __init__(self, path: Path = CORPUS_PATH) -> None:
+        self.path = Path(path)
+        self._buf: mmap.mmap | None = None
+
+    def available(self) -> bool:
+        return self._buf is not None or self.path.exists()
+
+    def _load(self) -> None:
+        if self._buf is not None:
+            return
+        with open(self.path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_verses, n_surahs, n_editions, refs, surahs, editions, tokens, postings = _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            buf.close()
+            raise ValueError(f"{self.path} is not a Quran corpus file")
+        self._n_verses = n_verses
+        self._refs = refs
+        self._surah_names = _StringTable(buf, surahs)
+        names = _StringTable(buf, editions)
+        edition_offsets = struct.unpack_from(f"<{n_editions}Q", buf, _HEADER.size)
+        self._editions = {names[i]: _StringTable(buf, off) for i, off in enumerate(edition_offsets)}
+        self._tokens = _StringTable(buf, tokens)
+        self._postings = _StringTable(buf, postings)
+        # First verse number of each surah, so (surah, ayah) → verse is one addition
+        self._surah_start = [0] * (n_surahs + 2)
+        for verse in range(n_verses - 1, -1, -1):
+            surah, _ = _REF.unpack_from(buf, refs + 4 * verse)
+            self._surah_start[surah] = verse
+        self._surah_start[n_surahs + 1] = n_verses
+        self._buf = buf
+
+    def close(self) -> None:
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+
+    # ── Lookups ──
+
+    def ref(self, verse: int) -> tuple[int, int]:
+        self._load()
+        return _REF.unpack_from(self._buf, self._refs + 4 * verse)
+
+    def surahs(self) -> list[tuple[str, int]]:
+        """[(name, ayah count), ...] in mushaf order."""
+        self._load()
+        starts = self._surah_start
+        return [(self._surah_names[i], starts[i + 2] - starts[i + 1]) for i in range(len(self._surah_names))]
+
+    def has_edition(self, edition: str) -> bool:
+        self._load()
+        return edition in self._editions
+
+    def text(self, surah: int, ayah: int, edition: str = TEXT_EDITION) -> str | None:
+        """Verse text in edition, or None if the edition or the verse isn't in the corpus."""
+        self._load()
+        table = self._editions.get(edition)
+        if table is None or not 1 <= surah < len(self._surah_start) - 1:
+            return None
+        verse = self._surah_start[surah] + ayah - 1
+        if ayah < 1 or verse >= self._surah_start[surah + 1]:
+            return None
+        return table[verse]
+
+    def _postings_for(self, token: str, prefix: bool) -> set[int]:
+        lo = bisect.bisect_left(self._tokens, token)
+        hi = bisect.bisect_left(self._tokens, token + _MAX_CHAR, lo) if prefix else lo + 1
+        verses: set[int] = set()
+        for i in range(lo, min(hi, len(self._tokens))):
+            if not prefix and self._tokens[i] != token:
+                break
+            raw = self._postings.raw(i)
+            verses.update(struct.unpack(f"<{len(raw) // 2}H", raw))
+        return verses
+
+    def search(self, query: str, limit: int | None = None) -> list[tuple[int, int]]:
+        """[(surah, ayah), ...] of verses containing every word of query, in mushaf order.
+
+        The last word also matches as a prefix, so a partly typed word still finds verses.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        self._load()
+        verses: set[int] | None = None
+        for i, word in enumerate(words):
+            found = self._postings_for(word, prefix=i == len(words) - 1)
+            verses = found if verses is None else verses & found
+            if not verses:
+                return []
+        return [self.ref(v) for v in sorted(verses)[:limit]]
+
+
+# ── Building ──
+
+def _string_table(items: Iterable[bytes]) -> bytes:
+    items = list(items)
+    offsets = [0]
+    for item in items:
+        offsets.append(offsets[-1] + len(item))
+    return _U32.pack(len(items)) + struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(items)
+
+
+def build_corpus(path: Path, surahs: list[tuple[str, list[str]]], editions: dict[str, list[list[str]]]) -> int:
+    """Write a corpus file. Returns the number of verses.
+
+    surahs is [(name, [verse text, ...]), ...] in mushaf order and is indexed
+    for search; editions maps extra edition names (tafsir) to the same shape
+    of texts. The surah verse texts are stored as TEXT_EDITION.
+    """
+    refs: list[tuple[int, int]] = []
+    index: dict[str, list[int]] = {}
+    for surah, (_, verses) in enumerate(surahs, 1):
+        for ayah, text in enumerate(verses, 1):
+            verse = len(refs)
+            refs.append((surah, ayah))
+            for token in dict.fromkeys(tokenize(text)):
+                index.setdefault(token, []).append(verse)
+    if len(refs) > 0xFFFF:
+        raise ValueError("too many verses for u16 postings")
+
+    all_editions = {TEXT_EDITION: [verses for _, verses in surahs], **editions}
+    for name, texts in all_editions.items():
+        if [len(v) for v in texts] != [len(v) for _, v in surahs]:
+            raise ValueError(f"edition {name} does not match the verse layout")
+    tokens = sorted(index)
+
+    sections = [
+        b"".join(_REF.pack(*ref) for ref in refs),
+        _string_table(name.encode() for name, _ in surahs),
+        _string_table(name.encode() for name in all_editions),
+        _string_table(token.encode() for token in tokens),
+        _string_table(struct.pack(f"<{len(index[t])}H", *index[t]) for t in tokens),
+    ]
+    edition_tables = [
+        _string_table(text.encode() for verses in texts for text in verses)
+        for texts in all_editions.values()
+    ]
+
+    offset = _HEADER.size + 8 * len(all_editions)
+    offsets = []
+    for section in sections + edition_tables:
+        offsets.append(offset)
+        offset += len(section)
+    header = _HEADER.pack(MAGIC, len(refs), len(surahs), len(all_editions), *offsets[:5])
+
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(struct.pack(f"<{len(edition_tables)}Q", *offsets[5:]))
+        for section in sections + edition_tables:
+            f.write(section)
+    tmp.replace(path)
+    return len(refs)
+
+
+def _parse_edition(data: dict) -> list[tuple[str, list[str]]]:
+    """alquran.cloud /quran/{edition} response → [(surah name, [verse texts])]."""
+    return [
+        (surah["name"], [ayah["text"] for ayah in sorted(surah["ayahs"], key=lambda a: a["numberInSurah"])])
+        for surah in sorted(data["data"]["surahs"], key=lambda s: s["number"])
+    ]
+
+
+def _load_edition(edition: str, from_dir: Path | None) -> list[tuple[str, list[str]]]:
+    if from_dir is not None:
+        with open(from_dir / f"{edition}.json", encoding="utf-8") as f:
+            return _parse_edition(json.load(f))
+    import httpx  # only the builder goes to the network
+    response = httpx.get(f"{QURAN_API}/quran/{edition}", timeout=60)
+    response.raise_for_status()
+    return _parse_edition(response.json())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.services.quran_corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build the corpus file")
+    build.add_argument("--output", type=Path, default=CORPUS_PATH)
+    build.add_argument("--from-dir", type=Path, help="read {edition}.json dumps instead of downloading")
+    build.add_argument("--tafsir", nargs="*", default=list(TAFSIR_EDITIONS), help="tafsir editions to include")
+    args = parser.parse_args(argv)
+
+    surahs = _load_edition(TEXT_EDITION, args.from_dir)
+    editions = {name: [v for _, v in _load_edition(name, args.from_dir)] for name in args.tafsir}
+    count = build_corpus(args.output, surahs, editions)
+    print(f"{args.output}: {count} verses, {len(surahs)} surahs, editions: {TEXT_EDITION} {' '.join(editions)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Rate limiter — pace bulk Telegram API calls below the flood limits.
+
+Telegram allows roughly 30 requests per second per bot before it starts
+answering with ``RetryAfter`` (HTTP 429). Bulk jobs (sweeps, global bans)
+share one token bucket so their combined rate stays under that, however
+many workers they run. A ``RetryAfter`` is a bot-wide penalty, so it pauses
+every caller of the limiter, not only the worker that received it.
+
+The bucket is plain arithmetic over the monotonic clock, with no asyncio
+primitives, so it works across event loops (serverless invocations).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from telegram.error import RetryAfter
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int | None = None, max_retries: int = 3) -> None:
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.max_retries = max_retries
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+
+    async def acquire(self) -> None:
+        """Wait for a request slot."""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            # Reserve the token even if it isn't there yet: concurrent callers
+            # queue up behind each other without a lock
+            self._tokens -= 1
+            if self._tokens < 0:
+                await asyncio.sleep(-self._tokens / self.rate)
+            return
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for seconds (a flood wait from Telegram)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def call(self, method: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """await method(*args, **kwargs) within the rate, retrying on RetryAfter."""
+        for attempt in range(self.max_retries + 1):
+            await self.acquire()
+            try:
+                return await method(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning("Flood wait: pausing bulk API calls for %ss", e.retry_after)
+                self.pause(e.retry_after)
+
+
+api_limiter = RateLimiter(Config.API_RATE_LIMIT)
@@ -6,11 +6,12 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+from typing import Any, Callable
 
 import redis
 
 from src.config import Config
+from src.services import change_journal
 
 logger = logging.getLogger(__name__)
 
@@ -46,30 +47,48 @@ class RedisService:
     def client(self) -> redis.Redis:
         return redis.Redis(connection_pool=self._pool)
 
+    # ── Change journal ──
+
+    def _write(self, key: str, command: Callable[[Any], Any]) -> Any:
+        """Run command(client) and journal key in the same round trip (see change_journal)."""
+        if not change_journal.tracks(key):
+            return command(self.client)
+        pipe = self.client.pipeline(transaction=False)
+        command(pipe)
+        change_journal.mark(pipe, (key,))
+        return pipe.execute()[0]
+
+    def mark_changed(self, *keys: str) -> None:
+        """Journal keys written through the raw client (Lua scripts, bulk pipelines)."""
+        pipe = self.client.pipeline(transaction=False)
+        change_journal.mark(pipe, keys)
+        if len(pipe):
+            pipe.execute()
+
     # ── Primitive helpers ──
 
     def get(self, key: str) -> str | None:
         return self.client.get(key)
 
     def set(self, key: str, value: str, ex: int | None = None) -> None:
-        self.client.set(key, value, ex=ex)
+        self._write(key, lambda c: c.set(key, value, ex=ex))
 
     def delete(self, key: str) -> None:
-        self.client.delete(key)
+        self._write(key, lambda c: c.delete(key))
 
     def exists(self, key: str) -> bool:
         return bool(self.client.exists(key))
 
     def incr(self, key: str) -> int:
-        return self.client.incr(key)
+        return self._write(key, lambda c: c.incr(key))
 
     def decr(self, key: str) -> int:
-        return self.client.decr(key)
+        return self._write(key, lambda c: c.decr(key))
 
     # ── Hash helpers ──
 
     def hset(self, name: str, key: str, value: str) -> None:
-        self.client.hset(name, key, value)
+        self._write(name, lambda c: c.hset(name, key, value))
 
     def hget(self, name: str, key: str) -> str | None:
         return self.client.hget(name, key)
@@ -78,7 +97,7 @@ class RedisService:
         return self.client.hgetall(name)
 
     def hdel(self, name: str, key: str) -> None:
-        self.client.hdel(name, key)
+        self._write(name, lambda c: c.hdel(name, key))
 
     def hkeys(self, name: str) -> list[str]:
         return self.client.hkeys(name)
@@ -86,10 +105,10 @@ class RedisService:
     # ── Set helpers ──
 
     def sadd(self, name: str, *values: str) -> None:
-        self.client.sadd(name, *values)
+        self._write(name, lambda c: c.sadd(name, *values))
 
     def srem(self, name: str, *values: str) -> None:
-        self.client.srem(name, *values)
+        self._write(name, lambda c: c.srem(name, *values))
 
     def smembers(self, name: str) -> set[str]:
         return self.client.smembers(name)
@@ -103,7 +122,8 @@ class RedisService:
     # ── JSON helpers ──
 
     def set_json(self, key: str, data: Any) -> None:
-        self.client.set(key, json.dumps(data, ensure_ascii=False))
+        raw = json.dumps(data, ensure_ascii=False)
+        self._write(key, lambda c: c.set(key, raw))
 
     def get_json(self, key: str) -> Any | None:
         raw = self.client.get(key)
@@ -123,5 +143,7 @@ class RedisService:
         """Delete all keys matching a pattern. Returns count deleted."""
         keys = self.client.keys(pattern)
         if keys:
-            return self.client.delete(*keys)
+            deleted = self.client.delete(*keys)
+            self.mark_changed(*keys)
+            return deleted
         return 0
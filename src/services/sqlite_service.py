@@ -0,0 +1,123 @@
+"""
+SQLite service — shared, tuned connections to the bot's SQLite files.
+
+One SqliteService exists per database path. It keeps one connection per
+thread (SQLite connections must not cross threads) configured with:
+  * WAL journaling, so readers never block behind the writer
+  * synchronous=NORMAL, which is durable across crashes of the process in
+    WAL mode and skips an fsync per commit
+  * a large prepared-statement cache — the same few queries run constantly
+
+Async handlers must not block the event loop on disk I/O: they await
+``run(func, *args)``, which calls func on the database's single executor
+thread. Keeping all async work on one thread also serialises writers, which
+is what SQLite wants anyway.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BUSY_TIMEOUT_MS = 10_000
+STATEMENT_CACHE_SIZE = 256
+
+
+class SqliteService:
+    """Per-path singleton wrapping thread-local SQLite connections."""
+
+    _instances: dict[str, "SqliteService"] = {}
+    _instances_lock = threading.Lock()
+
+    def __new__(cls, path: str) -> "SqliteService":
+        with cls._instances_lock:
+            instance = cls._instances.get(path)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance.path = path
+                instance._local = threading.local()
+                instance._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=f"sqlite:{path}",
+                )
+                cls._instances[path] = instance
+            return instance
+
+    # ── Connections ──
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection (opened and tuned on first use)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: autocommit, transactions are explicit
+            conn = sqlite3.connect(
+                self.path, isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE … COMMIT, rolled back if the block raises.
+
+        Nested use joins the outer transaction.
+        """
+        conn = self.conn
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ── Statement helpers ──
+
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
+        return self.conn.execute(sql, tuple(params))
+
+    def executemany(self, sql: str, rows: Iterable[Iterable[Any]]) -> int:
+        """Run sql once per row inside one transaction. Returns rows changed."""
+        with self.transaction() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+    def executescript(self, script: str) -> None:
+        self.conn.executescript(script)
+
+    def fetchone(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Row | None:
+        return self.conn.execute(sql, tuple(params)).fetchone()
+
+    def fetchall(self, sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
+        return self.conn.execute(sql, tuple(params)).fetchall()
+
+    # ── Async access ──
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await func(*args, **kwargs) on the database's executor thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
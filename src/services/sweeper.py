@@ -0,0 +1,48 @@
+"""
+Sweeper — resumable, rate-limited passes that drop stale records.
+
+A sweep checks every item of a snapshot against Telegram (is the group
+still reachable, is the user still a member) and deletes the records of
+the items that are gone. Checks run through the shared rate limiter
+(which also absorbs ``RetryAfter``); a batch's deletions and their
+journal marks are committed with the batch's checkpoint (see batch_job).
+"""
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+
+from src.services import change_journal
+from src.services.batch_job import BatchJob
+from src.services.rate_limiter import RateLimiter, api_limiter
+
+# check(item) -> True to keep the item, False to remove it. Raising counts
+# the item as failed (kept, e.g. a network error), not as gone
+SweepCheck = Callable[[str], Awaitable[bool]]
+# remove(pipe, item) queues the item's deletions and returns the keys touched
+SweepRemove = Callable[[Any, str], list[str]]
+
+KEPT = "kept"
+REMOVED = "removed"
+
+
+class Sweep(BatchJob):
+    prefix = "sweep"
+
+    def __init__(self, name: str, check: SweepCheck, remove: SweepRemove, *,
+                 concurrency: int = 8, batch_size: int = 200,
+                 limiter: RateLimiter = api_limiter) -> None:
+        super().__init__(name, concurrency=concurrency, batch_size=batch_size)
+        self.check = check
+        self.remove = remove
+        self.limiter = limiter
+
+    async def process(self, item: str) -> str:
+        # One API call per check: the limiter paces it and retries RetryAfter
+        return KEPT if await self.limiter.call(self.check, item) else REMOVED
+
+    def commit(self, pipe: Any, results: list[tuple[str, str]]) -> None:
+        touched: list[str] = []
+        for item, outcome in results:
+            if outcome == REMOVED:
+                touched.extend(self.remove(pipe, item))
+        change_journal.mark(pipe, touched)
@@ -0,0 +1,83 @@
+"""
+Update de-duplication — drop webhook redeliveries by update_id.
+
+When a response is slow, Telegram delivers the same update again. Without a
+guard the retry runs its handlers twice: a broadcast goes out twice, a
+punishment is applied twice. Each update_id is claimed once, before any
+parsing into an Update:
+  * a process-local ring of recent ids answers warm-instance retries
+    without a network round trip
+  * ``SET upd:seen:{id} NX EX`` is the shared check across instances
+
+If Redis is unreachable the guard fails open: a possible duplicate beats a
+lost update.
+"""
+from __future__ import annotations
+
+import logging
+from collections import deque
+
+import redis
+
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger(__name__)
+
+SEEN_TTL = 6 * 3600   # Telegram gives up redelivering well before this
+RING_SIZE = 4096
+
+
+class RecentIds:
+    """A bounded set: remembers the last ``size`` ids added."""
+
+    def __init__(self, size: int = RING_SIZE) -> None:
+        self._ring: deque[int] = deque(maxlen=size)
+        self._ids: set[int] = set()
+
+    def __contains__(self, update_id: int) -> bool:
+        return update_id in self._ids
+
+    def add(self, update_id: int) -> None:
+        if update_id in self._ids:
+            return
+        if len(self._ring) == self._ring.maxlen:
+            self._ids.discard(self._ring[0])
+        self._ring.append(update_id)
+        self._ids.add(update_id)
+
+    def discard(self, update_id: int) -> None:
+        if update_id in self._ids:
+            self._ids.discard(update_id)
+            self._ring.remove(update_id)
+
+
+class UpdateDedup:
+    def __init__(self) -> None:
+        self.redis = RedisService()
+        self._recent = RecentIds()
+
+    def _key(self, update_id: int) -> str:
+        return f"upd:seen:{update_id}"
+
+    def first_delivery(self, update_id: int) -> bool:
+        """Claim update_id; False if it was already delivered."""
+        if update_id in self._recent:
+            return False
+        try:
+            fresh = bool(self.redis.client.set(self._key(update_id), "1", nx=True, ex=SEEN_TTL))
+        except redis.RedisError as e:
+            logger.warning("Dedup check failed for update %s: %s", update_id, e)
+            fresh = True
+        self._recent.add(update_id)
+        return fresh
+
+    def release(self, update_id: int) -> None:
+        """Un-claim an update that was not handled, so its redelivery goes through."""
+        self._recent.discard(update_id)
+        try:
+            self.redis.client.delete(self._key(update_id))
+        except redis.RedisError as e:
+            logger.warning("Dedup release failed for update %s: %s", update_id, e)
+
+
+update_dedup = UpdateDedup()
@@ -0,0 +1,101 @@
+"""
+Update prefilter — drop updates no handler acts on, before Update.de_json.
+
+Parsing an update and offering it to every registered handler costs far
+more than a few dict lookups on the raw JSON. The webhook asks
+``update_filter.actionable(data)`` first and skips updates that can't
+lead to any action:
+  * update types nothing is registered for (``chat_member`` churn,
+    channel posts, polls, ...)
+  * group service messages (pins, title and photo changes, video chats,
+    topics, ...) in chats with no locks; joins and leaves always pass
+    (welcome, farewell, bot lock)
+  * group edits in chats without the edit lock. They only count towards
+    the user's "edits" stat, so the prefilter counts them itself.
+
+Private chats, callback queries, my_chat_member and every group message
+with content pass: commands, games and replies all key on text, and media
+feeds the locks and the media stats.
+
+The chat's interest profile (its lock set) is cached in-process for
+PROFILE_TTL seconds, so a lock added in another instance can take that
+long to be honoured here.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+from src.services.group_service import GroupService
+from src.services.user_service import UserService
+
+PROFILE_TTL = 15.0
+PROFILE_CACHE_SIZE = 10_000
+
+# Update types some handler is registered for
+HANDLED_TYPES = ("message", "edited_message", "callback_query", "my_chat_member")
+
+SERVICE_KEYS = frozenset({
+    "pinned_message", "new_chat_title", "new_chat_photo", "delete_chat_photo",
+    "group_chat_created", "supergroup_chat_created", "message_auto_delete_timer_changed",
+    "migrate_to_chat_id", "migrate_from_chat_id", "proximity_alert_triggered",
+    "video_chat_scheduled", "video_chat_started", "video_chat_ended",
+    "video_chat_participants_invited", "forum_topic_created", "forum_topic_edited",
+    "forum_topic_closed", "forum_topic_reopened", "general_forum_topic_hidden",
+    "general_forum_topic_unhidden", "write_access_allowed", "boost_added",
+    "chat_shared", "users_shared", "chat_background_set",
+})
+
+_GROUP_TYPES = ("group", "supergroup")
+
+
+class UpdateFilter:
+    def __init__(self, locks_of: Callable[[int], Any] | None = None,
+                 count_edit: Callable[[int, int], Any] | None = None) -> None:
+        self._locks_of = locks_of or GroupService().get_all_locks
+        self._count_edit = count_edit or self._increment_edits
+        self._profiles: dict[int, tuple[float, frozenset[str]]] = {}
+
+    @staticmethod
+    def _increment_edits(user_id: int, chat_id: int) -> None:
+        UserService().increment_stat(user_id, chat_id, "edits")
+
+    def locks(self, chat_id: int) -> frozenset[str]:
+        """The chat's interest profile: the features it has locked."""
+        now = time.monotonic()
+        cached = self._profiles.get(chat_id)
+        if cached and cached[0] > now:
+            return cached[1]
+        if len(self._profiles) >= PROFILE_CACHE_SIZE:
+            self._profiles.clear()
+        locks = frozenset(self._locks_of(chat_id))
+        self._profiles[chat_id] = (now + PROFILE_TTL, locks)
+        return locks
+
+    def actionable(self, data: dict) -> bool:
+        kind = next((key for key in HANDLED_TYPES if key in data), None)
+        if kind is None:
+            return False
+        if kind not in ("message", "edited_message"):
+            return True
+
+        message = data[kind]
+        chat = message.get("chat") or {}
+        if chat.get("type") not in _GROUP_TYPES:
+            return True
+        chat_id = chat.get("id")
+
+        if kind == "edited_message":
+            if "edit" in self.locks(chat_id):
+                return True
+            sender = message.get("from")
+            if sender:
+                self._count_edit(sender["id"], chat_id)
+            return False
+
+        if SERVICE_KEYS.isdisjoint(message):
+            return True
+        return bool(self.locks(chat_id))
+
+
+update_filter = UpdateFilter()
@@ -0,0 +1,104 @@
+"""
+Update lanes — process updates in order within a chat, in parallel across chats.
+
+Plain sequential processing makes every chat wait for every other chat. Fully
+concurrent processing lets two updates from one chat race: two answers to the
+same game round, or a lock change and the message it should apply to.
+ChatLaneProcessor hashes each update by chat id onto one of ``lanes`` queues:
+  * a lane runs its updates one at a time, so a chat's updates keep
+    their order
+  * lanes run in parallel, so chats on different lanes never wait for
+    each other
+  * a lane holds at most ``depth`` waiting updates; past that, intake
+    waits (backpressure) instead of buffering without bound
+
+A slow blocking handler (a download, a photo edit) holds its lane, so the
+chats that share that lane wait behind it; more lanes make that rarer.
+
+Lane workers are asyncio tasks bound to the running event loop. If the
+loop changes (a fresh loop per serverless invocation), the lanes are
+recreated.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+def lane_key(update: object) -> int:
+    """The id updates are ordered by: chat, else user, else the update itself."""
+    if isinstance(update, Update):
+        if update.effective_chat:
+            return update.effective_chat.id
+        if update.effective_user:
+            return update.effective_user.id
+        return update.update_id
+    return 0
+
+
+class ChatLaneProcessor(BaseUpdateProcessor):
+    def __init__(self, lanes: int = 16, depth: int = 64) -> None:
+        # Every queued update holds a slot: the bound covers running + waiting
+        super().__init__(max_concurrent_updates=lanes * (depth + 1))
+        self.lanes = lanes
+        self.depth = depth
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queues: list[asyncio.Queue] = []
+        self._workers: list[asyncio.Task] = []
+
+    def _ensure_lanes(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queues = [asyncio.Queue(maxsize=self.depth) for _ in range(self.lanes)]
+        self._workers = [asyncio.create_task(self._run_lane(queue)) for queue in self._queues]
+
+    async def _run_lane(self, queue: asyncio.Queue) -> None:
+        while True:
+            coroutine, future = await queue.get()
+            try:
+                if future.cancelled():
+                    coroutine.close()  # the caller gave up while it waited
+                    continue
+                # Its own task: a failure's traceback never holds the lane's frame
+                task = asyncio.create_task(coroutine)
+                try:
+                    await asyncio.wait((task,))
+                except asyncio.CancelledError:
+                    task.cancel()
+                    future.cancel()
+                    raise
+                if future.done():
+                    continue
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    future.set_exception(task.exception())
+                else:
+                    future.set_result(None)
+            finally:
+                queue.task_done()
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        self._ensure_lanes()
+        future = self._loop.create_future()
+        await self._queues[lane_key(update) % self.lanes].put((coroutine, future))
+        await future
+
+    async def initialize(self) -> None:
+        pass  # lanes start with the first update, on its event loop
+
+    async def shutdown(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        if self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
@@ -0,0 +1,88 @@
+"""
+Update stream — a Redis Stream between the webhook and the handler workers.
+
+In ingest mode (UPDATE_INGEST=stream) the webhook only validates an update
+and XADDs its raw JSON to ``updates:stream``, then answers Telegram at once.
+Worker processes (``python -m src.worker``) read the stream as members of
+one consumer group, run the handlers and XACK each entry when done:
+  * an entry a worker fails on (or that a crashed worker held) stays
+    pending; after CLAIM_IDLE_MS any worker XAUTOCLAIMs and retries it
+  * after MAX_DELIVERIES attempts the entry moves to ``updates:dead``
+    instead, so one poison update can't loop forever
+  * the stream is trimmed to about MAX_LEN entries on every XADD
+
+Delivery is at-least-once: an update retried after a partial failure runs
+its handlers again.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import redis
+
+from src.services.redis_service import RedisService
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "updates:stream"
+DEAD_KEY = "updates:dead"
+GROUP = "workers"
+MAX_LEN = 100_000
+DEAD_MAX_LEN = 10_000
+MAX_DELIVERIES = 3
+CLAIM_IDLE_MS = 60_000
+
+# (entry id, raw update JSON, deliveries so far)
+StreamEntry = tuple[str, str, int]
+
+
+def valid_update(data: Any) -> bool:
+    """Cheap shape check before an update is queued."""
+    return isinstance(data, dict) and isinstance(data.get("update_id"), int) and len(data) > 1
+
+
+class UpdateStream:
+    def __init__(self) -> None:
+        self.redis = RedisService()
+
+    def publish(self, raw: str) -> str:
+        return self.redis.client.xadd(STREAM_KEY, {"u": raw}, maxlen=MAX_LEN, approximate=True)
+
+    def ensure_group(self) -> None:
+        try:
+            self.redis.client.xgroup_create(STREAM_KEY, GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def read(self, consumer: str, count: int = 10, block_ms: int = 5000) -> list[StreamEntry]:
+        """New entries for consumer; blocks up to block_ms when there are none."""
+        reply = self.redis.client.xreadgroup(GROUP, consumer, {STREAM_KEY: ">"}, count=count, block=block_ms)
+        return [(entry_id, fields.get("u", ""), 1) for _, entries in reply or [] for entry_id, fields in entries]
+
+    def claim(self, consumer: str, count: int = 10) -> list[StreamEntry]:
+        """Take over entries left pending (failed or held by a dead worker) for a retry."""
+        client = self.redis.client
+        _, entries, *_ = client.xautoclaim(STREAM_KEY, GROUP, consumer, CLAIM_IDLE_MS, "0-0", count=count)
+        claimed = []
+        for entry_id, fields in entries:
+            if fields is None:  # trimmed away while pending
+                client.xack(STREAM_KEY, GROUP, entry_id)
+                continue
+            pending = client.xpending_range(STREAM_KEY, GROUP, min=entry_id, max=entry_id, count=1)
+            deliveries = pending[0]["times_delivered"] if pending else 1
+            claimed.append((entry_id, fields.get("u", ""), deliveries))
+        return claimed
+
+    def ack(self, entry_id: str) -> None:
+        self.redis.client.xack(STREAM_KEY, GROUP, entry_id)
+
+    def dead_letter(self, entry_id: str, raw: str) -> None:
+        pipe = self.redis.client.pipeline()
+        pipe.xadd(DEAD_KEY, {"u": raw, "id": entry_id}, maxlen=DEAD_MAX_LEN, approximate=True)
+        pipe.xack(STREAM_KEY, GROUP, entry_id)
+        pipe.execute()
+
+
+update_stream = UpdateStream()
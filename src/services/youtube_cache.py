@@ -0,0 +1,89 @@
+"""
+YouTube cache — lets repeat requests skip yt-dlp entirely.
+
+Two levels, both in Redis:
+  * ``yt:q:{hash}``      normalized search query → video ID, or "-" when the
+                         search found nothing (negative entry, short TTL)
+  * ``yt:file:{video}``  hash of Telegram file_ids per format (mp3 / mp4) plus
+                         the title, for files the bot already uploaded
+
+A request whose query and format are both cached becomes a single
+send_audio(file_id) — no search, no download, no upload. Telegram keeps
+file_ids valid indefinitely, so entries are evicted by use rather than age:
+the sorted set ``yt:lru`` scores each video by its last use, and once it
+holds more than MAX_VIDEOS the least recently used are dropped.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+
+from src.services.redis_service import RedisService
+from src.utils.text_utils import normalize_query
+
+QUERY_TTL = 30 * 24 * 3600     # query → video mappings (results drift slowly)
+NEGATIVE_TTL = 10 * 60         # "no results" — short, searches can be flaky
+MAX_VIDEOS = 5000
+
+NOT_FOUND = "-"
+
+_LRU_KEY = "yt:lru"
+
+
+class YouTubeCache:
+    def __init__(self, max_videos: int = MAX_VIDEOS) -> None:
+        self.redis = RedisService()
+        self.max_videos = max_videos
+
+    # ── Key builders ──
+
+    def _query_key(self, query: str) -> str:
+        digest = hashlib.sha1(normalize_query(query).encode()).hexdigest()
+        return f"yt:q:{digest}"
+
+    def _file_key(self, video_id: str) -> str:
+        return f"yt:file:{video_id}"
+
+    # ── Lookups ──
+
+    def lookup(self, query: str, fmt: str) -> tuple[str | None, str | None, str | None]:
+        """Return (video_id, file_id, title) for a query in one round trip.
+
+        video_id is NOT_FOUND for a cached empty search, None if unknown;
+        file_id is None unless this format was already uploaded.
+        """
+        video_id = self.redis.get(self._query_key(query))
+        if video_id is None or video_id == NOT_FOUND:
+            return video_id, None, None
+        file_id, title = self.redis.client.hmget(self._file_key(video_id), fmt, "title")
+        if file_id:
+            self.redis.client.zadd(_LRU_KEY, {video_id: time.time()})
+        return video_id, file_id, title
+
+    # ── Writes ──
+
+    def remember_query(self, query: str, video_id: str) -> None:
+        self.redis.set(self._query_key(query), video_id, ex=QUERY_TTL)
+
+    def remember_not_found(self, query: str) -> None:
+        self.redis.set(self._query_key(query), NOT_FOUND, ex=NEGATIVE_TTL)
+
+    def remember_file(self, query: str, video_id: str, fmt: str, file_id: str, title: str) -> None:
+        """Cache an uploaded file and the query that led to it, then evict past the cap."""
+        pipe = self.redis.client.pipeline()
+        pipe.set(self._query_key(query), video_id, ex=QUERY_TTL)
+        pipe.hset(self._file_key(video_id), mapping={fmt: file_id, "title": title})
+        pipe.zadd(_LRU_KEY, {video_id: time.time()})
+        pipe.zcard(_LRU_KEY)
+        size = pipe.execute()[-1]
+        if size > self.max_videos:
+            self._evict(size - self.max_videos)
+
+    def forget_file(self, video_id: str, fmt: str) -> None:
+        """Drop a file_id Telegram rejected."""
+        self.redis.client.hdel(self._file_key(video_id), fmt)
+
+    def _evict(self, count: int) -> None:
+        evicted = self.redis.client.zpopmin(_LRU_KEY, count)
+        if evicted:
+            self.redis.client.delete(*(self._file_key(video_id) for video_id, _ in evicted))
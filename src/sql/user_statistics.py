@@ -1,11 +1,12 @@
-import sqlite3
 from datetime import datetime
 
-# Initialize SQLite connection
+from src.services.sqlite_service import SqliteService
+
+db = SqliteService("bot_database.db")
+
+# Initialize SQLite tables
 def init_db():
-    conn = sqlite3.connect("bot_database.db")
-    cursor = conn.cursor()
-    cursor.execute("""
+    db.execute("""
         CREATE TABLE IF NOT EXISTS user_statistics (
             user_id INTEGER PRIMARY KEY,
             messages_sent INTEGER DEFAULT 0,
@@ -13,26 +14,17 @@ def init_db():
             last_active TIMESTAMP
         )
     """)
-    conn.commit()
-    conn.close()
 
 def log_message(user_id):
-    conn = sqlite3.connect("bot_database.db")
-    cursor = conn.cursor()
-    cursor.execute("""
+    now = datetime.now()
+    db.execute("""
         INSERT INTO user_statistics (user_id, messages_sent, last_active)
         VALUES (?, 1, ?)
         ON CONFLICT(user_id) DO UPDATE SET
             messages_sent = messages_sent + 1,
             last_active = ?
-    """, (user_id, datetime.now(), datetime.now()))
-    conn.commit()
-    conn.close()
+    """, (user_id, now, now))
 
 def get_user_statistics(user_id):
-    conn = sqlite3.connect("bot_database.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM user_statistics WHERE user_id = ?", (user_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
\ No newline at end of file
+    row = db.fetchone("SELECT * FROM user_statistics WHERE user_id = ?", (user_id,))
+    return tuple(row) if row else None
@@ -9,6 +9,21 @@ from telegram.error import TelegramError
 
 logger = logging.getLogger(__name__)
 
+MUTED_PERMISSIONS = ChatPermissions(can_send_messages=False)
+UNMUTED_PERMISSIONS = ChatPermissions(
+    can_send_messages=True,
+    can_send_photos=True,
+    can_send_videos=True,
+    can_send_video_notes=True,
+    can_send_voice_notes=True,
+    can_send_documents=True,
+    can_send_audios=True,
+    can_send_other_messages=True,
+    can_add_web_page_previews=True,
+    can_send_polls=True,
+    can_invite_users=True,
+)
+
 
 async def get_chat_member_safe(bot: Bot, chat_id: int, user_id: int) -> ChatMember | None:
     """Safely get a chat member, returning None on error."""
@@ -71,8 +86,7 @@ async def kick_member(bot: Bot, chat_id: int, user_id: int) -> bool:
 async def mute_member(bot: Bot, chat_id: int, user_id: int) -> bool:
     """Restrict a user from sending messages."""
     try:
-        perms = ChatPermissions(can_send_messages=False)
-        await bot.restrict_chat_member(chat_id, user_id, permissions=perms)
+        await bot.restrict_chat_member(chat_id, user_id, permissions=MUTED_PERMISSIONS)
         return True
     except TelegramError as e:
         logger.error(f"Failed to mute {user_id} in {chat_id}: {e}")
@@ -82,20 +96,7 @@ async def mute_member(bot: Bot, chat_id: int, user_id: int) -> bool:
 async def unmute_member(bot: Bot, chat_id: int, user_id: int) -> bool:
     """Unrestrict a user."""
     try:
-        perms = ChatPermissions(
-            can_send_messages=True,
-            can_send_photos=True,
-            can_send_videos=True,
-            can_send_video_notes=True,
-            can_send_voice_notes=True,
-            can_send_documents=True,
-            can_send_audios=True,
-            can_send_other_messages=True,
-            can_add_web_page_previews=True,
-            can_send_polls=True,
-            can_invite_users=True,
-        )
-        await bot.restrict_chat_member(chat_id, user_id, permissions=perms)
+        await bot.restrict_chat_member(chat_id, user_id, permissions=UNMUTED_PERMISSIONS)
         return True
     except TelegramError as e:
         logger.error(f"Failed to unmute {user_id} in {chat_id}: {e}")
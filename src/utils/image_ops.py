@@ -0,0 +1,122 @@
+"""
+Image operations for the photo editor.
+
+These run inside ImagePool worker processes, so they take and return
+encoded image bytes (cheap to pickle) rather than PIL images. Each worker
+loads a font once and reuses it. Inputs are downscaled to the output size
+before any drawing or filtering, and JPEG inputs are decoded at reduced
+scale with Image.draft, so a 12 MP photo never gets fully decoded.
+"""
+from __future__ import annotations
+
+import io
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+MAX_SIDE = 1280          # Telegram serves photos at most 1280 px on the long side
+JPEG_QUALITY = 90
+FONT_SIZE = 30
+
+_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+)
+
+_SEPIA_MATRIX = (
+    0.393, 0.769, 0.189, 0,
+    0.349, 0.686, 0.168, 0,
+    0.272, 0.534, 0.131, 0,
+)
+
+FILTERS = ("رمادي", "سيبيا", "معكوس")
+
+
+@lru_cache(maxsize=8)
+def get_font(size: int = FONT_SIZE) -> ImageFont.ImageFont:
+    """Load a font once per process."""
+    for path in _FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def warm_up() -> None:
+    """Worker initializer: load the font before the first job arrives."""
+    get_font()
+
+
+def load_image(data: bytes, max_side: int = MAX_SIDE) -> Image.Image:
+    """Decode image bytes, downscaled so the long side is at most max_side."""
+    img = Image.open(io.BytesIO(data))
+    # JPEG: let the decoder skip detail we'd throw away (scales by 1/2, 1/4, 1/8)
+    img.draft("RGB", (max_side, max_side))
+    img = img.convert("RGB")
+    img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    return img
+
+
+def encode_image(img: Image.Image) -> bytes:
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=JPEG_QUALITY)
+    return output.getvalue()
+
+
+def add_text_to_image(img: Image.Image, text: str) -> Image.Image:
+    """Add text to image."""
+    img_copy = img.copy()
+    draw = ImageDraw.Draw(img_copy)
+    font = get_font()
+
+    # Calculate text position (bottom center)
+    width, height = img_copy.size
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    x = (width - text_width) // 2
+    y = height - text_height - 20
+
+    # Add white background for text
+    padding = 10
+    draw.rectangle(
+        [x - padding, y - padding, x + text_width + padding, y + text_height + padding],
+        fill=(255, 255, 255, 200)
+    )
+    draw.text((x, y), text, fill=(0, 0, 0), font=font)
+    return img_copy
+
+
+def apply_sepia(img: Image.Image) -> Image.Image:
+    """Apply sepia tone filter."""
+    return img.convert("RGB").convert("RGB", _SEPIA_MATRIX)
+
+
+def apply_invert(img: Image.Image) -> Image.Image:
+    """Apply invert colors filter."""
+    return ImageOps.invert(img.convert("RGB"))
+
+
+def apply_filter(img: Image.Image, filter_type: str) -> Image.Image | None:
+    """Apply a named filter; None if the name is unknown."""
+    if "رمادي" in filter_type:
+        return img.convert("L")
+    if "سيبيا" in filter_type:
+        return apply_sepia(img)
+    if "معكوس" in filter_type:
+        return apply_invert(img)
+    return None
+
+
+# ── Worker entry points (bytes in, bytes out) ──
+
+def render_text(data: bytes, text: str) -> bytes:
+    return encode_image(add_text_to_image(load_image(data), text))
+
+
+def render_filter(data: bytes, filter_type: str) -> bytes:
+    filtered = apply_filter(load_image(data), filter_type)
+    if filtered is None:
+        raise ValueError(f"unknown filter: {filter_type}")
+    return encode_image(filtered)
@@ -72,6 +72,34 @@ def build_games_keyboard() -> InlineKeyboardMarkup:
     return build_inline_keyboard(buttons, columns=3)
 
 
+def build_blackjack_keyboard() -> InlineKeyboardMarkup:
+    """Build the hit / stand keyboard for a running blackjack hand."""
+    buttons = [
+        ("🃏 سحب", "bj:hit"),
+        ("✋ ثبات", "bj:stand"),
+    ]
+    return build_inline_keyboard(buttons, columns=2)
+
+
+def build_market_keyboard(
+    rarity: str | None,
+    first: tuple[int, int] | None,
+    last: tuple[int, int] | None,
+    has_prev: bool,
+    has_next: bool,
+) -> InlineKeyboardMarkup | None:
+    """Build the previous / next buttons for a marketplace page.
+
+    Each button carries the keyset cursor (price, id) of the page boundary.
+    """
+    buttons = []
+    if has_prev and first:
+        buttons.append(("⬅️ السابق", f"mkt:{rarity or ''}:p:{first[0]}:{first[1]}"))
+    if has_next and last:
+        buttons.append(("التالي ➡️", f"mkt:{rarity or ''}:n:{last[0]}:{last[1]}"))
+    return build_inline_keyboard(buttons, columns=2) if buttons else None
+
+
 def build_yt_keyboard(query: str) -> InlineKeyboardMarkup:
     """Build YouTube download options keyboard."""
     buttons = [
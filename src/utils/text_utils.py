@@ -4,6 +4,8 @@ Text utility functions used across the bot.
 from __future__ import annotations
 
 import re
+import unicodedata
+
 from telegram import Message, Update
 
 
@@ -120,3 +122,11 @@ def format_user_list(users: list, title: str) -> str:
         uid = getattr(user, 'user_id', '')
         lines.append(f"{i}. {name} [{uid}]")
     return "\n".join(lines)
+
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, NFKC-normalize and collapse whitespace so trivial variants share a cache key."""
+    return _SPACES.sub(" ", unicodedata.normalize("NFKC", query).casefold()).strip()
@@ -0,0 +1,134 @@
+"""
+Stream worker — runs the bot handlers over the webhook's update stream.
+
+    python -m src.worker [--name CONSUMER]
+
+Pairs with UPDATE_INGEST=stream (see services/update_stream): the webhook
+only queues updates, workers process them. Run as many workers as needed;
+the consumer group spreads updates across them. An update is acknowledged
+once its handlers ran without error; otherwise it is retried (by any
+worker) and dead-lettered after MAX_DELIVERIES attempts.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import time
+
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+
+from src.bot import build_application
+from src.services.update_stream import MAX_DELIVERIES, update_stream
+
+logger = logging.getLogger(__name__)
+
+CLAIM_INTERVAL = 30.0   # seconds between sweeps for pending entries to retry
+ERROR_BACKOFF = 5.0     # seconds to wait after a Redis error
+READ_BATCH = 50         # entries per XREADGROUP
+
+
+class StreamWorker:
+    def __init__(self, app: Application, consumer: str) -> None:
+        self.app = app
+        self.consumer = consumer
+        self._failed: set[int] = set()   # update_ids whose handlers raised
+        self._stopping = False
+        self._in_flight: set[asyncio.Task] = set()
+        app.add_error_handler(self._on_error)
+
+    async def _on_error(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
+        if isinstance(update, Update):
+            self._failed.add(update.update_id)
+        logger.error("Handler failed for update %s", getattr(update, "update_id", None), exc_info=context.error)
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    async def handle(self, entry_id: str, raw: str, deliveries: int) -> None:
+        try:
+            update = Update.de_json(json.loads(raw), self.app.bot)
+        except Exception as e:
+            logger.error("Unreadable update %s: %s", entry_id, e)
+            update_stream.dead_letter(entry_id, raw)
+            return
+
+        # Through the lanes: in order per chat, chats in parallel
+        await self.app.update_processor.process_update(update, self.app.process_update(update))
+        if update.update_id not in self._failed:
+            update_stream.ack(entry_id)
+            return
+        self._failed.discard(update.update_id)
+        if deliveries >= MAX_DELIVERIES:
+            logger.error("Update %s failed %s times, dead-lettered", update.update_id, deliveries)
+            update_stream.dead_letter(entry_id, raw)
+        # Otherwise it stays pending and is claimed again for a retry
+
+    def _dispatch(self, entry) -> None:
+        # Tasks start in stream order, so each chat's updates reach their lane in order
+        task = asyncio.create_task(self.handle(*entry))
+        self._in_flight.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("Update entry failed", exc_info=task.exception())
+
+    async def run(self) -> None:
+        await asyncio.to_thread(update_stream.ensure_group)
+        logger.info("Worker %s consuming updates", self.consumer)
+        limit = self.app.update_processor.max_concurrent_updates
+        last_claim = 0.0
+        while not self._stopping:
+            try:
+                if len(self._in_flight) >= limit:
+                    await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                entries = []
+                if time.monotonic() - last_claim >= CLAIM_INTERVAL:
+                    last_claim = time.monotonic()
+                    entries = await asyncio.to_thread(update_stream.claim, self.consumer)
+                if not entries:
+                    entries = await asyncio.to_thread(update_stream.read, self.consumer, READ_BATCH)
+                for entry in entries:
+                    self._dispatch(entry)
+            except Exception as e:
+                logger.error("Stream error: %s", e, exc_info=True)
+                await asyncio.sleep(ERROR_BACKOFF)
+        if self._in_flight:
+            await asyncio.wait(self._in_flight)
+
+
+async def _main(consumer: str) -> None:
+    app = build_application()
+    worker = StreamWorker(app, consumer)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    async with app:
+        await app.start()  # job queue (game rounds, ...)
+        try:
+            await worker.run()
+        finally:
+            await app.stop()
+    if app.post_shutdown:
+        await app.post_shutdown(app)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.worker")
+    parser.add_argument("--name", default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="consumer name (unique per worker)")
+    args = parser.parse_args()
+    asyncio.run(_main(args.name))
+
+
+if __name__ == "__main__":
+    main()
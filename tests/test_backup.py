@@ -0,0 +1,158 @@
+"""Tests for backup record validation and part reading."""
+import gzip
+import io
+import json
+import unittest
+from pathlib import Path
+
+try:
+    import fakeredis
+except ImportError:  # not a runtime dependency
+    fakeredis = None
+
+from src.services import change_journal
+from src.services.backup import BackupRestorer, SwapFailed, iter_backup_items, part_path, validate_record
+from src.services.redis_service import RedisService
+
+
+class TestValidateRecord(unittest.TestCase):
+    def test_valid_types(self):
+        records = [
+            {"key": "bot:a", "type": "string", "ttl": -1, "value": "x"},
+            {"key": "bot:b", "type": "hash", "ttl": 5000, "value": {"f": "1"}},
+            {"key": "bot:c", "type": "set", "value": ["1", "2"]},
+            {"key": "bot:d", "type": "list", "value": ["1"]},
+            {"key": "bot:e", "type": "zset", "value": [["m", 1.5]]},
+        ]
+        for record in records:
+            self.assertIsNone(validate_record(record), record)
+
+    def test_rejects_keys_outside_patterns(self):
+        self.assertIn("outside", validate_record({"key": "yt:q:abc", "type": "string", "value": "x"}))
+
+    def test_tombstone(self):
+        self.assertIsNone(validate_record({"key": "bot:a", "type": "deleted", "ttl": -2, "value": None}))
+
+    def test_rejects_bad_values(self):
+        self.assertIsNotNone(validate_record({"key": "bot:a", "type": "set", "value": []}))
+        self.assertIsNotNone(validate_record({"key": "bot:a", "type": "hash", "value": ["x"]}))
+        self.assertIsNotNone(validate_record({"key": "bot:a", "type": "zset", "value": [["m", "high"]]}))
+        self.assertIsNotNone(validate_record({"key": "bot:a", "type": "stream", "value": []}))
+        self.assertIsNotNone(validate_record({"type": "string", "value": "x"}))
+
+
+class TestIterBackupItems(unittest.TestCase):
+    def test_gzip_jsonl_part(self):
+        lines = b'{"key":"bot:a","type":"string","value":"1"}\n\n{"key":"bot:b","type":"string","value":"2"}\n'
+        items = list(iter_backup_items(io.BytesIO(gzip.compress(lines))))
+        self.assertEqual([item["key"] for item in items], ["bot:a", "bot:b"])
+
+    def test_legacy_json_export(self):
+        legacy = {"version": 1, "keys": [{"key": "bot:a", "type": "string", "value": "1"}]}
+        items = list(iter_backup_items(io.BytesIO(json.dumps(legacy).encode())))
+        self.assertEqual(items, legacy["keys"])
+
+
+class TestPartPath(unittest.TestCase):
+    def test_exporter_names(self):
+        directory = Path("/tmp/restore")
+        self.assertEqual(part_path(directory, "bo_backup_20240101_120000.part001.jsonl.gz"),
+                         directory / "bo_backup_20240101_120000.part001.jsonl.gz")
+
+    def test_rejects_paths_outside_the_directory(self):
+        for name in ("../../src/bot.py", "../x.part001.jsonl.gz", "/etc/x.part001.jsonl.gz",
+                     "sub/x.part001.jsonl.gz", "bot.py", ""):
+            with self.assertRaises(ValueError, msg=name):
+                part_path(Path("/tmp/restore"), name)
+
+
+class _FakeRedisService(RedisService):
+    def __new__(cls):
+        return object.__new__(cls)
+
+    def __init__(self):
+        self._client = fakeredis.FakeRedis(decode_responses=True)
+
+    @property
+    def client(self):
+        return self._client
+
+
+@unittest.skipUnless(fakeredis, "fakeredis not installed")
+class TestRestore(unittest.TestCase):
+    def test_clear_keeps_keys_backups_dont_carry(self):
+        redis = _FakeRedisService()
+        client = redis.client
+        client.set("bot:stale", "1")
+        client.set("bot:kept", "old")
+        client.xadd("bank:ledger", {"op": "award"})
+        client.xadd("bank:history:1", {"op": "award"})
+        client.set("bank:op:abc", "1", ex=60)
+
+        report = BackupRestorer(redis).restore(
+            [{"key": "bot:kept", "type": "string", "ttl": -1, "value": "new"}], clear_first=True,
+        )
+
+        self.assertEqual(report.removed, 1)
+        self.assertIsNone(client.get("bot:stale"))
+        self.assertEqual(client.get("bot:kept"), "new")
+        self.assertEqual(client.xlen("bank:ledger"), 1)
+        self.assertEqual(client.xlen("bank:history:1"), 1)
+        self.assertEqual(client.get("bank:op:abc"), "1")
+
+    def test_expired_staged_key_stops_before_the_swap(self):
+        redis = _FakeRedisService()
+        client = redis.client
+        client.set("bot:a", "live")
+        restorer = BackupRestorer(redis)
+        stage = restorer._stage
+
+        def stage_then_expire(batch, prefix, index):
+            stage(batch, prefix, index)
+            client.delete(prefix + "bot:b")
+
+        restorer._stage = stage_then_expire
+        records = [{"key": k, "type": "string", "ttl": -1, "value": "new"} for k in ("bot:a", "bot:b")]
+        with self.assertRaises(ValueError):
+            restorer.restore(records)
+        self.assertEqual(client.get("bot:a"), "live")
+
+    def test_swap_reports_the_failed_batch(self):
+        redis = _FakeRedisService()
+        restorer = BackupRestorer(redis, batch_size=2)
+        rename = restorer._rename
+        calls = []
+
+        def fail_second(batch, prefix):
+            calls.append(batch)
+            if len(calls) == 2:
+                raise ConnectionError("lost")
+            rename(batch, prefix)
+
+        restorer._rename = fail_second
+        records = [{"key": f"bot:{i}", "type": "string", "ttl": -1, "value": "v"} for i in range(5)]
+        with self.assertRaises(SwapFailed) as ctx:
+            restorer.restore(records)
+        self.assertEqual((ctx.exception.batch, ctx.exception.batches, ctx.exception.swapped), (2, 3, 2))
+
+        report = BackupRestorer(redis, batch_size=2).restore(records)
+        self.assertEqual(report.batches, 3)
+
+
+class TestChangeJournal(unittest.TestCase):
+    def test_tracked_keys(self):
+        self.assertTrue(change_journal.tracks("bot:user:1"))
+        self.assertTrue(change_journal.tracks("user:5"))
+        self.assertFalse(change_journal.tracks("bank:op:daily:1"))
+        self.assertFalse(change_journal.tracks("bank:ledger"))
+        self.assertFalse(change_journal.tracks("yt:q:abc"))
+
+    def test_buckets_cover_the_interval(self):
+        hour = change_journal.BUCKET_SECONDS
+        buckets = change_journal.bucket_keys_since(10 * hour + 5, now=12 * hour)
+        self.assertEqual(buckets, ["journal:10", "journal:11", "journal:12"])
+        self.assertEqual(change_journal.bucket_key(11 * hour + 1), "journal:11")
+
+
+if __name__ == "__main__":
+    unittest.main()
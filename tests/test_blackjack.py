@@ -0,0 +1,56 @@
+"""Tests for the blackjack engine's pure helpers."""
+import unittest
+from src.blackjack import (
+    BlackjackHand, pack_cards, unpack_cards, hand_value, card_label, new_deck,
+    OUTCOME_BLACKJACK, OUTCOME_WIN, OUTCOME_PUSH, OUTCOME_LOSE, OUTCOME_BUST,
+)
+
+# Card index = rank * 4 + suit
+ACE, KING, NINE, FIVE = 12 * 4, 11 * 4, 7 * 4, 3 * 4
+
+
+class TestCardEncoding(unittest.TestCase):
+    def test_pack_roundtrip(self):
+        deck = new_deck()
+        packed = pack_cards(deck)
+        self.assertEqual(len(packed), 52)
+        self.assertEqual(unpack_cards(packed), deck)
+
+    def test_unpack_empty(self):
+        self.assertEqual(unpack_cards(None), [])
+        self.assertEqual(unpack_cards(""), [])
+
+    def test_deck_is_complete(self):
+        self.assertEqual(sorted(new_deck()), list(range(52)))
+
+    def test_card_label(self):
+        self.assertEqual(card_label(0), "2♠")
+        self.assertEqual(card_label(ACE + 1), "A♥")
+
+
+class TestHandValue(unittest.TestCase):
+    def test_face_cards(self):
+        self.assertEqual(hand_value([KING, NINE]), 19)
+
+    def test_soft_ace(self):
+        self.assertEqual(hand_value([ACE, KING]), 21)
+        self.assertEqual(hand_value([ACE, ACE, NINE]), 21)
+        self.assertEqual(hand_value([ACE, KING, FIVE]), 16)
+
+
+class TestPayout(unittest.TestCase):
+    def test_payouts(self):
+        def payout(outcome):
+            return BlackjackHand(user_id=1, bet=10, outcome=outcome).payout()
+        self.assertEqual(payout(OUTCOME_BLACKJACK), 25)
+        self.assertEqual(payout(OUTCOME_WIN), 20)
+        self.assertEqual(payout(OUTCOME_PUSH), 10)
+        self.assertEqual(payout(OUTCOME_LOSE), 0)
+        self.assertEqual(payout(OUTCOME_BUST), 0)
+
+    def test_running_game_not_finished(self):
+        self.assertFalse(BlackjackHand(user_id=1).finished)
+
+
+if __name__ == "__main__":
+    unittest.main()
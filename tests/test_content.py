@@ -0,0 +1,54 @@
+"""Tests for the lazily loaded game content banks."""
+import unittest
+from src.constants.content import ShuffleBag, get_bank
+
+
+class TestContentBanks(unittest.TestCase):
+    def test_banks_are_tuples(self):
+        for name in ("riddles", "proverbs", "english_words", "insults", "speed_words"):
+            bank = get_bank(name)
+            self.assertIsInstance(bank, tuple)
+            self.assertGreater(len(bank), 0)
+
+    def test_pairs_are_frozen(self):
+        question, answer = get_bank("riddles")[0]
+        self.assertIsInstance(question, str)
+        self.assertIsInstance(answer, str)
+
+    def test_unknown_bank(self):
+        with self.assertRaises(KeyError):
+            get_bank("nope")
+
+
+class TestShuffleBag(unittest.TestCase):
+    def test_no_repeats_within_a_round(self):
+        bag = ShuffleBag("proverbs")
+        size = len(get_bank("proverbs"))
+        drawn = [bag.draw(1) for _ in range(size)]
+        self.assertEqual(len(set(drawn)), size)
+
+    def test_no_repeat_across_rounds(self):
+        bag = ShuffleBag("proverbs")
+        size = len(get_bank("proverbs"))
+        previous = None
+        for _ in range(size * 5):
+            item = bag.draw(1)
+            self.assertNotEqual(item, previous)
+            previous = item
+
+    def test_groups_are_independent(self):
+        bag = ShuffleBag("proverbs")
+        size = len(get_bank("proverbs"))
+        for _ in range(size - 1):
+            bag.draw(1)
+        self.assertEqual(len({bag.draw(2) for _ in range(size)}), size)
+
+    def test_group_eviction(self):
+        bag = ShuffleBag("proverbs", max_groups=2)
+        for gid in range(5):
+            bag.draw(gid)
+        self.assertEqual(list(bag._bags), [3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests for the embedded SQLite economy store."""
+import os
+import tempfile
+import unittest
+
+from src.economy.migrate import migrate
+from src.economy.store import (
+    SqliteEconomyStore, STATUS_OK, STATUS_DUP, STATUS_INSUFFICIENT, STATUS_CATEGORY, STATUS_COOLDOWN,
+)
+
+
+class TestSqliteEconomyStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SqliteEconomyStore(os.path.join(self.tmp.name, "economy.db"))
+        self.store.open_account(1)
+        self.store.open_account(2)
+
+    def tearDown(self):
+        self.store.db.close()
+        self.tmp.cleanup()
+
+    def test_open_account_once(self):
+        self.assertFalse(self.store.open_account(1))
+        self.assertEqual(self.store.get_balance(1), 100)
+
+    def test_apply_is_idempotent(self):
+        self.assertEqual(self.store.apply(1, 50, "award", "op-1"), (STATUS_OK, 150))
+        self.assertEqual(self.store.apply(1, 50, "award", "op-1"), (STATUS_DUP, 150))
+        self.assertEqual(self.store.get_balance(1), 150)
+
+    def test_debit_cannot_overdraw(self):
+        status, balance = self.store.apply(1, -500, "debit", "op-2")
+        self.assertEqual((status, balance), (STATUS_INSUFFICIENT, 100))
+
+    def test_transfer(self):
+        self.assertEqual(self.store.transfer(1, 2, 30, "default", "t-1"), (STATUS_OK, 70))
+        self.assertEqual(self.store.get_balance(2), 130)
+        self.assertEqual(self.store.transfer(1, 2, 500, "default", "t-2")[0], STATUS_INSUFFICIENT)
+        self.store.update_flags(2, category="vip")
+        self.assertEqual(self.store.transfer(1, 2, 10, "default", "t-3")[0], STATUS_CATEGORY)
+
+    def test_daily_cooldown(self):
+        self.assertEqual(self.store.claim_daily(1, 80, 100000, 86400, "x", "d-1"), (STATUS_OK, 80))
+        status, wait = self.store.claim_daily(1, 80, 100100, 86400, "x", "d-2")
+        self.assertEqual((status, wait), (STATUS_COOLDOWN, 86300))
+
+    def test_seize_and_ledger(self):
+        self.assertEqual(self.store.seize(1), 100)
+        account = self.store.get_account(1)
+        self.assertEqual(account.bank_balance, 0)
+        self.assertTrue(account.is_cheater)
+        self.assertEqual(self.store.get_ledger(1)[0]["amount"], -100)
+
+    def test_leaderboard(self):
+        self.store.open_account(3)
+        self.store.apply(2, 50, "award", "op-3")
+        self.store.seize(3)
+        self.assertEqual(self.store.richest(), [(2, 150), (1, 100)])
+        self.assertEqual(self.store.rank(1), 2)
+        self.assertIsNone(self.store.rank(3))
+        self.assertEqual(self.store.rank(1, members=[1, 3]), 1)
+
+
+class TestMigrate(unittest.TestCase):
+    def test_forced_rerun_never_credits_twice(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = SqliteEconomyStore(os.path.join(tmp, "source.db"))
+            target = SqliteEconomyStore(os.path.join(tmp, "target.db"))
+            source.open_account(1, balance=40)
+            self.assertEqual(migrate(source, target, "sqlite"), (1, 40))
+            # Operation IDs are only remembered for OP_TTL on Redis
+            target._run(lambda conn: conn.execute("DELETE FROM economy_ops"))
+            self.assertEqual(migrate(source, target, "sqlite", force=True), (1, 0))
+            self.assertEqual(target.get_balance(1), 40)
+            source.db.close()
+            target.db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
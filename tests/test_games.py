@@ -1,6 +1,9 @@
 """Tests for game logic."""
 import unittest
-from src.handlers.games import EMOJI_POOL, ARABIC_LETTERS
+from src.constants.content import get_bank
+from src.handlers.games import ARABIC_LETTERS
+
+EMOJI_POOL = get_bank("emoji_pool")
 
 
 class TestGameData(unittest.TestCase):
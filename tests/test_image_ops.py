@@ -0,0 +1,56 @@
+"""Tests for the photo editor's image operations."""
+import asyncio
+import io
+import unittest
+
+from PIL import Image
+
+from src.services.image_pool import ImagePool
+from src.utils.image_ops import MAX_SIDE, load_image, render_filter, render_text
+
+
+def _jpeg(width, height):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 100, 50)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+class TestImageOps(unittest.TestCase):
+    def test_large_input_is_downscaled(self):
+        img = load_image(_jpeg(4000, 2000))
+        self.assertEqual(max(img.size), MAX_SIDE)
+        self.assertEqual(img.size, (MAX_SIDE, MAX_SIDE // 2))
+
+    def test_small_input_keeps_size(self):
+        self.assertEqual(load_image(_jpeg(300, 200)).size, (300, 200))
+
+    def test_render_text_returns_jpeg(self):
+        out = Image.open(io.BytesIO(render_text(_jpeg(640, 480), "مرحبا")))
+        self.assertEqual((out.format, out.size), ("JPEG", (640, 480)))
+
+    def test_filters(self):
+        inverted = Image.open(io.BytesIO(render_filter(_jpeg(64, 64), "معكوس")))
+        r, g, b = inverted.getpixel((32, 32))
+        self.assertLess(abs(r - 55), 6)
+        self.assertEqual(Image.open(io.BytesIO(render_filter(_jpeg(64, 64), "رمادي"))).mode, "L")
+        with self.assertRaises(ValueError):
+            render_filter(_jpeg(64, 64), "unknown")
+
+
+class TestImagePool(unittest.TestCase):
+    def test_thread_mode(self):
+        # How the pool runs where worker processes can't start (serverless)
+        pool = ImagePool(workers=1, processes=False)
+
+        async def run():
+            try:
+                return await pool.run(1, render_filter, _jpeg(64, 64), "رمادي")
+            finally:
+                pool.shutdown()
+
+        out = Image.open(io.BytesIO(asyncio.run(run())))
+        self.assertEqual(out.mode, "L")
+
+
+if __name__ == "__main__":
+    unittest.main()
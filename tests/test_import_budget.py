@@ -0,0 +1,97 @@
+"""Import-time budget for the handler package (serverless cold start)."""
+import importlib
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Self time of the project's own modules while importing src.handlers.
+# A cold start measured ~80 ms; the margin absorbs slow CI machines.
+SRC_BUDGET_MS = 400
+
+# Loaded on first use only (see src/handlers/lazy.py)
+DEFERRED = (
+    "PIL",
+    "hijri_converter",
+    "src.services.backup",
+    "src.services.image_pool",
+    "src.services.quran_corpus",
+    "src.services.download_queue",
+    "src.handlers.maintenance",
+    "src.handlers.photo_editor",
+    "src.handlers.quran",
+    "src.handlers.time_converter",
+    "src.handlers.youtube",
+)
+
+
+def import_times(statement: str) -> list[tuple[str, int, int]]:
+    """Run ``statement`` under ``python -X importtime``: (module, self_us, cumulative_us)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, timeout=60, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def report(rows: list[tuple[str, int, int]], top: int = 15) -> str:
+    """The slowest modules by self time, importtime-style."""
+    lines = [f"{'self ms':>9} {'cumul ms':>9}  module"]
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[1])[:top]:
+        lines.append(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+    return "\n".join(lines)
+
+
+class TestImportBudget(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rows = import_times("import src.handlers")
+
+    def test_heavy_modules_are_deferred(self):
+        loaded = {name for name, _, _ in self.rows}
+        eager = [name for name in DEFERRED if name in loaded]
+        self.assertEqual(eager, [], "imported eagerly:\n" + report(self.rows))
+
+    def test_project_modules_within_budget(self):
+        own = [row for row in self.rows if row[0].split(".")[0] == "src"]
+        total_ms = sum(self_us for _, self_us, _ in own) / 1000
+        self.assertLess(total_ms, SRC_BUDGET_MS, "over budget:\n" + report(own))
+
+    def test_webhook_skips_the_handler_stack(self):
+        # Redeliveries, filtered updates and stream mode never need PTB
+        loaded = {name for name, _, _ in import_times("import api.webhook")}
+        self.assertNotIn("telegram.ext", loaded)
+        self.assertNotIn("src.handlers", loaded)
+
+
+class TestLazyHandlers(unittest.TestCase):
+    def test_stub_targets_resolve(self):
+        from telegram.ext import Application
+
+        from src.handlers import lazy
+
+        app = Application.builder().token("1:test").build()
+        for register in (lazy.register_maintenance, lazy.register_youtube, lazy.register_quran,
+                         lazy.register_time_converter, lazy.register_photo_editor):
+            register(app)
+        targets = [handler.callback.target
+                   for handlers in app.handlers.values() for handler in handlers]
+        self.assertEqual(len(targets), 15)
+        for target in targets:
+            module_name, attr = target.split(":")
+            module = importlib.import_module(f"src.handlers.{module_name}")
+            self.assertTrue(callable(getattr(module, attr, None)), target)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for the offline Quran corpus file and its inverted index."""
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.handlers import quran
+from src.services.quran_corpus import QuranCorpus, build_corpus, normalize_arabic
+
+SURAHS = [
+    ("الفاتحة", [
+        "بِسْمِ ٱللَّهِ ٱلرَّحْمَٰنِ ٱلرَّحِيمِ",
+        "ٱلْحَمْدُ لِلَّهِ رَبِّ ٱلْعَٰلَمِينَ",
+        "ٱلرَّحْمَٰنِ ٱلرَّحِيمِ",
+    ]),
+    ("الإخلاص", [
+        "قُلْ هُوَ ٱللَّهُ أَحَدٌ",
+        "ٱللَّهُ ٱلصَّمَدُ",
+    ]),
+]
+TAFSIR = [["t1:1", "t1:2", "t1:3"], ["t2:1", "t2:2"]]
+
+
+class TestQuranCorpus(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = Path(self.tmp.name) / "corpus.bin"
+        build_corpus(path, SURAHS, {"ar.muyassar": TAFSIR})
+        self.corpus = QuranCorpus(path)
+
+    def tearDown(self):
+        self.corpus.close()
+        self.tmp.cleanup()
+
+    def test_normalize_strips_diacritics_and_alef_forms(self):
+        self.assertEqual(normalize_arabic("ٱللَّهُ أَحَدٌ"), "الله احد")
+
+    def test_surahs(self):
+        self.assertEqual(self.corpus.surahs(), [("الفاتحة", 3), ("الإخلاص", 2)])
+
+    def test_search_all_words_in_mushaf_order(self):
+        self.assertEqual(self.corpus.search("الرحمن الرحيم"), [(1, 1), (1, 3)])
+        self.assertEqual(self.corpus.search("الله"), [(1, 1), (2, 1), (2, 2)])
+        self.assertEqual(self.corpus.search("الله", limit=2), [(1, 1), (2, 1)])
+
+    def test_search_matches_diacritized_query(self):
+        self.assertEqual(self.corpus.search("أَحَد"), [(2, 1)])
+
+    def test_last_word_matches_as_prefix(self):
+        self.assertEqual(self.corpus.search("الحمد لل"), [(1, 2)])
+        self.assertEqual(self.corpus.search("لل الحمد"), [])
+
+    def test_no_match(self):
+        self.assertEqual(self.corpus.search("موسى"), [])
+
+    def test_text_by_edition(self):
+        self.assertEqual(self.corpus.text(2, 2, "ar.muyassar"), "t2:2")
+        self.assertEqual(self.corpus.text(1, 2), SURAHS[0][1][1])
+        self.assertIsNone(self.corpus.text(1, 4))
+        self.assertIsNone(self.corpus.text(3, 1))
+        self.assertIsNone(self.corpus.text(1, 1, "ar.jalalayn"))
+
+
+class TestSearchCommand(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = Path(self.tmp.name) / "corpus.bin"
+        build_corpus(path, SURAHS, {})
+        self.saved = quran.corpus
+        quran.corpus = QuranCorpus(path)
+
+    def tearDown(self):
+        quran.corpus.close()
+        quran.corpus = self.saved
+        self.tmp.cleanup()
+
+    def test_verse_search_uses_the_index(self):
+        results = asyncio.run(quran.search_quran("هو الله"))
+        self.assertEqual(results, [f"سورة الإخلاص - الآية 1:\n{SURAHS[1][1][0]}"])
+
+    def test_falls_back_to_surah_names(self):
+        results = asyncio.run(quran.search_quran("الفاتحة"))
+        self.assertEqual(results, ["سورة الفاتحة - عدد الآيات: 3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
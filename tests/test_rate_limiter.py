@@ -0,0 +1,47 @@
+"""Tests for the bulk API rate limiter."""
+import asyncio
+import time
+import unittest
+
+from telegram.error import RetryAfter
+
+from src.services.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_paces_beyond_burst(self):
+        limiter = RateLimiter(rate=100, burst=5)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(limiter.acquire() for _ in range(15)))
+            return time.monotonic() - start
+
+        # 5 from the burst, the other 10 at 100/s
+        self.assertGreaterEqual(asyncio.run(run()), 0.09)
+
+    def test_retries_after_flood_wait(self):
+        limiter = RateLimiter(rate=1000)
+        attempts = []
+
+        async def flaky():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise RetryAfter(0)
+            return "ok"
+
+        self.assertEqual(asyncio.run(limiter.call(flaky)), "ok")
+        self.assertEqual(len(attempts), 2)
+
+    def test_gives_up_after_max_retries(self):
+        limiter = RateLimiter(rate=1000, max_retries=1)
+
+        async def flooded():
+            raise RetryAfter(0)
+
+        with self.assertRaises(RetryAfter):
+            asyncio.run(limiter.call(flooded))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+"""Tests for the recent update_id ring."""
+import unittest
+
+from src.services.update_dedup import RecentIds
+
+
+class TestRecentIds(unittest.TestCase):
+    def test_remembers_added_ids(self):
+        recent = RecentIds(size=4)
+        recent.add(1)
+        self.assertIn(1, recent)
+        self.assertNotIn(2, recent)
+
+    def test_forgets_the_oldest_beyond_size(self):
+        recent = RecentIds(size=3)
+        for update_id in (1, 2, 3, 4):
+            recent.add(update_id)
+        self.assertNotIn(1, recent)
+        self.assertTrue(all(i in recent for i in (2, 3, 4)))
+
+    def test_discard(self):
+        recent = RecentIds(size=3)
+        recent.add(1)
+        recent.add(1)
+        recent.discard(1)
+        self.assertNotIn(1, recent)
+        for update_id in (2, 3, 4):
+            recent.add(update_id)
+        self.assertTrue(all(i in recent for i in (2, 3, 4)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Tests for the raw-update prefilter."""
+import unittest
+
+from src.services.update_filter import UpdateFilter
+
+
+def _message(chat_type="supergroup", **fields):
+    return {"message_id": 1, "date": 0, "chat": {"id": -100, "type": chat_type}, "from": {"id": 7}, **fields}
+
+
+class TestUpdateFilter(unittest.TestCase):
+    def setUp(self):
+        self.locks = {}
+        self.edits = []
+        self.filter = UpdateFilter(
+            locks_of=lambda chat_id: self.locks,
+            count_edit=lambda user_id, chat_id: self.edits.append((user_id, chat_id)),
+        )
+
+    def test_unhandled_update_types(self):
+        self.assertFalse(self.filter.actionable({"update_id": 1, "chat_member": {}}))
+        self.assertFalse(self.filter.actionable({"update_id": 1, "channel_post": _message("channel")}))
+        self.assertTrue(self.filter.actionable({"update_id": 1, "my_chat_member": {}}))
+        self.assertTrue(self.filter.actionable({"update_id": 1, "callback_query": {}}))
+
+    def test_group_content_and_private_messages_pass(self):
+        self.assertTrue(self.filter.actionable({"update_id": 1, "message": _message(text="hi")}))
+        self.assertTrue(self.filter.actionable({"update_id": 1, "message": _message(sticker={})}))
+        self.assertTrue(self.filter.actionable({"update_id": 1, "message": _message("private", pinned_message={})}))
+
+    def test_service_messages_need_locks(self):
+        pin = {"update_id": 1, "message": _message(pinned_message={})}
+        self.assertFalse(self.filter.actionable(pin))
+        joined = {"update_id": 2, "message": _message(new_chat_members=[{"id": 8}])}
+        self.assertTrue(self.filter.actionable(joined))
+        self.locks = {"flood": "mute"}
+        self.filter._profiles.clear()
+        self.assertTrue(self.filter.actionable(pin))
+
+    def test_edits_counted_without_dispatch(self):
+        edit = {"update_id": 1, "edited_message": _message(text="x")}
+        self.assertFalse(self.filter.actionable(edit))
+        self.assertEqual(self.edits, [(7, -100)])
+        self.locks = {"edit": "delete"}
+        self.filter._profiles.clear()
+        self.assertTrue(self.filter.actionable(edit))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests for per-chat ordered update lanes."""
+import asyncio
+import unittest
+
+from telegram import Update
+
+from src.services.update_lanes import ChatLaneProcessor, lane_key
+
+
+def _update(update_id: int, chat_id: int) -> Update:
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {"message_id": update_id, "date": 0, "chat": {"id": chat_id, "type": "group"}},
+    }, None)
+
+
+class TestChatLaneProcessor(unittest.TestCase):
+    def test_lane_key(self):
+        self.assertEqual(lane_key(_update(1, -100)), -100)
+        self.assertEqual(lane_key(Update.de_json({"update_id": 7}, None)), 7)
+
+    def test_ordered_within_chat_parallel_across_chats(self):
+        processor = ChatLaneProcessor(lanes=4, depth=8)
+        log = []
+
+        async def work(update_id: int, chat_id: int, delay: float):
+            await asyncio.sleep(delay)
+            log.append((chat_id, update_id))
+
+        async def run():
+            jobs = [
+                # chat 1: a slow update first; its second update must wait for it
+                processor.process_update(_update(1, 1), work(1, 1, 0.05)),
+                processor.process_update(_update(2, 1), work(2, 1, 0)),
+                # chat 2 (another lane) finishes while chat 1 is still busy
+                processor.process_update(_update(3, 2), work(3, 2, 0)),
+            ]
+            await asyncio.gather(*jobs)
+            await processor.shutdown()
+
+        asyncio.run(run())
+        self.assertEqual(log, [(2, 3), (1, 1), (1, 2)])
+
+    def test_errors_reach_the_caller(self):
+        processor = ChatLaneProcessor(lanes=1, depth=2)
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        async def run():
+            try:
+                with self.assertRaises(RuntimeError):
+                    await processor.process_update(_update(1, 1), boom())
+                # The lane survives a failed update
+                await processor.process_update(_update(2, 1), asyncio.sleep(0))
+            finally:
+                await processor.shutdown()
+
+        asyncio.run(run())
+
+    def test_lane_keeps_running_after_a_failure(self):
+        processor = ChatLaneProcessor(lanes=1, depth=4)
+        log = []
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        async def work(update_id: int):
+            log.append(update_id)
+
+        async def run():
+            try:
+                results = await asyncio.gather(
+                    processor.process_update(_update(1, 1), boom()),
+                    processor.process_update(_update(2, 1), work(2)),
+                    return_exceptions=True,
+                )
+                self.assertIsInstance(results[0], RuntimeError)
+                await asyncio.wait_for(processor.process_update(_update(3, 1), work(3)), timeout=2)
+            finally:
+                await processor.shutdown()
+
+        asyncio.run(run())
+        self.assertEqual(log, [2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
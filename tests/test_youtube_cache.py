@@ -0,0 +1,20 @@
+"""Tests for YouTube cache key normalization."""
+import unittest
+
+from src.services.youtube_cache import normalize_query
+
+
+class TestNormalizeQuery(unittest.TestCase):
+    def test_case_and_spacing(self):
+        self.assertEqual(normalize_query("  Shape  OF\tyou "), "shape of you")
+
+    def test_compatibility_forms(self):
+        # Full-width Latin letters fold to ASCII
+        self.assertEqual(normalize_query("ＡＢＣ"), "abc")
+
+    def test_arabic_unchanged(self):
+        self.assertEqual(normalize_query("عمرو  دياب"), "عمرو دياب")
+
+
+if __name__ == "__main__":
+    unittest.main()